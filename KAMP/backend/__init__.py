@@ -0,0 +1 @@
+# backend 디렉토리 패키지
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+파일명 : cnn_lstm_service.py
+설명   : CNN-LSTM 모델 실시간 예측 서비스
+         - 서버 시작 시 모델(cnn_lstm_model.h5) + MinMaxScaler 를 한 번만 로드
+         - 입력 : 최근 7일 [Temperature, Humidity, T일 예정 수주량] 원 단위 값
+         - 출력 : 다음날(T+1일) 예정 수주량 (스케일 복원 값)
+         - MicroBatcher : 짧은 시간(max_wait_ms) 안에 들어온 요청들을 모아 model 호출 1번으로 처리
+경로   : KAMP/backend/cnn_lstm_service.py
+"""
+
+import asyncio
+import os
+
+import numpy as np
+import pandas as pd
+
+from models.common import OUTPUT_DIR, DATA_RESULT_DIR
+
+MODEL_PATH  = os.path.join(OUTPUT_DIR, "cnn_lstm_model.h5")
+SCALER_PATH = os.path.join(OUTPUT_DIR, "cnn_lstm_scaler.pkl")
+
+# train_cnn_lstm.py 와 동일한 설정 (scaler 파일이 없을 때 사용)
+DATA_PATH    = os.path.join(DATA_RESULT_DIR, "03_전처리_이상치_제거.csv")
+FEATURE_COLS = ["Temperature", "Humidity", "T일 예정 수주량"]
+TARGET_COL   = "T+1일 예정 수주량"
+SEQ_LEN      = 7
+
+
+class ModelUnavailableError(Exception):
+    """모델 / scaler 를 불러올 수 없을 때 (API 에서 503 으로 응답)"""
+
+
+# ---------------------------------
+# 모델 + scaler
+# ---------------------------------
+def load_scaler_bundle(scaler_path=SCALER_PATH):
+    """
+    학습 시 저장한 scaler 번들 로드
+    - scaler 파일이 없으면(scaler 저장 전에 학습한 모델) 그때의 학습 방식대로 재적합 후 모델 옆에 저장
+      (CSV 를 pd.read_csv 원래 dtype(float64)으로 읽음 → 공통 스키마(float32)로 읽으면 계수가 달라짐)
+    - 저장해 두면 이후 03 결과가 다시 만들어져도 같은 scaler 를 사용
+    """
+    import joblib
+
+    if os.path.exists(scaler_path):
+        return joblib.load(scaler_path)
+
+    from sklearn.preprocessing import MinMaxScaler
+
+    try:
+        df = pd.read_csv(DATA_PATH, encoding="utf-8-sig", usecols=FEATURE_COLS + [TARGET_COL])
+    except FileNotFoundError:
+        raise ModelUnavailableError("scaler 파일과 학습 데이터가 모두 없습니다.")
+    scaler = MinMaxScaler().fit(df[FEATURE_COLS + [TARGET_COL]])
+    bundle = {"scaler": scaler, "feature_cols": FEATURE_COLS, "target_col": TARGET_COL, "seq_len": SEQ_LEN}
+
+    try:
+        joblib.dump(bundle, scaler_path)
+        print(f"scaler 재적합 후 저장 완료 : {scaler_path}")
+    except OSError as e:
+        print(f"[WARN] scaler 저장 실패 (다음 시작 시 다시 재적합) : {e}")
+    return bundle
+
+
+class CnnLstmPredictor:
+    """
+    원 단위 입력 → 스케일링 → model → 스케일 복원
+    - 스케일링은 MinMaxScaler 계수로 직접 계산 (배치 전체를 numpy 연산 1번으로 처리)
+    """
+
+    def __init__(self, model_path=MODEL_PATH, scaler_path=SCALER_PATH):
+        if not os.path.exists(model_path):
+            raise ModelUnavailableError(f"모델 파일이 없습니다: {model_path}")
+        try:
+            from keras.models import load_model
+        except ImportError as e:
+            raise ModelUnavailableError(f"keras 를 불러올 수 없습니다: {e}")
+
+        bundle = load_scaler_bundle(scaler_path)
+        scaler = bundle["scaler"]
+        n_features = len(bundle["feature_cols"])
+
+        self.seq_len = bundle["seq_len"]
+        self.n_features = n_features
+        self.feature_scale = scaler.scale_[:n_features].astype(np.float32)
+        self.feature_min = scaler.min_[:n_features].astype(np.float32)
+        self.target_scale = float(scaler.scale_[-1])
+        self.target_min = float(scaler.min_[-1])
+        self.model = load_model(model_path, compile=False)
+
+    def validate(self, windows):
+        """(n, 7, 3) float32 배열로 변환, 모양이 다르면 ValueError"""
+        x = np.asarray(windows, dtype=np.float32)
+        if x.ndim == 2:
+            x = x[np.newaxis]
+        if x.ndim != 3 or x.shape[1:] != (self.seq_len, self.n_features) or len(x) == 0:
+            raise ValueError(
+                f"입력 모양은 (n, {self.seq_len}, {self.n_features}) 이어야 합니다. 현재 : {x.shape}"
+            )
+        return x
+
+    def predict(self, x):
+        """(n, 7, 3) 원 단위 → (n,) 복원된 예측값"""
+        scaled = x * self.feature_scale + self.feature_min
+        pred_scaled = np.asarray(self.model.predict_on_batch(scaled)).reshape(-1)
+        return (pred_scaled - self.target_min) / self.target_scale
+
+
+# ---------------------------------
+# 마이크로 배칭
+# ---------------------------------
+class MicroBatcher:
+    """
+    동시 요청들을 모아 predict_fn 1번 호출로 처리
+    - 첫 요청이 들어온 뒤 max_wait_ms 동안 또는 max_batch_size 행이 찰 때까지 수집
+    - predict_fn 은 스레드풀에서 실행 (이벤트 루프 블로킹 방지)
+    - max_batch_size=1 이면 요청마다 바로 실행 (비배칭 모드, 비교용)
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=5.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.rows = 0
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, x):
+        """x : (k, 7, 3) 배열 → (k,) 예측값"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((x, future))
+        return await future
+
+    async def _collect(self):
+        items = [await self._queue.get()]
+        rows = len(items[0][0])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while rows < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            rows += len(item[0])
+        return items
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            batch = np.concatenate([x for x, _ in items]) if len(items) > 1 else items[0][0]
+            try:
+                preds = await loop.run_in_executor(None, self.predict_fn, batch)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.rows += len(batch)
+            start = 0
+            for x, future in items:
+                if not future.done():
+                    future.set_result(preds[start:start + len(x)])
+                start += len(x)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "avg_batch_rows": round(self.rows / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
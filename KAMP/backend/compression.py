@@ -0,0 +1,170 @@
+"""
+파일명 : compression.py
+설명   : 응답 압축 (gzip / brotli)
+         - Accept-Encoding 에 따라 br(brotli 설치 시) > gzip 순으로 선택
+         - CompressionMiddleware : minimum_size 이상인 JSON / HTML / NDJSON 응답을 압축
+             ○ 이미 Content-Encoding 이 있는 응답(미리 압축된 캐시 / 정적 파일)은 그대로 통과
+             ○ 스트리밍 응답은 청크마다 flush → 첫 바이트 지연 없이 압축
+             ○ SSE(text/event-stream)는 압축하지 않음
+경로   : KAMP/backend/compression.py
+"""
+
+import gzip
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip 만 사용
+    brotli = None
+
+MINIMUM_SIZE = 1024
+COMPRESSIBLE_TYPES = {
+    "application/json", "application/x-ndjson", "application/javascript",
+    "text/html", "text/css", "text/javascript", "text/plain",
+}
+
+
+def choose_encoding(accept_encoding):
+    """Accept-Encoding 헤더 → "br" / "gzip" / None (q=0 은 거부로 처리)"""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.lower()] = q
+
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", accepted.get("*", 0)) > 0:
+        return "gzip"
+    return None
+
+
+def compress(data, encoding, best=False):
+    """best=True : 정적 파일처럼 한 번만 압축하는 경우 최고 압축률"""
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if best else 5)
+    return gzip.compress(data, compresslevel=9 if best else 6)
+
+
+class StreamCompressor:
+    """스트리밍 응답용 증분 압축기 (청크마다 flush)"""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=5)
+        else:
+            self._c = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 → gzip 헤더
+
+    def chunk(self, data):
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.flush()
+        return self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data=b""):
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.finish()
+        return self._c.compress(data) + self._c.flush()
+
+
+def add_vary(headers):
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+class CompressionMiddleware:
+    """ASGI 압축 미들웨어 (starlette GZipMiddleware + brotli + 이미 압축된 응답 통과)"""
+
+    def __init__(self, app, minimum_size=MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await CompressionResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(self, app, encoding, minimum_size):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = None
+        self.start_message = None
+        self.eligible = False
+        self.started = False
+        self.compressor = None
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    def _is_eligible(self, headers):
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type in COMPRESSIBLE_TYPES
+
+    async def send_with_compression(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            self.eligible = self._is_eligible(Headers(raw=message["headers"]))
+            if not self.eligible:
+                await self.send(message)
+            return
+
+        if message_type != "http.response.body" or not self.eligible:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            add_vary(headers)
+
+            if not more_body:
+                if len(body) >= self.minimum_size:
+                    body = compress(body, self.encoding)
+                    headers["Content-Encoding"] = self.encoding
+                    headers["Content-Length"] = str(len(body))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+            # 스트리밍 응답
+            self.compressor = StreamCompressor(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            del headers["Content-Length"]
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": self.compressor.chunk(body), "more_body": True})
+            return
+
+        if self.compressor is None:
+            await self.send(message)
+            return
+
+        if more_body:
+            await self.send({"type": "http.response.body", "body": self.compressor.chunk(body), "more_body": True})
+        else:
+            await self.send({"type": "http.response.body", "body": self.compressor.finish(body)})
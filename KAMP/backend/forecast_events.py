@@ -0,0 +1,152 @@
+"""
+파일명 : forecast_events.py
+설명   : 예측 결과 변경 감지 + SSE(Server-Sent Events) 푸시
+         - ForecastWatcher : 앙상블 출력 폴더를 poll_interval 초마다 확인 (ForecastCache 의 stat 비교 재사용)
+           (구독자가 있는 탭만 확인, 캐시 hit 카운터에는 포함하지 않음)
+         - 새 결과가 들어오면 이전 스냅샷과 비교해 바뀐 Product 의 행만 diff 로 만들어 구독자에게 전달
+         - 대시보드는 전체 데이터를 다시 받지 않고 diff 만 반영
+경로   : KAMP/backend/forecast_events.py
+"""
+
+import asyncio
+import json
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.forecast_store import ForecastLoadError
+
+KEY_COLS = ["Product_Number", "Date"]
+HEARTBEAT_SECONDS = 15
+
+
+def diff_frames(old, new):
+    """
+    두 스냅샷 프레임 비교
+    - changed : 값이 바뀌었거나 새로 생긴 Product 의 전체 행 (records)
+    - removed : 사라진 Product_Number 목록
+    """
+    value_cols = [c for c in new.columns if c not in KEY_COLS]
+    merged = old.merge(new, on=KEY_COLS, how="outer", suffixes=("_old", "_new"), indicator=True)
+
+    differs = merged["_merge"] != "both"
+    for col in value_cols:
+        if f"{col}_old" in merged.columns:
+            differs |= merged[f"{col}_old"].ne(merged[f"{col}_new"])
+    touched = set(merged.loc[differs, "Product_Number"])
+
+    new_products = set(new["Product_Number"])
+    changed = new[new["Product_Number"].isin(touched & new_products)]
+    return {
+        "changed": changed.to_dict(orient="records"),
+        "removed": sorted(touched - new_products),
+    }
+
+
+def format_sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+class ForecastWatcher:
+    """
+    탭별 출력 폴더 감시 + 구독자(대시보드 연결)별 asyncio.Queue 로 diff 전달
+    - 느린 구독자의 큐가 가득 차면 diff 대신 reload 이벤트를 보내 전체 재조회 유도
+    """
+
+    def __init__(self, cache, directories, poll_interval=2.0, queue_size=16):
+        self.cache = cache
+        self.directories = directories
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.snapshots = {}
+        self.subscribers = {tab: set() for tab in directories}
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def version(self, tab):
+        snapshot = self.snapshots.get(tab)
+        return snapshot.version if snapshot is not None else None
+
+    def subscribe(self, tab):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers[tab].add(queue)
+        return queue
+
+    def unsubscribe(self, tab, queue):
+        self.subscribers[tab].discard(queue)
+
+    def publish(self, tab, event, data):
+        message = format_sse(event, data)
+        for queue in list(self.subscribers[tab]):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # 밀린 diff 는 버리고 전체 재조회 요청
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(format_sse("reload", {"version": data.get("version")}))
+
+    async def refresh(self, tab):
+        """현재 스냅샷을 기준으로 저장 후 (이전, 현재) 반환"""
+        snapshot = await run_in_threadpool(self.cache.current, self.directories[tab])
+        previous = self.snapshots.get(tab)
+        self.snapshots[tab] = snapshot
+        return previous, snapshot
+
+    async def check(self, tab):
+        # 구독자가 없으면 폴더를 확인하지 않음 (유휴 서버에서 CSV 폴더 전체 stat 반복 방지)
+        if not self.subscribers[tab]:
+            return
+        try:
+            previous, snapshot = await self.refresh(tab)
+        except ForecastLoadError:
+            return
+
+        if previous is None or previous.version == snapshot.version:
+            return
+
+        diff = await run_in_threadpool(diff_frames, previous.frame, snapshot.frame)
+        diff.update({"version": snapshot.version, "previous": previous.version})
+        self.publish(tab, "forecast-diff", diff)
+
+    async def _run(self):
+        while True:
+            for tab in self.directories:
+                try:
+                    await self.check(tab)
+                except Exception as e:
+                    print(f"[WARN] {tab} 탭 결과 감시 실패: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def stream(self, tab, request):
+        """SSE 스트림 : 접속 시 현재 version → 이후 diff / reload, 유휴 시 heartbeat"""
+        queue = self.subscribe(tab)
+        try:
+            if len(self.subscribers[tab]) == 1:
+                # 구독자가 없던 동안은 확인하지 않았으므로 기준 스냅샷을 현재 상태로 갱신
+                try:
+                    await self.refresh(tab)
+                except ForecastLoadError:
+                    pass
+            yield format_sse("version", {"version": self.version(tab)})
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": heartbeat\n\n"
+                    continue
+                yield message
+        finally:
+            self.unsubscribe(tab, queue)
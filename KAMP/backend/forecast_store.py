@@ -0,0 +1,611 @@
+"""
+파일명 : forecast_store.py
+설명   : 예측 결과(*_pred.csv) 인메모리 캐시
+         - 앙상블 통합 파일(ensemble_forecast.arrow)이 있으면 memory-map 으로 1개 파일만 읽음
+           (pandas 로 변환하지 않고 Arrow 컬럼을 numpy view 로 바로 사용)
+         - 없으면 출력 폴더의 *_pred.csv 를 모두 읽음 (기존 방식)
+         - 읽은 파일의 mtime / size 가 바뀔 때만 다시 읽음 (CSV 는 스레드로 병렬 로드)
+         - 변경 확인(stat)은 check_interval 초에 한 번만 수행
+         - 병합된 컬럼(ForecastColumns) + 직렬화된 JSON 페이로드를 한 번만 만들어 재사용
+         - hit / miss 카운터 제공
+         - Product_Number / Date 인덱스 기반 필터 + 커서 페이지네이션 조회
+         - 응답 형식 : JSON 배열 / NDJSON 스트리밍(행 청크 단위) / 컬럼형 JSON
+         - orjson 설치 시 orjson 으로 직렬화 (없으면 표준 json)
+         - 압축(gzip / br) 페이로드도 버전별로 1번만 만들어 재사용
+         - 로드 / 직렬화 단계별 시간은 backend.metrics 로 기록 (/metrics)
+경로   : KAMP/backend/forecast_store.py
+"""
+
+import base64
+import bisect
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow 미설치 시 CSV 스캔으로만 동작
+    pa = None
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+from backend.compression import MINIMUM_SIZE, compress
+from backend.metrics import timed
+from models.common import FORECAST_ARTIFACT
+
+NUMERIC_COLS = ["Pred_Value", "MAE", "SMAPE", "Accuracy"]
+CSV_READ_WORKERS = 8
+NDJSON_CHUNK_ROWS = 5000
+
+
+# /api/forecasts 정렬 키 → 컬럼 ("-" 접두사는 내림차순)
+SORT_KEYS = {"product": "Product_Number", "date": "Date", "pred": "Pred_Value", "accuracy": "Accuracy"}
+
+
+class ForecastLoadError(Exception):
+    """결과 폴더 / CSV 를 읽을 수 없을 때 (API 에서 404 로 응답)"""
+
+
+class ForecastQueryError(Exception):
+    """잘못된 조회 파라미터 / 커서 (API 에서 400 으로 응답)"""
+
+
+class StaleCursorError(ForecastQueryError):
+    """커서 발급 이후 데이터가 갱신됨 (API 에서 409 로 응답)"""
+
+
+# ---------------------------------
+# 폴더 스캔 / 로드
+# ---------------------------------
+def is_forecast_file(name):
+    return name.endswith(".csv") and not name.lower().startswith("ensemble_summary")
+
+
+def scan_signature(directory, use_artifact=True):
+    """
+    폴더 안 예측 파일들의 (파일명, mtime, size) 목록
+    - 파일을 열지 않고 stat 만 하므로 매 요청마다 호출해도 부담 없음
+    - 파일 추가 / 삭제 / 수정 시 값이 달라짐
+    - 통합 파일이 있으면 그 파일 1개만 stat (Product 수와 무관하게 일정)
+        ○ 이때 *_pred.csv 변경은 보지 않음 → 통합 파일이 CSV 보다 오래된 경우는 ForecastCache 에서 확인
+    """
+    if pa is not None and use_artifact:
+        artifact_path = os.path.join(directory, FORECAST_ARTIFACT)
+        try:
+            st = os.stat(artifact_path)
+            return ((FORECAST_ARTIFACT, st.st_mtime_ns, st.st_size),)
+        except FileNotFoundError:
+            pass
+
+    signature = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if not entry.is_file() or not is_forecast_file(entry.name):
+                continue
+            st = entry.stat()
+            signature.append((entry.name, st.st_mtime_ns, st.st_size))
+    signature.sort()
+    return tuple(signature)
+
+
+def is_artifact_signature(signature):
+    return len(signature) == 1 and signature[0][0] == FORECAST_ARTIFACT
+
+
+def csv_newer_than(directory, mtime_ns):
+    """mtime_ns 이후에 수정된 *_pred.csv 가 있으면 True (폴더 전체 stat)"""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file() and is_forecast_file(entry.name) and entry.stat().st_mtime_ns > mtime_ns:
+                return True
+    return False
+
+
+def load_forecast_artifact(path):
+    """
+    통합 Arrow IPC 파일을 memory-map 으로 열어 pa.Table 반환
+    - 테이블의 버퍼는 매핑된 파일 영역을 그대로 가리킴 (힙으로 복사하지 않음)
+    - 파일 핸들은 바로 닫지만 매핑은 테이블이 살아 있는 동안 유지됨
+    """
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def read_forecast_csv(directory, file):
+    """*_pred.csv 1개 읽기 (Product_Number 는 파일명 기준, 실패 시 None)"""
+    path = os.path.join(directory, file)
+    try:
+        df = pd.read_csv(path)
+        if "Product_Number" not in df.columns:
+            return None
+        df["Product_Number"] = os.path.splitext(file)[0].replace("_pred", "")
+        return df
+    except Exception as e:
+        print(f"[WARN] {file} 읽기 실패: {e}")
+        return None
+
+
+def load_forecast_columns(directory, file_names):
+    """예측 파일들을 읽어 하나의 ForecastColumns 로 병합 (기존 API 와 동일한 규칙)"""
+    file_names = list(file_names)
+    if file_names == [FORECAST_ARTIFACT]:
+        with timed("artifact_read"):
+            table = load_forecast_artifact(os.path.join(directory, FORECAST_ARTIFACT))
+        with timed("normalize"):
+            return ForecastColumns.from_table(table)
+
+    with timed("csv_read"):
+        with ThreadPoolExecutor(max_workers=max(1, min(CSV_READ_WORKERS, len(file_names)))) as executor:
+            results = executor.map(lambda file: read_forecast_csv(directory, file), file_names)
+            dfs = [df for df in results if df is not None]
+
+    if not dfs:
+        raise ForecastLoadError("CSV 파일을 읽을 수 없습니다.")
+
+    with timed("concat"):
+        df_all = pd.concat(dfs, ignore_index=True)
+    return ForecastColumns.from_frame(normalize_frame(df_all))
+
+
+def normalize_frame(df_all):
+    """결측 0 처리 + 수치형 변환 + Product_Number 정렬"""
+    with timed("normalize"):
+        df_all = df_all.fillna(0)
+        for col in NUMERIC_COLS:
+            if col in df_all.columns:
+                df_all[col] = pd.to_numeric(df_all[col], errors="coerce").fillna(0)
+
+        # stable 정렬 → 같은 제품 안에서는 파일의 날짜 순서 유지
+        return df_all.sort_values(by="Product_Number", kind="stable").reset_index(drop=True)
+
+
+# ---------------------------------
+# 컬럼 묶음 (CSV → DataFrame 변환 / 통합 파일 → Arrow 컬럼 view)
+# ---------------------------------
+def arrow_numpy(column):
+    """
+    Arrow 컬럼 → numpy 배열
+    - 청크 1개 + null 없는 숫자 / timestamp 컬럼은 복사 없이 memory-map 영역을 가리키는 view
+    - null 은 0 으로 채움 (CSV 경로의 fillna(0) 과 동일, 이때만 복사)
+    """
+    array = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+    if array.null_count and (pa.types.is_integer(array.type) or pa.types.is_floating(array.type)):
+        array = array.fill_null(0)
+    values = array.to_numpy(zero_copy_only=False)
+    if values.dtype.kind == "f" and np.isnan(values).any():
+        values = np.where(np.isnan(values), 0, values)
+    return values
+
+
+class ForecastColumns:
+    """
+    예측 결과 컬럼 묶음 (행 순서 = Product_Number 순, 같은 제품 안에서는 파일 순서)
+    - codes     : 행별 Product 번호 (products 위치)
+    - products  : 정렬된 Product_Number 이름 목록
+    - dates     : Date 를 datetime64 로 변환한 배열 (조회 / 정렬용)
+    - date_text : 원래 Date 문자열 (None 이면 dates 에서 YYYY-MM-DD 로 만듦)
+    - values    : 그 외 컬럼 → numpy 배열
+    - 통합 파일에서 만든 경우 codes / dates / 수치 컬럼은 memory-map view
+    """
+
+    def __init__(self, names, codes, products, dates, values, date_text=None):
+        self.names = list(names)
+        self.codes = codes
+        self.products = list(products)
+        self.dates = dates
+        self.values = values
+        self.date_text = date_text
+        self._product_array = np.asarray(self.products, dtype=object)
+
+    def __len__(self):
+        return len(self.codes)
+
+    @classmethod
+    def from_frame(cls, df):
+        """normalize_frame 을 거친 DataFrame 에서 생성"""
+        codes, products = pd.factorize(df["Product_Number"], sort=True)
+        if "Date" in df.columns:
+            date_text = df["Date"].to_numpy()
+            dates = pd.to_datetime(df["Date"], errors="coerce").to_numpy()
+        else:
+            date_text, dates = None, np.full(len(df), np.datetime64("NaT"), dtype="datetime64[ns]")
+        values = {col: df[col].to_numpy() for col in df.columns if col not in ("Product_Number", "Date")}
+        return cls(df.columns, codes, products.tolist(), dates, values, date_text)
+
+    @classmethod
+    def from_table(cls, table):
+        """
+        통합 파일의 Arrow 테이블에서 생성 (write_forecast_artifact 형식)
+        - Product_Number : dictionary (indices 를 그대로 codes 로 사용)
+        - Date           : timestamp (datetime64 view)
+        - 이전 형식(문자열 컬럼) 파일은 이 두 컬럼만 변환
+        """
+        product_col = table.column("Product_Number")
+        product_col = product_col.chunk(0) if product_col.num_chunks == 1 else product_col.combine_chunks()
+        if pa.types.is_dictionary(product_col.type):
+            codes = product_col.indices.to_numpy(zero_copy_only=False)
+            names = product_col.dictionary.to_pylist()
+            if names != sorted(names):
+                rank = np.empty(len(names), dtype=np.int64)
+                rank[np.argsort(np.asarray(names, dtype=object), kind="stable")] = np.arange(len(names))
+                codes, names = rank[codes], sorted(names)
+        else:
+            codes, names = pd.factorize(product_col.to_numpy(zero_copy_only=False), sort=True)
+            names = names.tolist()
+
+        date_text = None
+        if "Date" not in table.column_names:
+            dates = np.full(table.num_rows, np.datetime64("NaT"), dtype="datetime64[ns]")
+        elif pa.types.is_timestamp(table.schema.field("Date").type):
+            dates = arrow_numpy(table.column("Date"))
+        else:
+            date_text = table.column("Date").to_numpy()
+            dates = pd.to_datetime(pd.Series(date_text), errors="coerce").to_numpy()
+
+        values = {name: arrow_numpy(table.column(name)) for name in table.column_names
+                  if name not in ("Product_Number", "Date")}
+        columns = cls(table.column_names, codes, names, dates, values, date_text)
+
+        # 통합 파일은 Product_Number 순으로 저장됨 → 아닌 경우(직접 만든 파일 등)만 정렬
+        if len(codes) and np.any(np.diff(codes) < 0):
+            columns = columns.take(np.argsort(codes, kind="stable"))
+        return columns
+
+    def take(self, rows):
+        """rows 위치의 행만 모은 새 ForecastColumns"""
+        return ForecastColumns(
+            self.names, self.codes[rows], self.products, self.dates[rows],
+            {name: values[rows] for name, values in self.values.items()},
+            None if self.date_text is None else self.date_text[rows],
+        )
+
+    def column(self, name, rows=None):
+        """출력용 컬럼 값 (rows : 위치 배열 / slice, None 이면 전체)"""
+        rows = slice(None) if rows is None else rows
+        if name == "Product_Number":
+            return self._product_array[self.codes[rows]]
+        if name == "Date":
+            if self.date_text is not None:
+                return self.date_text[rows]
+            return np.datetime_as_string(self.dates[rows], unit="D").astype(object)
+        return self.values[name][rows]
+
+    def records(self, rows=None):
+        """[{컬럼: 값}, ...] (파이썬 기본 타입, DataFrame.to_dict(orient="records") 와 동일)"""
+        lists = [self.column(name, rows).tolist() for name in self.names]
+        return [dict(zip(self.names, row)) for row in zip(*lists)]
+
+    def to_frame(self):
+        """DataFrame 으로 변환 (복사, 결과 diff 등 DataFrame 이 필요한 곳에서만 사용)"""
+        return pd.DataFrame({name: self.column(name) for name in self.names})
+
+
+def dumps(obj):
+    """JSONResponse 와 동일한 형식(UTF-8 그대로, 공백 없음)의 bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def serialize_records(columns):
+    """[{컬럼: 값}, ...] 형태 JSON 배열"""
+    with timed("serialize"):
+        return dumps(columns.records())
+
+
+def serialize_columnar(columns):
+    """{"컬럼": [값, ...]} 형태 JSON (행마다 키를 반복하지 않아 크기가 작음)"""
+    with timed("serialize_columnar"):
+        data = {}
+        for col in columns.names:
+            values = columns.column(col)
+            # orjson 은 숫자형 numpy 배열(memory-map view 포함)을 리스트 변환 없이 바로 직렬화
+            data[col] = values if orjson is not None and values.dtype.kind in "biuf" else values.tolist()
+        return dumps({"total": len(columns), "columns": columns.names, "data": data})
+
+
+def iter_ndjson(columns, chunk_rows=NDJSON_CHUNK_ROWS):
+    """
+    NDJSON (한 줄에 한 행) 을 행 청크 단위로 생성
+    - 전체 dict 리스트 / 전체 JSON 문자열을 만들지 않으므로 메모리 사용량이 청크 크기로 제한됨
+    """
+    for start in range(0, len(columns), chunk_rows):
+        with timed("serialize_ndjson_chunk"):
+            records = columns.records(slice(start, start + chunk_rows))
+            chunk = b"\n".join(dumps(record) for record in records) + b"\n"
+        yield chunk
+
+
+# ---------------------------------
+# 인덱스 (Product_Number → 행 범위, 제품 내 Date 정렬)
+# ---------------------------------
+def encode_cursor(version, offset):
+    raw = json.dumps({"v": version, "o": offset}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, version):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        offset = int(data["o"])
+    except Exception:
+        raise ForecastQueryError("잘못된 cursor 입니다.")
+    if data.get("v") != version or offset < 0:
+        raise StaleCursorError("데이터가 갱신되었습니다. cursor 없이 처음부터 다시 조회하세요.")
+    return offset
+
+
+class ForecastIndex:
+    """
+    (Product_Number, Date) 순 정렬 위치 + 제품별 행 범위
+    - product 조회 : dict 조회 O(1) 후 해당 범위만 사용
+    - prefix 조회  : 정렬된 제품 목록에서 bisect → 연속된 행 범위 1개
+    - 날짜 조회    : 단일 제품 범위 안에서는 searchsorted (Date 정렬 상태)
+    → 조회 비용이 전체 제품 수가 아니라 결과 크기에 비례
+    - 이미 (Product_Number, Date) 순인 컬럼(통합 파일)은 정렬 / 복사 없이 그대로 사용
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        order = np.lexsort((columns.dates, columns.codes))
+        self.order = None if np.array_equal(order, np.arange(len(order))) else order
+
+        codes = self._sorted(columns.codes)
+        self.dates = self._sorted(columns.dates)
+
+        positions = np.arange(len(columns.products))
+        starts = np.searchsorted(codes, positions, side="left")
+        ends = np.searchsorted(codes, positions, side="right")
+        present = ends > starts
+        self.products = [name for name, keep in zip(columns.products, present) if keep]
+        self.ranges = {name: (int(s), int(e)) for name, s, e, keep in zip(columns.products, starts, ends, present) if keep}
+
+    def _sorted(self, values):
+        return values if self.order is None else values[self.order]
+
+    def _physical(self, rows):
+        """정렬 위치 → columns 의 행 위치"""
+        return rows if self.order is None else self.order[rows]
+
+    def _row_range(self, product=None, prefix=None):
+        if product is not None:
+            return self.ranges.get(product, (0, 0))
+        if prefix is not None:
+            lo = bisect.bisect_left(self.products, prefix)
+            hi = bisect.bisect_left(self.products, prefix + "\uffff")
+            if lo == hi:
+                return (0, 0)
+            return (self.ranges[self.products[lo]][0], self.ranges[self.products[hi - 1]][1])
+        return (0, len(self.columns))
+
+    def select(self, product=None, prefix=None, date_from=None, date_to=None, min_accuracy=None, sort="product"):
+        """조건에 맞는 행 위치(np.ndarray) 반환"""
+        start, stop = self._row_range(product, prefix)
+        dates = self.dates[start:stop]
+
+        if product is not None and (date_from is not None or date_to is not None):
+            # 단일 제품 → Date 가 정렬되어 있으므로 이진 탐색
+            lo = 0 if date_from is None else int(np.searchsorted(dates, np.datetime64(date_from), side="left"))
+            hi = len(dates) if date_to is None else int(np.searchsorted(dates, np.datetime64(date_to), side="right"))
+            rows = np.arange(start + lo, start + max(lo, hi))
+        else:
+            mask = np.ones(stop - start, dtype=bool)
+            if date_from is not None:
+                mask &= dates >= np.datetime64(date_from)
+            if date_to is not None:
+                mask &= dates <= np.datetime64(date_to)
+            rows = start + np.flatnonzero(mask)
+
+        if min_accuracy is not None and len(rows) and "Accuracy" in self.columns.values:
+            acc = self.columns.values["Accuracy"][self._physical(rows)]
+            rows = rows[acc >= min_accuracy]
+
+        return self._sort(rows, sort)
+
+    def _sort(self, rows, sort):
+        descending = sort.startswith("-")
+        key = sort.lstrip("-")
+        if key not in SORT_KEYS:
+            raise ForecastQueryError(f"지원하지 않는 sort 입니다: {sort} (가능: {', '.join(SORT_KEYS)})")
+        if key == "product":
+            return rows[::-1] if descending else rows
+
+        values = self.dates[rows] if key == "date" else self.columns.values[SORT_KEYS[key]][self._physical(rows)]
+        if descending:
+            # 뒤집어서 stable 정렬 후 다시 뒤집기 → 내림차순이면서 동률은 원래 순서 유지
+            order = len(values) - 1 - np.argsort(values[::-1], kind="stable")[::-1]
+        else:
+            order = np.argsort(values, kind="stable")
+        return rows[order]
+
+    def query(self, version, cursor=None, limit=500, **filters):
+        """필터 + 정렬 + 커서 페이지네이션 결과 (dict)"""
+        offset = decode_cursor(cursor, version) if cursor else 0
+        rows = self.select(**filters)
+        page = rows[offset:offset + limit]
+        next_offset = offset + len(page)
+        return {
+            "total": int(len(rows)),
+            "count": int(len(page)),
+            "next_cursor": encode_cursor(version, next_offset) if next_offset < len(rows) else None,
+            "items": self.columns.records(self._physical(page)),
+        }
+
+
+# ---------------------------------
+# 캐시
+# ---------------------------------
+class ForecastSnapshot:
+    """특정 시점의 예측 결과 (ForecastColumns + JSON 페이로드 + 조회 인덱스)"""
+
+    def __init__(self, signature, columns):
+        self.signature = signature
+        self.version = hashlib.sha1(repr(signature).encode("utf-8")).hexdigest()[:16]
+        self.columns = columns
+        self._frame = None
+        self._payload = None
+        self._columnar = None
+        self._encoded = {}
+        self.etag = f'"{self.version}"'
+        self.checked_at = time.monotonic()
+        self._index = None
+        self._index_lock = threading.Lock()
+        self._encode_lock = threading.Lock()
+
+    @property
+    def frame(self):
+        """DataFrame (결과 diff 에서만 사용, 처음 요청될 때 한 번만 변환)"""
+        if self._frame is None:
+            self._frame = self.columns.to_frame()
+        return self._frame
+
+    @property
+    def payload(self):
+        """JSON 배열 페이로드 (처음 요청될 때 한 번만 생성)"""
+        if self._payload is None:
+            self._payload = serialize_records(self.columns)
+        return self._payload
+
+    @property
+    def columnar(self):
+        """컬럼형 JSON 페이로드 (처음 요청될 때 한 번만 생성)"""
+        if self._columnar is None:
+            self._columnar = serialize_columnar(self.columns)
+        return self._columnar
+
+    def encoded(self, kind, encoding):
+        """
+        kind("payload" / "columnar") 페이로드를 encoding 으로 압축 (버전별 1번만 압축)
+        - 반환 : (bytes, 실제 적용된 encoding 또는 None)
+        - 처음 만들 때는 JSON 직렬화 + 압축 → 이벤트 루프가 아닌 스레드에서 호출 (cached 로 먼저 확인)
+        """
+        with self._encode_lock:
+            raw = getattr(self, kind)
+            if encoding is None or len(raw) < MINIMUM_SIZE:
+                return raw, None
+            key = (kind, encoding)
+            if key not in self._encoded:
+                with timed("compress"):
+                    self._encoded[key] = compress(raw, encoding)
+            return self._encoded[key], encoding
+
+    def cached(self, kind, encoding):
+        """encoded 결과가 이미 있으면 반환, 아직 만들지 않았으면 None (이벤트 루프에서 바로 호출해도 되는 경로)"""
+        raw = self._columnar if kind == "columnar" else self._payload
+        if raw is None:
+            return None
+        if encoding is None or len(raw) < MINIMUM_SIZE:
+            return raw, None
+        content = self._encoded.get((kind, encoding))
+        return None if content is None else (content, encoding)
+
+    @property
+    def index(self):
+        """처음 조회할 때 한 번만 생성"""
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    with timed("index_build"):
+                        self._index = ForecastIndex(self.columns)
+        return self._index
+
+
+class ForecastCache:
+    """
+    폴더별 ForecastSnapshot 캐시
+    - check_interval 초마다 scan_signature 로 변경 여부만 확인 (stat only)
+    - 변경이 있을 때만 CSV 를 다시 읽고 JSON 을 다시 만듦
+    - 같은 폴더에 대한 동시 재로드는 한 번만 수행 (폴더별 lock)
+    - 통합 파일이 바뀌었을 때 *_pred.csv 중 통합 파일보다 새것이 있으면
+      (앙상블이 CSV 만 쓰고 중간에 끊긴 경우 등) 경고 후 CSV 를 읽음
+        ○ 통합 파일이 다시 저장될 때까지는 확인할 때마다 폴더 전체를 stat
+        ○ 이미 읽은 통합 파일이 그대로인 채 CSV 만 고친 경우는 확인하지 않음 (확인하려면 매번 폴더 전체 stat)
+          → CSV 를 고쳤으면 앙상블 스크립트로 통합 파일까지 다시 저장
+    """
+
+    def __init__(self, check_interval=1.0):
+        self.check_interval = check_interval
+        self._entries = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._stale_warned = set()
+
+    def _dir_lock(self, key):
+        with self._lock:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def _hit(self, entry):
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def peek(self, directory):
+        """
+        최근 check_interval 초 안에 확인한 스냅샷이면 파일 접근 없이 바로 반환 (아니면 None)
+        - 이벤트 루프에서 직접 호출해도 되는 경로
+        """
+        entry = self._entries.get(os.path.abspath(directory))
+        if entry is not None and time.monotonic() - entry.checked_at < self.check_interval:
+            return self._hit(entry)
+        return None
+
+    def get(self, directory):
+        return self._load(directory, count_hit=True)
+
+    def current(self, directory):
+        """get 과 같지만 hit 으로 세지 않음 (변경 감시용, 실제 재로드는 miss 로 셈)"""
+        return self._load(directory, count_hit=False)
+
+    def _load(self, directory, count_hit):
+        key = os.path.abspath(directory)
+        if not os.path.isdir(key):
+            raise ForecastLoadError("결과 폴더를 찾을 수 없습니다.")
+
+        with self._dir_lock(key):
+            signature = scan_signature(key)
+            entry = self._entries.get(key)
+            if is_artifact_signature(signature) and (entry is None or entry.signature != signature):
+                signature = self._check_artifact(key, signature)
+            if entry is not None and entry.signature == signature:
+                entry.checked_at = time.monotonic()
+                return self._hit(entry) if count_hit else entry
+
+            with self._lock:
+                self.misses += 1
+            columns = load_forecast_columns(key, [name for name, _, _ in signature])
+            entry = ForecastSnapshot(signature, columns)
+            self._entries[key] = entry
+            return entry
+
+    def _check_artifact(self, key, signature):
+        """통합 파일보다 새 *_pred.csv 가 있으면 CSV 기준 signature 로 대체"""
+        if not csv_newer_than(key, signature[0][1]):
+            return signature
+        if (key, signature) not in self._stale_warned:
+            self._stale_warned.add((key, signature))
+            print(f"[WARN] {FORECAST_ARTIFACT} 가 *_pred.csv 보다 오래되어 CSV 를 읽습니다: {key}")
+        return scan_signature(key, use_artifact=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "entries": len(self._entries),
+            }
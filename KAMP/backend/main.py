@@ -2,17 +2,39 @@
 파일명 : main.py
 설명   : FastAPI 백엔드 (인트로 + 대시보드)
 경로   : KAMP/backend/main.py
+실행법 :
+    cd ~/KAMP
+    uvicorn backend.main:app --reload
 """
 
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from typing import List, Optional
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import pandas as pd
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 import os
+import pandas as pd
+
+from backend.forecast_store import (
+    ForecastCache, ForecastLoadError, ForecastQueryError, StaleCursorError, iter_ndjson,
+)
+from backend.forecast_events import ForecastWatcher
+from backend.compression import CompressionMiddleware, choose_encoding
+from backend.metrics import MetricsMiddleware, registry as metrics_registry
+from backend.static_assets import ASSET_PREFIX, StaticAssetManifest
+from backend.cnn_lstm_service import CnnLstmPredictor, MicroBatcher, ModelUnavailableError
 
 app = FastAPI()
 
+# 1KB 이상 API 응답 gzip / brotli 압축 (이미 압축된 응답은 통과)
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+# 라우트별 요청 수 / 응답 시간 수집 (가장 바깥 → 압축 시간까지 포함)
+app.add_middleware(MetricsMiddleware)
+
 # ---------------------------------
 # 경로 설정
 # ---------------------------------
@@ -27,9 +49,94 @@ OUTPUT_DIR_A = os.path.join(BASE_DIR, "..", "models", "outputs", "tab_a_ensemble
 # OUTPUT_DIR_B = os.path.join(BASE_DIR, "..", "models", "outputs", "tab_b_ensemble_forecast")
 OUTPUT_DIR_B = os.path.join(BASE_DIR, "..", "models", "outputs", "tab_a_ensemble_forecast")
 
+# 벤치마크 등에서 결과 폴더를 바꿀 때 (환경변수가 없으면 위 경로 사용)
+OUTPUT_DIR_A = os.environ.get("KAMP_OUTPUT_DIR_A", OUTPUT_DIR_A)
+OUTPUT_DIR_B = os.environ.get("KAMP_OUTPUT_DIR_B", OUTPUT_DIR_B)
+
+FORECAST_DIRS = {"a": OUTPUT_DIR_A, "b": OUTPUT_DIR_B}
+
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 templates = Jinja2Templates(directory=TEMPLATE_DIR)
 
+# 정적 파일 해시 URL + 미리 압축 (템플릿에서 static_url('css/common.css') 로 참조)
+static_assets = StaticAssetManifest(STATIC_DIR)
+templates.env.globals["static_url"] = static_assets.url
+
+# 예측 결과 캐시 (CSV 변경 시에만 재로드, 변경 확인은 1초에 한 번)
+forecast_cache = ForecastCache(check_interval=1.0)
+
+# 출력 폴더 감시 → 대시보드에 SSE 로 diff 푸시 (2초마다 확인)
+forecast_watcher = ForecastWatcher(forecast_cache, FORECAST_DIRS, poll_interval=2.0)
+
+
+async def load_snapshot(directory):
+    """
+    캐시 스냅샷 조회
+    - 최근에 확인된 스냅샷이면 이벤트 루프에서 바로 반환
+    - 아니면 stat / 파일 로드를 스레드풀에서 수행 (이벤트 루프 블로킹 방지)
+    """
+    snapshot = forecast_cache.peek(directory)
+    if snapshot is None:
+        snapshot = await run_in_threadpool(forecast_cache.get, directory)
+    return snapshot
+
+
+def etag_matches(request, etag):
+    """If-None-Match 헤더가 현재 ETag 와 일치하는지"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(etag):
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+async def payload_response(request, snapshot, fmt="json"):
+    """
+    캐시된 스냅샷 응답 (+ ETag, 매번 재검증)
+    - json     : 캐시된 JSON 배열 그대로
+    - columnar : 컬럼별 배열 JSON (캐시)
+    - ndjson   : 행 청크 단위 스트리밍 (전체 페이로드를 메모리에 만들지 않음, 압축은 미들웨어)
+    - json / columnar 는 압축본도 스냅샷에 캐시 → 요청마다 압축하지 않음
+      (재로드 후 첫 요청 / 새 encoding 은 직렬화 + 압축을 스레드풀에서 → 다른 요청을 막지 않음)
+    """
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if fmt == "ndjson":
+        return StreamingResponse(iter_ndjson(snapshot.columns), media_type="application/x-ndjson", headers=headers)
+
+    kind = "columnar" if fmt == "columnar" else "payload"
+    accept = choose_encoding(request.headers.get("accept-encoding"))
+    cached = snapshot.cached(kind, accept)
+    content, encoding = cached if cached is not None else await run_in_threadpool(snapshot.encoded, kind, accept)
+    headers["Vary"] = "Accept-Encoding"
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+FORMAT_PATTERN = "^(json|ndjson|columnar)$"
+
+# ---------------------------------
+# 정적 파일 (해시 URL, 미리 압축, immutable 캐시)
+# ---------------------------------
+@app.on_event("startup")
+def build_static_assets():
+    static_assets.build()
+
+
+@app.get(ASSET_PREFIX + "/{path:path}")
+async def get_asset(path: str, request: Request):
+    response = static_assets.response(path, request.headers.get("accept-encoding"))
+    if response is None:
+        return JSONResponse({"error": "파일을 찾을 수 없습니다."}, status_code=404)
+    if etag_matches(request, response.headers["etag"]):
+        return Response(status_code=304, headers={"ETag": response.headers["etag"], "Cache-Control": response.headers["cache-control"]})
+    return response
+
 # ---------------------------------
 # 기본 라우팅
 # ---------------------------------
@@ -45,72 +152,199 @@ def dashboard_page(request: Request):
 # 📊 A탭 (LightGBM + CatBoost)
 # ---------------------------------
 @app.get("/api/preprocessing-a")
-def get_preprocessing_a_data():
-    if not os.path.exists(OUTPUT_DIR_A):
-        return JSONResponse({"error": "결과 폴더를 찾을 수 없습니다."}, status_code=404)
-
-    dfs = []
-    for file in os.listdir(OUTPUT_DIR_A):
-        if not file.endswith(".csv") or file.lower().startswith("ensemble_summary"):
-            continue
-        path = os.path.join(OUTPUT_DIR_A, file)
-        try:
-            df = pd.read_csv(path)
-            if "Product_Number" not in df.columns:
-                continue
-            df["Product_Number"] = os.path.splitext(file)[0].replace("_pred", "")
-            dfs.append(df)
-        except Exception as e:
-            print(f"[WARN] {file} 읽기 실패: {e}")
-            continue
-
-    if not dfs:
-        return JSONResponse({"error": "CSV 파일을 읽을 수 없습니다."}, status_code=404)
-
-    df_all = pd.concat(dfs, ignore_index=True).fillna(0)
-    numeric_cols = ["Pred_Value", "MAE", "SMAPE", "Accuracy"]
-    for col in numeric_cols:
-        if col in df_all.columns:
-            df_all[col] = pd.to_numeric(df_all[col], errors="coerce").fillna(0)
-
-    df_all = df_all.sort_values(by="Product_Number").reset_index(drop=True)
-    return JSONResponse(content=df_all.to_dict(orient="records"))
+async def get_preprocessing_a_data(request: Request, format: str = Query("json", regex=FORMAT_PATTERN)):
+    try:
+        snapshot = await load_snapshot(OUTPUT_DIR_A)
+    except ForecastLoadError as e:
+        return JSONResponse({"error": str(e)}, status_code=404)
+    if etag_matches(request, snapshot.etag):
+        return not_modified(snapshot.etag)
+    return await payload_response(request, snapshot, format)
 
 # ---------------------------------
 # 📊 B탭 (XGBoost)
 # ---------------------------------
 @app.get("/api/preprocessing-b")
-def get_preprocessing_b_data():
+async def get_preprocessing_b_data(request: Request, format: str = Query("json", regex=FORMAT_PATTERN)):
     """
     - outputs/tab_b_xgboost_forecast/*.csv 로부터 데이터 로드
     - Product_Number별 예측값 + MAE/SMAPE/Accuracy
+    - format : json(기본) / ndjson(스트리밍) / columnar(컬럼별 배열)
+    """
+    try:
+        snapshot = await load_snapshot(OUTPUT_DIR_B)
+    except ForecastLoadError as e:
+        return JSONResponse({"error": str(e)}, status_code=404)
+    if etag_matches(request, snapshot.etag):
+        return not_modified(snapshot.etag)
+    return await payload_response(request, snapshot, format)
+
+# ---------------------------------
+# 🔎 예측 결과 조회 (필터 + 정렬 + 커서 페이지네이션)
+# ---------------------------------
+def parse_date_param(value, name):
+    if value is None:
+        return None
+    try:
+        return pd.Timestamp(value).to_datetime64()
+    except (ValueError, TypeError):
+        raise ForecastQueryError(f"{name} 날짜 형식이 올바르지 않습니다: {value}")
+
+
+@app.get("/api/forecasts")
+async def get_forecasts(
+    request: Request,
+    tab: str = Query("a", regex="^[ab]$"),
+    product: Optional[str] = None,
+    prefix: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    min_accuracy: Optional[float] = None,
+    sort: str = "product",
+    limit: int = Query(500, ge=1, le=5000),
+    cursor: Optional[str] = None,
+):
     """
-    if not os.path.exists(OUTPUT_DIR_B):
-        return JSONResponse({"error": "결과 폴더를 찾을 수 없습니다."}, status_code=404)
-
-    dfs = []
-    for file in os.listdir(OUTPUT_DIR_B):
-        if not file.endswith(".csv") or file.lower().startswith("ensemble_summary"):
-            continue
-        path = os.path.join(OUTPUT_DIR_B, file)
-        try:
-            df = pd.read_csv(path)
-            if "Product_Number" not in df.columns:
-                continue
-            df["Product_Number"] = os.path.splitext(file)[0].replace("_pred", "")
-            dfs.append(df)
-        except Exception as e:
-            print(f"[WARN] {file} 읽기 실패: {e}")
-            continue
-
-    if not dfs:
-        return JSONResponse({"error": "CSV 파일을 읽을 수 없습니다."}, status_code=404)
-
-    df_all = pd.concat(dfs, ignore_index=True).fillna(0)
-    numeric_cols = ["Pred_Value", "MAE", "SMAPE", "Accuracy"]
-    for col in numeric_cols:
-        if col in df_all.columns:
-            df_all[col] = pd.to_numeric(df_all[col], errors="coerce").fillna(0)
-
-    df_all = df_all.sort_values(by="Product_Number").reset_index(drop=True)
-    return JSONResponse(content=df_all.to_dict(orient="records"))
\ No newline at end of file
+    - product      : Product_Number 정확히 일치 (예: Product_86)
+    - prefix       : Product_Number 접두사 (예: Product_8 → 대시보드 필터 그룹)
+    - date_from/to : 예측 날짜 범위 (YYYY-MM-DD, 양 끝 포함)
+    - min_accuracy : Accuracy 하한
+    - sort         : product / date / pred / accuracy ("-" 접두사 시 내림차순)
+    - cursor       : 이전 응답의 next_cursor
+    """
+    try:
+        snapshot = await load_snapshot(FORECAST_DIRS[tab])
+    except ForecastLoadError as e:
+        return JSONResponse({"error": str(e)}, status_code=404)
+    if etag_matches(request, snapshot.etag):
+        return not_modified(snapshot.etag)
+
+    try:
+        result = await run_in_threadpool(
+            snapshot.index.query,
+            snapshot.version,
+            cursor=cursor,
+            limit=limit,
+            product=product,
+            prefix=prefix,
+            date_from=parse_date_param(date_from, "date_from"),
+            date_to=parse_date_param(date_to, "date_to"),
+            min_accuracy=min_accuracy,
+            sort=sort,
+        )
+    except StaleCursorError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    except ForecastQueryError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    return JSONResponse(result, headers={"ETag": snapshot.etag, "Cache-Control": "no-cache"})
+
+# ---------------------------------
+# 📡 예측 결과 변경 푸시 (SSE)
+# ---------------------------------
+@app.on_event("startup")
+async def start_forecast_watcher():
+    forecast_watcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_forecast_watcher():
+    await forecast_watcher.stop()
+
+
+@app.get("/api/stream/forecasts")
+async def stream_forecasts(request: Request, tab: str = Query("a", regex="^[ab]$")):
+    """
+    - event: version       → 접속 시점의 데이터 version
+    - event: forecast-diff → {"version", "previous", "changed": [바뀐 Product 행], "removed": [Product_Number]}
+    - event: reload        → diff 를 놓친 경우 전체 재조회 필요
+    """
+    return StreamingResponse(
+        forecast_watcher.stream(tab, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# ---------------------------------
+# 캐시 상태 (hit / miss)
+# ---------------------------------
+@app.get("/api/cache-stats")
+async def get_cache_stats():
+    return JSONResponse(forecast_cache.stats())
+
+# ---------------------------------
+# 📈 메트릭 (Prometheus 텍스트 형식)
+# ---------------------------------
+metrics_registry.gauge("kamp_forecast_cache_hits", "예측 결과 캐시 hit 수", lambda: forecast_cache.stats()["hits"])
+metrics_registry.gauge("kamp_forecast_cache_misses", "예측 결과 캐시 miss 수 (재로드)", lambda: forecast_cache.stats()["misses"])
+metrics_registry.gauge("kamp_forecast_cache_hit_ratio", "예측 결과 캐시 hit ratio", lambda: forecast_cache.stats()["hit_ratio"])
+metrics_registry.gauge("kamp_forecast_cache_entries", "캐시된 결과 폴더 수", lambda: forecast_cache.stats()["entries"])
+metrics_registry.gauge(
+    "kamp_forecast_stream_subscribers", "SSE 구독 중인 대시보드 수",
+    lambda: sum(len(queues) for queues in forecast_watcher.subscribers.values()),
+)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return Response(content=metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# ---------------------------------
+# 🤖 CNN-LSTM 실시간 예측 (마이크로 배칭)
+# ---------------------------------
+# 배치 최대 행 수 / 최대 대기 시간(ms) → CNN_LSTM_MAX_BATCH=1 이면 비배칭
+CNN_LSTM_MAX_BATCH = int(os.environ.get("CNN_LSTM_MAX_BATCH", "64"))
+CNN_LSTM_MAX_WAIT_MS = float(os.environ.get("CNN_LSTM_MAX_WAIT_MS", "5"))
+
+cnn_lstm_predictor = None
+cnn_lstm_batcher = None
+
+
+class CnnLstmRequest(BaseModel):
+    # [요청 수][7일][Temperature, Humidity, T일 예정 수주량]
+    windows: List[List[List[float]]]
+
+
+@app.on_event("startup")
+async def load_cnn_lstm():
+    """서버 시작 시 모델 + scaler 1번만 로드 (실패해도 나머지 API 는 동작)"""
+    global cnn_lstm_predictor, cnn_lstm_batcher
+    try:
+        cnn_lstm_predictor = await run_in_threadpool(CnnLstmPredictor)
+    except ModelUnavailableError as e:
+        print(f"[WARN] CNN-LSTM 모델 로드 실패: {e}")
+        return
+    cnn_lstm_batcher = MicroBatcher(
+        cnn_lstm_predictor.predict, max_batch_size=CNN_LSTM_MAX_BATCH, max_wait_ms=CNN_LSTM_MAX_WAIT_MS
+    )
+    cnn_lstm_batcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_cnn_lstm():
+    if cnn_lstm_batcher is not None:
+        await cnn_lstm_batcher.stop()
+
+
+@app.post("/api/predict/cnn-lstm")
+async def predict_cnn_lstm(body: CnnLstmRequest):
+    """
+    - 입력 : {"windows": [[[Temperature, Humidity, T일 예정 수주량] x 7일], ...]}
+    - 출력 : {"predictions": [T+1일 예정 수주량, ...]}
+    """
+    if cnn_lstm_batcher is None:
+        return JSONResponse({"error": "CNN-LSTM 모델을 불러올 수 없습니다."}, status_code=503)
+    try:
+        x = cnn_lstm_predictor.validate(body.windows)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    preds = await cnn_lstm_batcher.submit(x)
+    return JSONResponse({"predictions": [round(float(v), 2) for v in preds]})
+
+
+@app.get("/api/predict/cnn-lstm/stats")
+async def get_cnn_lstm_stats():
+    if cnn_lstm_batcher is None:
+        return JSONResponse({"error": "CNN-LSTM 모델을 불러올 수 없습니다."}, status_code=503)
+    return JSONResponse(cnn_lstm_batcher.stats())
@@ -0,0 +1,225 @@
+"""
+파일명 : metrics.py
+설명   : Prometheus 텍스트 형식 메트릭 (/metrics)
+         - 라우트별 요청 수 / 응답 시간 히스토그램 (라우트는 경로 템플릿 기준 → 값이 늘어나지 않음)
+         - 처리 중인 요청 수 (in-flight)
+         - 예측 결과 로드 단계별 시간 : csv_read / artifact_read / concat / normalize / serialize / compress
+         - 캐시 hit ratio 등은 출력 시점에 콜백으로 읽음
+         - 외부 라이브러리 없이 dict + lock 만 사용 (요청당 perf_counter 2번 + bisect 1번)
+경로   : KAMP/backend/metrics.py
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# 응답 시간 버킷 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 데이터 로드 단계 버킷 (초) : 수 ms ~ 수십 초
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names, values, extra=""):
+    parts = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self.values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{format_labels(self.label_names, labels)} {format_value(value)}")
+        return lines
+
+
+class Gauge:
+    """값을 직접 올리고 내리거나(inc / dec), fn 을 주면 출력 시점에 fn() 값을 사용"""
+
+    def __init__(self, name, help_text, fn=None):
+        self.name = name
+        self.help_text = help_text
+        self.fn = fn
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+    def render(self):
+        value = self.fn() if self.fn is not None else self.value
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {format_value(value)}",
+        ]
+
+
+class Histogram:
+    """
+    라벨별 버킷 카운트 (버킷별 개수로 저장하고 출력 시 누적)
+    - observe : bisect 1번 + 카운트 증가
+    """
+
+    def __init__(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self.series = {}  # labels → [버킷별 개수(+Inf 포함), 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(s[0]), s[1], s[2])) for labels, s in self.series.items())
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{format_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.label_names, labels)} {format_value(total)}")
+            lines.append(f"{self.name}_count{format_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def gauge(self, name, help_text, fn):
+        """출력 시점에 fn() 을 읽는 gauge 등록 (캐시 hit ratio 등)"""
+        return self.register(Gauge(name, help_text, fn))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# ---------------------------------
+# 전역 메트릭
+# ---------------------------------
+registry = MetricsRegistry()
+
+http_requests = registry.register(Counter(
+    "kamp_http_requests_total", "HTTP 요청 수", ("method", "route", "status"),
+))
+http_latency = registry.register(Histogram(
+    "kamp_http_request_duration_seconds", "HTTP 응답 시간 (본문 전송 완료까지)", ("method", "route"),
+))
+http_in_flight = registry.register(Gauge(
+    "kamp_http_requests_in_flight", "처리 중인 HTTP 요청 수",
+))
+stage_latency = registry.register(Histogram(
+    "kamp_forecast_stage_duration_seconds", "예측 결과 로드 / 직렬화 단계별 시간", ("stage",), STAGE_BUCKETS,
+))
+
+
+@contextmanager
+def timed(stage):
+    """with timed("csv_read"): ... → 단계 시간 기록"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_latency.observe(time.perf_counter() - start, stage)
+
+
+# ---------------------------------
+# 미들웨어
+# ---------------------------------
+class MetricsMiddleware:
+    """
+    요청 수 / 응답 시간 / in-flight 수집 (ASGI 미들웨어)
+    - 라우트 라벨은 라우팅 후 scope["endpoint"] 로 찾은 경로 템플릿 (예: /assets/{path:path})
+    - 매칭되지 않은 요청(404)은 "unmatched" 하나로 묶음
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes = None
+
+    def route_template(self, scope):
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if self._routes is None:
+            routes = {}
+            for route in scope["app"].router.routes:
+                target = getattr(route, "endpoint", None) or getattr(route, "app", None)
+                routes.setdefault(target, route.path)
+            self._routes = routes
+        return self._routes.get(endpoint, UNMATCHED_ROUTE)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_flight.dec()
+            route = self.route_template(scope)
+            http_requests.inc(scope["method"], route, str(status[0]))
+            http_latency.observe(elapsed, scope["method"], route)
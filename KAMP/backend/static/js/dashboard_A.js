@@ -15,6 +15,9 @@ Chart.register(ChartDataLabels);
 
     const res = await fetch("/api/preprocessing-a");
     const data = await res.json();
+    // 서버 데이터 version (ETag) → SSE diff 적용 시 기준
+    let dataVersion = (res.headers.get("ETag") || "").replace(/"/g, "");
+    let currentPrefix = "Product_8";
     if (data.error) return console.error("데이터 로드 실패:", data.error);
 
     // ----------------------------
@@ -119,6 +122,7 @@ Chart.register(ChartDataLabels);
     // 메인 렌더 함수 (✨ 부드러운 페이드 + 순차 렌더 추가)
     // ----------------------------
     async function renderCharts(prefix) {
+        currentPrefix = prefix;
         const filtered = data.filter(d => d.Product_Number.startsWith(prefix));
         const products = [...new Set(filtered.map(d => d.Product_Number))];
 
@@ -336,6 +340,45 @@ Chart.register(ChartDataLabels);
         });
     }
 
+    // ----------------------------
+    // 📡 결과 변경 실시간 반영 (SSE diff → 바뀐 제품만 교체 후 재렌더)
+    // ----------------------------
+    function applyDiff(diff) {
+        const touched = new Set([...diff.removed, ...diff.changed.map(d => d.Product_Number)]);
+        for (let i = data.length - 1; i >= 0; i--) {
+            if (touched.has(data[i].Product_Number)) data.splice(i, 1);
+        }
+        data.push(...diff.changed);
+        // stable 정렬 → 제품 안의 날짜 순서 유지
+        data.sort((a, b) => (a.Product_Number < b.Product_Number ? -1 : a.Product_Number > b.Product_Number ? 1 : 0));
+        dataVersion = diff.version;
+    }
+
+    async function reloadAll() {
+        const r = await fetch("/api/preprocessing-a");
+        const fresh = await r.json();
+        if (fresh.error) return console.error("데이터 재조회 실패:", fresh.error);
+        data.splice(0, data.length, ...fresh);
+        dataVersion = (r.headers.get("ETag") || "").replace(/"/g, "");
+        renderCharts(currentPrefix);
+    }
+
+    if (window.EventSource) {
+        const source = new EventSource("/api/stream/forecasts?tab=a");
+        source.addEventListener("version", e => {
+            // 페이지 로드 ~ SSE 연결(재연결) 사이에 결과가 바뀐 경우만 재조회
+            const { version } = JSON.parse(e.data);
+            if (version && version !== dataVersion) reloadAll();
+        });
+        source.addEventListener("forecast-diff", e => {
+            const diff = JSON.parse(e.data);
+            if (diff.previous !== dataVersion) return reloadAll();
+            applyDiff(diff);
+            renderCharts(currentPrefix);
+        });
+        source.addEventListener("reload", () => reloadAll());
+    }
+
     // ✅ 전역에서 접근 가능하도록 export
     window.renderCharts_A = renderCharts;
 
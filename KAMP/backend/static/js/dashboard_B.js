@@ -15,6 +15,9 @@ Chart.register(ChartDataLabels);
 
     const res = await fetch("/api/preprocessing-b");
     const data = await res.json();
+    // 서버 데이터 version (ETag) → SSE diff 적용 시 기준
+    let dataVersion_B = (res.headers.get("ETag") || "").replace(/"/g, "");
+    let currentPrefix_B = "Product_8";
     if (data.error) return console.error("B탭 데이터 로드 실패:", data.error);
 
     // ----------------------------
@@ -117,6 +120,7 @@ Chart.register(ChartDataLabels);
     // 메인 렌더 함수 (✨ fade + 순차 렌더 추가)
     // ----------------------------
     async function renderCharts_B(prefix) {
+        currentPrefix_B = prefix;
         const filtered = data.filter(d => d.Product_Number.startsWith(prefix));
         const products = [...new Set(filtered.map(d => d.Product_Number))];
 
@@ -343,6 +347,45 @@ Chart.register(ChartDataLabels);
         }, 200);
     });
 
+    // ----------------------------
+    // 📡 결과 변경 실시간 반영 (SSE diff → 바뀐 제품만 교체 후 재렌더)
+    // ----------------------------
+    function applyDiff_B(diff) {
+        const touched = new Set([...diff.removed, ...diff.changed.map(d => d.Product_Number)]);
+        for (let i = data.length - 1; i >= 0; i--) {
+            if (touched.has(data[i].Product_Number)) data.splice(i, 1);
+        }
+        data.push(...diff.changed);
+        // stable 정렬 → 제품 안의 날짜 순서 유지
+        data.sort((a, b) => (a.Product_Number < b.Product_Number ? -1 : a.Product_Number > b.Product_Number ? 1 : 0));
+        dataVersion_B = diff.version;
+    }
+
+    async function reloadAll_B() {
+        const r = await fetch("/api/preprocessing-b");
+        const fresh = await r.json();
+        if (fresh.error) return console.error("B탭 데이터 재조회 실패:", fresh.error);
+        data.splice(0, data.length, ...fresh);
+        dataVersion_B = (r.headers.get("ETag") || "").replace(/"/g, "");
+        renderCharts_B(currentPrefix_B);
+    }
+
+    if (window.EventSource) {
+        const source_B = new EventSource("/api/stream/forecasts?tab=b");
+        source_B.addEventListener("version", e => {
+            // 페이지 로드 ~ SSE 연결(재연결) 사이에 결과가 바뀐 경우만 재조회
+            const { version } = JSON.parse(e.data);
+            if (version && version !== dataVersion_B) reloadAll_B();
+        });
+        source_B.addEventListener("forecast-diff", e => {
+            const diff = JSON.parse(e.data);
+            if (diff.previous !== dataVersion_B) return reloadAll_B();
+            applyDiff_B(diff);
+            renderCharts_B(currentPrefix_B);
+        });
+        source_B.addEventListener("reload", () => reloadAll_B());
+    }
+
     // ✅ 전역에서 접근 가능하도록 export
     window.renderCharts_B = renderCharts_B;
 
@@ -0,0 +1,85 @@
+"""
+파일명 : static_assets.py
+설명   : 정적 파일(css / js) 해시 URL + 미리 압축
+         - 서버 시작 시 static 폴더를 1번 읽어 내용 해시로 파일명 생성 (예: css/common.3f2a9c1d0b.css)
+         - gzip / brotli 로 미리 압축해 메모리에 보관 → 요청마다 압축하지 않음
+         - 해시 URL 은 내용이 바뀌면 URL 도 바뀌므로 Cache-Control: immutable (1년) 로 응답
+         - 템플릿에서는 {{ static_url('css/common.css') }} 로 참조
+경로   : KAMP/backend/static_assets.py
+"""
+
+import hashlib
+import mimetypes
+import os
+
+from fastapi.responses import Response
+
+from backend.compression import brotli, choose_encoding, compress
+
+ASSET_PREFIX = "/assets"
+PRECOMPRESS_EXTS = {".css", ".js", ".html", ".svg", ".json", ".txt"}
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class StaticAsset:
+    def __init__(self, data, media_type, digest):
+        self.media_type = media_type
+        self.etag = f'"{digest}"'
+        self.variants = {None: data}
+
+    def precompress(self):
+        raw = self.variants[None]
+        self.variants["gzip"] = compress(raw, "gzip", best=True)
+        if brotli is not None:
+            self.variants["br"] = compress(raw, "br", best=True)
+
+
+class StaticAssetManifest:
+    """원본 경로(css/common.css) ↔ 해시 경로(css/common.<hash>.css) 매핑 + 압축본"""
+
+    def __init__(self, static_dir, prefix=ASSET_PREFIX):
+        self.static_dir = static_dir
+        self.prefix = prefix
+        self.urls = {}
+        self.assets = {}
+
+    def build(self):
+        urls, assets = {}, {}
+        for root, _, files in os.walk(self.static_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, self.static_dir).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    data = f.read()
+
+                digest = hashlib.sha256(data).hexdigest()[:10]
+                stem, ext = os.path.splitext(rel)
+                hashed = f"{stem}.{digest}{ext}"
+                media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+                asset = StaticAsset(data, media_type, digest)
+                if ext.lower() in PRECOMPRESS_EXTS:
+                    asset.precompress()
+                assets[hashed] = asset
+                urls[rel] = f"{self.prefix}/{hashed}"
+
+        self.urls, self.assets = urls, assets
+        print(f"정적 파일 {len(assets)}개 해시 / 압축 완료")
+
+    def url(self, rel):
+        """템플릿용 : 해시 URL (manifest 에 없으면 기존 /static 경로)"""
+        return self.urls.get(rel, f"/static/{rel}")
+
+    def response(self, hashed, accept_encoding):
+        asset = self.assets.get(hashed)
+        if asset is None:
+            return None
+
+        encoding = choose_encoding(accept_encoding)
+        if encoding not in asset.variants:
+            encoding = None
+
+        headers = {"Cache-Control": IMMUTABLE, "ETag": asset.etag, "Vary": "Accept-Encoding"}
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(content=asset.variants[encoding], media_type=asset.media_type, headers=headers)
@@ -0,0 +1 @@
+# bench 디렉토리 패키지 (성능 측정 스크립트)
\ No newline at end of file
@@ -0,0 +1,289 @@
+"""
+파일명 : bench_backend.py
+설명   : 백엔드 부하 테스트 (커밋 간 비교용)
+         - 합성 앙상블 출력 폴더 생성 (Product 100 / 1,000 / 10,000 개, *_pred.csv 형식 동일)
+           + 앙상블 스크립트와 같은 통합 파일(ensemble_forecast.arrow) → 실제 서비스 경로 측정
+         - --source csv 로 통합 파일 없는 폴더(*_pred.csv 스캔 경로)도 측정 (both 면 둘 다)
+         - 폴더 크기별로 uvicorn 서버를 별도 프로세스로 띄움 (KAMP_OUTPUT_DIR_A / B 로 경로 지정)
+         - 동시 클라이언트(스레드, keep-alive) 로 /api/preprocessing-a, /api/preprocessing-b, /dashboard 호출
+         - 결과 JSON : 엔드포인트별 RPS, 지연시간 p50/p95/p99, 응답 크기, 서버 최대 RSS + git 커밋
+         - --compare 로 이전 결과 JSON 과 비교 (RPS / p95 변화율)
+실행법 :
+    cd ~/KAMP
+    python -m bench.bench_backend --output bench_result.json
+    python -m bench.bench_backend --sizes 100 1000 --compare bench_result.json
+    python -m bench.bench_backend --source both --sizes 1000 10000
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from models.common import FORECAST_ARTIFACT, write_forecast_artifact
+
+KAMP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_ENDPOINTS = ["/api/preprocessing-a", "/api/preprocessing-b", "/dashboard"]
+
+# 읽기 경로 : artifact = 통합 파일 (앙상블 스크립트 출력과 동일), csv = *_pred.csv 만
+SOURCES = ["artifact", "csv"]
+
+
+# ---------------------------------
+# 합성 데이터
+# ---------------------------------
+def generate_outputs(directory, n_products, days=3, seed=42, artifact=True):
+    """
+    train_tab_a_ensemble_forecast.py 출력과 같은 형식의 *_pred.csv 를 n_products 개 생성
+    - artifact=True 면 앙상블 스크립트처럼 통합 파일(ensemble_forecast.arrow)도 저장
+    - seed 고정 → 같은 인자면 항상 같은 파일
+    - 이미 만들어진 폴더(완료 표시 파일 존재)는 재사용
+    """
+    marker = os.path.join(directory, ".complete")
+    if os.path.exists(marker):
+        return directory
+    os.makedirs(directory, exist_ok=True)
+
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2022-05-12", periods=days).strftime("%Y-%m-%d")
+    frames = []
+    for i in range(n_products):
+        product = f"Product_{i:x}"
+        mae = round(float(rng.uniform(1, 60)), 2)
+        smape = round(float(rng.uniform(0.5, 30)), 2)
+        frame = pd.DataFrame({
+            "Date": dates,
+            "Product_Number": product,
+            "Pred_Value": rng.integers(0, 800, days),
+            "MAE": mae,
+            "SMAPE": smape,
+            "Accuracy": round(100 - smape, 2),
+        })
+        frame.to_csv(os.path.join(directory, f"{product}_pred.csv"), index=False, encoding="utf-8-sig")
+        frames.append(frame)
+
+    if artifact:
+        write_forecast_artifact(pd.concat(frames, ignore_index=True), os.path.join(directory, FORECAST_ARTIFACT))
+
+    with open(marker, "w") as f:
+        f.write(str(n_products))
+    return directory
+
+
+# ---------------------------------
+# 서버
+# ---------------------------------
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(output_dir, port, timeout=60):
+    env = dict(os.environ, KAMP_OUTPUT_DIR_A=output_dir, KAMP_OUTPUT_DIR_B=output_dir)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=KAMP_DIR, env=env, stdout=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"서버 시작 실패 (exit code {proc.returncode})")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/cache-stats")
+            conn.getresponse().read()
+            conn.close()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+
+    proc.terminate()
+    raise RuntimeError("서버가 시간 안에 응답하지 않습니다.")
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def peak_rss_mb(pid):
+    """서버 프로세스 최대 RSS (/proc/<pid>/status 의 VmHWM, Linux 외에는 None)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+# ---------------------------------
+# 부하
+# ---------------------------------
+def run_load(port, path, clients, requests, headers, warmup=5):
+    """clients 개 스레드가 keep-alive 연결로 총 requests 번 호출 → 지연시간 / 오류 / 응답 크기"""
+    for _ in range(warmup):
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", path, headers=headers)
+        conn.getresponse().read()
+        conn.close()
+
+    latencies, sizes, errors = [], [], [0]
+    remaining = [requests]
+    lock = threading.Lock()
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+                body, ok = b"", False
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                sizes.append(len(body))
+                if not ok:
+                    errors[0] += 1
+        conn.close()
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    lat_ms = np.array(latencies) * 1000
+    return {
+        "endpoint": path,
+        "requests": len(latencies),
+        "errors": errors[0],
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(lat_ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(lat_ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(lat_ms, 99)), 2),
+        "avg_bytes": int(np.mean(sizes)),
+    }
+
+
+# ---------------------------------
+# 결과
+# ---------------------------------
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=KAMP_DIR, stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current):
+    """
+    (products, source, endpoint) 별 RPS / p95 변화율(%) 를 current 결과에 추가
+    - source 가 없는 이전 결과는 csv 경로로 측정한 것
+    """
+    base = {(r["products"], r.get("source", "csv"), r["endpoint"]): r for r in baseline["results"]}
+    for r in current["results"]:
+        b = base.get((r["products"], r["source"], r["endpoint"]))
+        if b is None:
+            continue
+        r["baseline"] = {
+            "commit": baseline.get("commit"),
+            "rps_change_pct": round((r["rps"] / b["rps"] - 1) * 100, 1) if b["rps"] else None,
+            "p95_change_pct": round((r["p95_ms"] / b["p95_ms"] - 1) * 100, 1) if b["p95_ms"] else None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="백엔드 부하 테스트 (합성 앙상블 결과)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Product 수 목록")
+    parser.add_argument("--endpoints", nargs="+", default=DEFAULT_ENDPOINTS, help="측정할 경로")
+    parser.add_argument("--clients", type=int, default=16, help="동시 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=500, help="엔드포인트별 총 요청 수")
+    parser.add_argument("--days", type=int, default=3, help="Product 별 예측 일수 (CSV 행 수)")
+    parser.add_argument("--source", choices=SOURCES + ["both"], default="artifact",
+                        help="artifact = 통합 파일 (실제 서비스 경로, 기본), csv = *_pred.csv 스캔, both = 둘 다")
+    parser.add_argument("--accept-encoding", default="gzip, br", help="요청 Accept-Encoding (빈 문자열이면 압축 없음)")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "kamp_bench"),
+                        help="합성 데이터 폴더 (크기별 하위 폴더, 재사용)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (생략 시 출력만)")
+    args = parser.parse_args()
+
+    headers = {"Accept-Encoding": args.accept_encoding} if args.accept_encoding else {}
+    result = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "clients": args.clients, "requests": args.requests, "days": args.days,
+            "accept_encoding": args.accept_encoding, "source": args.source,
+        },
+        "results": [],
+    }
+
+    sources = SOURCES if args.source == "both" else [args.source]
+    for n_products in args.sizes:
+        for source in sources:
+            output_dir = generate_outputs(
+                os.path.join(args.data_dir, f"products_{n_products}_days_{args.days}_{source}"),
+                n_products, args.days, artifact=source == "artifact",
+            )
+            port = free_port()
+            proc = start_server(output_dir, port)
+            try:
+                for path in args.endpoints:
+                    print(f"▶ products={n_products} source={source} {path}", flush=True)
+                    row = {"products": n_products, "source": source}
+                    row.update(run_load(port, path, args.clients, args.requests, headers))
+                    row["peak_rss_mb"] = peak_rss_mb(proc.pid)
+                    result["results"].append(row)
+            finally:
+                stop_server(proc)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), result)
+
+    text = json.dumps(result, ensure_ascii=False, indent=4)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+파일명 : bench_cnn_lstm_serving.py
+설명   : CNN-LSTM 실시간 예측 배칭 vs 비배칭 처리량 비교 (CPU)
+         - 모델을 프로세스 안에서 로드하고 MicroBatcher 로 동시 요청을 재현 (HTTP 오버헤드 제외)
+         - 비배칭 : max_batch_size=1 (요청마다 model 호출)
+         - 배칭   : max_batch_size / max_wait_ms 설정값
+         - 결과 JSON 출력 (req/s, 지연시간 p50/p95/p99, 평균 배치 크기)
+실행법 :
+    cd ~/KAMP
+    python -m bench.bench_cnn_lstm_serving --clients 64 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+# GPU 가 있어도 CPU 기준으로 측정
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+
+import numpy as np
+
+from backend.cnn_lstm_service import CnnLstmPredictor, MicroBatcher
+
+
+async def run_mode(predictor, windows, clients, max_batch_size, max_wait_ms):
+    batcher = MicroBatcher(predictor.predict, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    batcher.start()
+
+    # 워밍업 (첫 호출 그래프 빌드 시간 제외)
+    await batcher.submit(windows[:1])
+    batcher.batches = batcher.rows = 0
+
+    latencies = []
+    queue = list(range(len(windows)))
+
+    async def client():
+        while queue:
+            i = queue.pop()
+            start = time.perf_counter()
+            await batcher.submit(windows[i:i + 1])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    await batcher.stop()
+
+    lat_ms = np.array(latencies) * 1000
+    return {
+        "max_batch_size": max_batch_size,
+        "max_wait_ms": max_wait_ms,
+        "requests": len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(lat_ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(lat_ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(lat_ms, 99)), 2),
+        "avg_batch_rows": batcher.stats()["avg_batch_rows"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CNN-LSTM 배칭 / 비배칭 처리량 비교")
+    parser.add_argument("--clients", type=int, default=64, help="동시 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=2000, help="모드별 총 요청 수")
+    parser.add_argument("--max-batch", type=int, default=64, help="배칭 모드 최대 배치 행 수")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="배칭 모드 최대 대기 시간(ms)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (생략 시 출력만)")
+    args = parser.parse_args()
+
+    predictor = CnnLstmPredictor()
+    rng = np.random.default_rng(42)
+    # 원 단위 범위와 비슷한 임의 입력 [Temperature, Humidity, T일 예정 수주량]
+    windows = np.stack([
+        rng.uniform(-5, 35, (args.requests, predictor.seq_len)),
+        rng.uniform(10, 90, (args.requests, predictor.seq_len)),
+        rng.integers(0, 800, (args.requests, predictor.seq_len)),
+    ], axis=-1).astype(np.float32)
+
+    result = {
+        "clients": args.clients,
+        "unbatched": asyncio.run(run_mode(predictor, windows, args.clients, 1, 0.0)),
+        "batched": asyncio.run(run_mode(predictor, windows, args.clients, args.max_batch, args.max_wait_ms)),
+    }
+    result["speedup"] = round(result["batched"]["rps"] / result["unbatched"]["rps"], 2)
+
+    text = json.dumps(result, ensure_ascii=False, indent=4)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
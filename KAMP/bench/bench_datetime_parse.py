@@ -0,0 +1,151 @@
+"""
+파일명 : bench_datetime_parse.py
+설명   : 02 단계 DateTime 처리 기존 방식 vs 형식 감지 방식 비교
+         - 원본과 같은 형식 비율의 DateTime 문자열을 rows 개 생성 (seed 고정)
+             ○ 2022-04-29 06:01:00 (약 50%) / 2022-02-20 15:31 (약 17%) / 2022-01-27 6:25 (약 33%)
+         - parse   : format="mixed" vs data.common.parse_datetime
+         - split   : 기존 (mixed + Date / Time strftime + 03 단계 Date 재파싱)
+                     vs 현재 (parse_datetime + Date datetime 유지 + Time 고유 시각만 문자열 변환)
+         - 두 방식의 결과가 같은지 확인 후 결과 JSON 출력 (반복 중 최소 시간)
+실행법 :
+    cd ~/KAMP
+    python -m bench.bench_datetime_parse
+    python -m bench.bench_datetime_parse --rows 1000000 --repeat 3 --output datetime_bench.json
+"""
+
+import argparse
+import importlib
+import json
+import platform
+import time
+
+import numpy as np
+import pandas as pd
+
+from data.common import parse_datetime
+
+stage02 = importlib.import_module("data.processed.02_data_cleansing")
+
+# 원본 데이터셋의 형식별 비율 (17,253 / 5,902 / 11,462 행)
+FORMAT_MIX = [("%Y-%m-%d %H:%M:%S", 0.50), ("%Y-%m-%d %H:%M", 0.17), ("unpadded_hour", 0.33)]
+
+
+# ---------------------------------
+# 합성 데이터
+# ---------------------------------
+def generate_datetimes(rows, seed=42, start="2022-01-26", days=106):
+    """
+    원본과 같은 형식이 섞인 DateTime 문자열 (object 배열)
+    - 분 단위 시각(days * 1440 개)을 형식별로 1번씩만 문자열로 만든 뒤 인덱스로 펼침
+    """
+    rng = np.random.default_rng(seed)
+    minutes = pd.Timestamp(start) + pd.to_timedelta(np.arange(days * 1440), unit="min")
+
+    variants = []
+    for fmt, _ in FORMAT_MIX:
+        if fmt == "unpadded_hour":
+            labels = [f"{t:%Y-%m-%d} {t.hour}:{t.minute:02d}" for t in minutes]
+        else:
+            labels = minutes.strftime(fmt).tolist()
+        variants.append(np.array(labels, dtype=object))
+
+    which = rng.choice(len(FORMAT_MIX), size=rows, p=[p for _, p in FORMAT_MIX])
+    picked = rng.integers(0, len(minutes), rows)
+    values = np.empty(rows, dtype=object)
+    for i, labels in enumerate(variants):
+        mask = which == i
+        values[mask] = labels[picked[mask]]
+    return pd.Series(values, name="DateTime")
+
+
+# ---------------------------------
+# 측정 대상
+# ---------------------------------
+def legacy_parse(series):
+    return pd.to_datetime(series, format="mixed", errors="coerce")
+
+
+def legacy_split(series):
+    """기존 02 split_datetime + 03 remove_date_outliers 의 날짜 처리"""
+    times = legacy_parse(series)
+    date = times.dt.strftime("%Y-%m-%d")
+    time_text = times.dt.strftime("%H:%M:%S")
+    date = pd.to_datetime(date, errors="coerce")
+    return date, time_text
+
+
+def current_split(series):
+    """현재 02 split_datetime (03 단계는 datetime 그대로 사용)"""
+    times = parse_datetime(series)
+    date = times.dt.normalize()
+    time_text = stage02.format_time(times - date)
+    return date, time_text
+
+
+def measure(fn, series, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(series)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 3), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DateTime 파싱 / 분리 벤치마크")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="생성할 DateTime 행 수")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수 (최소 시간 사용)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (생략 시 출력만)")
+    args = parser.parse_args()
+
+    print(f"DateTime {args.rows:,}행 생성 중 ...", flush=True)
+    series = generate_datetimes(args.rows, args.seed)
+
+    results = []
+
+    print("▶ parse", flush=True)
+    legacy_s, legacy_times = measure(legacy_parse, series, args.repeat)
+    current_s, current_times = measure(parse_datetime, series, args.repeat)
+    results.append({
+        "step": "parse",
+        "legacy_s": legacy_s,
+        "current_s": current_s,
+        "speedup": round(legacy_s / current_s, 2),
+        "same_result": bool(np.array_equal(legacy_times.to_numpy("datetime64[ns]"), current_times.to_numpy("datetime64[ns]"))),
+    })
+    del legacy_times, current_times
+
+    print("▶ split (Date / Time 생성 + 03 단계 Date)", flush=True)
+    legacy_s, (legacy_date, legacy_time) = measure(legacy_split, series, args.repeat)
+    current_s, (current_date, current_time) = measure(current_split, series, args.repeat)
+    same = (
+        np.array_equal(legacy_date.to_numpy("datetime64[ns]"), current_date.to_numpy("datetime64[ns]"))
+        and np.array_equal(np.asarray(legacy_time, dtype=object), np.asarray(current_time, dtype=object))
+    )
+    results.append({
+        "step": "split",
+        "legacy_s": legacy_s,
+        "current_s": current_s,
+        "speedup": round(legacy_s / current_s, 2),
+        "same_result": bool(same),
+    })
+
+    result = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "rows": args.rows,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=4)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+전처리 단계 캐시 (입력 / 설정 / 코드의 내용 해시)
+    - 단계마다 키 = 해시(입력 파일 내용 + 설정값 + 단계 스크립트 + data/common.py)
+    - 저장된 결과의 키가 같고 결과 파일도 저장 당시 그대로면 그 단계는 다시 실행하지 않음
+    - 다음 단계의 입력은 이전 단계의 결과 파일이므로
+        ○ 이전 단계 결과가 바뀌면 다음 단계 키도 바뀜 → 아래 단계가 자동으로 다시 실행됨
+        ○ 04 단계 코드만 고치면 01 ~ 03 단계 키는 그대로 → 04 단계만 다시 실행됨
+    - 기록 위치 : data/results/stage_cache.json (단계 이름 → 키 / 결과 파일 해시)
+    - KAMP_CACHE=0 이면 항상 다시 실행 (기록은 계속함)
+"""
+
+import hashlib
+import json
+import os
+import time
+
+# data.common에 작성된 코드 가져오기
+from data import common
+from data.common import BASE_DIR, RESULT_DIR
+from data.storage import find_frame, stored_files
+
+MANIFEST_PATH = os.path.join(RESULT_DIR, "stage_cache.json")
+
+# 모든 단계가 같이 사용하는 코드 (바뀌면 전체 단계 다시 실행)
+SHARED_SOURCES = [common.__file__]
+
+CACHE_ENABLED = os.environ.get("KAMP_CACHE", "1") != "0"
+
+#####################################################################
+# 해시
+#####################################################################
+
+def file_digest(path, chunk_size = 1 << 20):
+    """파일 내용 해시 (수정 시각이 아니라 내용 기준)"""
+    digest = hashlib.blake2b(digest_size = 16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stage_name(source):
+    """단계 스크립트 경로 → 단계 이름 (예: 03_outlier_value_all_delete)"""
+    return os.path.splitext(os.path.basename(source))[0]
+
+
+def input_digests(path):
+    """입력 경로의 파일별 해시 [[파일명, 해시], ...] (읽는 파일이 먼저, 없으면 FileNotFoundError)"""
+    find_frame(path)
+    return [[os.path.basename(found), file_digest(found)] for found in stored_files(path)]
+
+
+def stage_key(source, inputs, config):
+    """
+    단계 캐시 키
+    - source : 단계 스크립트 경로 (__file__)
+    - inputs : 입력 경로 목록 (기존 CSV 경로)
+               → 존재하는 형식(parquet / feather / csv) 파일 + 조각 파일을 모두 해시
+                 (load_frame 이 읽는 파일 외에 다른 형식 파일만 바뀐 경우에도 다시 실행)
+    - config : 결과에 영향을 주는 설정값 (dict, JSON 으로 기록 가능한 값)
+    """
+    payload = {
+        "stage"  : stage_name(source),
+        "inputs" : [input_digests(path) for path in inputs],
+        "config" : config,
+        "code"   : [file_digest(path) for path in [source] + SHARED_SOURCES],
+    }
+    text = json.dumps(payload, sort_keys = True, ensure_ascii = False, default = str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+#####################################################################
+# 기록 (stage_cache.json)
+#####################################################################
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    try:
+        with open(MANIFEST_PATH, encoding = "utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        print(f"[WARN] 캐시 기록을 읽지 못했습니다. 모든 단계를 다시 실행합니다: {MANIFEST_PATH}")
+        return {}
+
+
+def save_manifest(manifest):
+    # 임시 파일에 쓰고 교체 → 중간에 끊겨도 기록 파일이 깨지지 않음
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding = "utf-8") as f:
+        json.dump(manifest, f, ensure_ascii = False, indent = 4)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def is_fresh(source, key):
+    """키가 같고 기록된 결과 파일이 모두 저장 당시 내용 그대로면 True"""
+    if not CACHE_ENABLED:
+        return False
+    entry = load_manifest().get(stage_name(source))
+    if not entry or entry.get("key") != key:
+        return False
+
+    for relpath, digest in entry.get("outputs", {}).items():
+        path = os.path.join(BASE_DIR, relpath)
+        if not os.path.exists(path) or file_digest(path) != digest:
+            return False
+    return True
+
+
+def record(source, key, written):
+    """단계 실행 후 키와 저장한 결과 파일(save_frame 반환값 등)의 해시 기록"""
+    manifest = load_manifest()
+    manifest[stage_name(source)] = {
+        "key"      : key,
+        "outputs"  : {os.path.relpath(path, BASE_DIR): file_digest(path) for path in written},
+        "saved_at" : time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    save_manifest(manifest)
@@ -1,5 +1,11 @@
 # 계속해서 세팅할 필요 없이 여기서 경로 설정을 다 해줌
+import csv
 import os
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
 
 # ~/KAMP/data 까지의 디렉토리
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -7,4 +13,186 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # 각 폴더에 맞게 디렉토리 세팅
 PROCESSED_DIR   = os.path.join(BASE_DIR, "processed")   # 전처리 관련 코드 디렉토리
 RAW_DIR         = os.path.join(BASE_DIR, "raw")         # 전처리 전 원본 csv 디렉토리
-RESULT_DIR      = os.path.join(BASE_DIR, "results")     # 전처리 후 csv 디렉토리
\ No newline at end of file
+RESULT_DIR      = os.path.join(BASE_DIR, "results")     # 전처리 후 csv 디렉토리
+
+# 원본 데이터셋 파일명
+RAW_FILE = "사출성형_공급망최적화_AI_데이터셋.csv"
+
+# 결측으로 간주할 문자열 (read_csv 의 na_values / 읽은 뒤 replace 용)
+NA_VALUES  = ["", " ", "NA", "N/A", "na", "Na", "null", "NULL", "-", "--", "None"]
+NA_STRINGS = NA_VALUES + ["nan", "NaN", "NAN"]
+
+
+#####################################################################
+# 공통 스키마 (02 단계 이후 전처리 결과 CSV 를 읽고 쓸 때 사용)
+#   - Product_Number / DoW   : category (같은 문자열을 행마다 객체로 저장하지 않음)
+#   - 수주량 컬럼             : 정수 → 값 범위에 맞는 가장 작은 정수형 (현재 데이터는 int16)
+#   - Temperature / Humidity : float32 (02 단계에서 소수점 3자리로 정리된 값)
+#   - Date                   : datetime64 (소비하는 쪽에서 다시 파싱하지 않음)
+#   - CSV 로 다시 저장하면 기존과 같은 문자열로 기록됨
+#####################################################################
+
+CATEGORY_COLS = ["Product_Number", "DoW"]
+SENSOR_COLS   = ["Temperature", "Humidity"]
+DATE_COLS     = ["Date", "date"]
+DATE_FORMAT   = "%Y-%m-%d"
+SENSOR_DTYPE  = "float32"
+
+
+def is_order_column(col):
+    # 02 ~ 04 단계 : "... 수주량" / 보조강사님 전처리 데이터 : demand_T, demand_last_year
+    return "수주량" in col or col.startswith("demand_")
+
+
+def schema_dtypes(columns):
+    """
+    read_csv 의 dtype 인자
+    - 수주량은 int32 로 읽은 뒤 apply_schema 에서 값 범위를 확인하고 downcast
+      (read_csv 에 int16 을 바로 주면 범위를 넘는 값이 경고 없이 잘림)
+    - Date 는 category 로 읽고 고유 날짜(약 100개)만 파싱 (parse_dates 로 행마다 파싱하는 것보다 빠름)
+    """
+    dtypes = {}
+    for col in columns:
+        if col in CATEGORY_COLS:
+            dtypes[col] = "category"
+        elif col in SENSOR_COLS:
+            dtypes[col] = SENSOR_DTYPE
+        elif col in DATE_COLS:
+            dtypes[col] = "category"
+        elif is_order_column(col):
+            dtypes[col] = "int32"
+    return dtypes
+
+
+def parse_dates(series):
+    """Date 문자열 → datetime64 (category 면 카테고리 값만 파싱 후 codes 로 펼침, 실패 값은 NaT)"""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = pd.to_datetime(series.cat.categories, format = DATE_FORMAT, errors = "coerce")
+        values = categories.take(series.cat.codes.to_numpy(), allow_fill = True)
+        return pd.Series(values, index = series.index, name = series.name)
+    return pd.to_datetime(series, format = DATE_FORMAT, errors = "coerce")
+
+
+def order_dtype(arrays):
+    """수주량 값 범위에 맞는 가장 작은 정수형 (int16 → int32 → int64)"""
+    low = min(values.min() for values in arrays)
+    high = max(values.max() for values in arrays)
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if low >= info.min and high <= info.max:
+            return dtype
+    return np.int64
+
+
+def apply_schema(df):
+    """이미 메모리에 있는 DataFrame 에 스키마 적용 (pipeline.py 처럼 CSV 를 거치지 않는 경우에도 사용)"""
+    df = df.copy()
+    orders = {}
+    for col in df.columns:
+        series = df[col]
+        if col in CATEGORY_COLS and not isinstance(series.dtype, pd.CategoricalDtype):
+            df[col] = series.astype("category")
+        elif col in SENSOR_COLS and series.dtype != SENSOR_DTYPE:
+            df[col] = series.astype(SENSOR_DTYPE)
+        elif col in DATE_COLS and not pd.api.types.is_datetime64_any_dtype(series.dtype):
+            df[col] = parse_dates(series)
+        elif is_order_column(col) and pd.api.types.is_integer_dtype(series.dtype):
+            # 결측 / 소수가 남은 float 컬럼은 그대로 둠
+            orders[col] = series.to_numpy()
+
+    # 수주량 컬럼은 전체 값 범위로 정수형 1개를 정해 downcast (컬럼마다 dtype 이 달라지지 않음)
+    if orders and len(df):
+        dtype = order_dtype(orders.values())
+        for col, values in orders.items():
+            df[col] = values.astype(dtype)
+    return df
+
+
+def read_csv_columns(path):
+    """CSV 헤더(컬럼 목록)만 읽기"""
+    with open(path, encoding = "utf-8-sig", newline = "") as f:
+        return next(csv.reader(f), [])
+
+
+def read_csv_typed(path, usecols = None, **kwargs):
+    """전처리 결과 CSV 를 공통 스키마로 읽기 (usecols 지정 시 필요한 컬럼만 파싱)"""
+    columns = usecols if usecols is not None else read_csv_columns(path)
+    df = pd.read_csv(path, encoding = "utf-8-sig", usecols = usecols, dtype = schema_dtypes(columns), **kwargs)
+    return apply_schema(df)
+
+
+#####################################################################
+# 원본 DateTime 파싱 (형식 감지 + 캐시)
+#   - 원본에는 몇 가지 형식만 섞여 있음
+#     (2022-04-29 06:01:00 / 2022-02-20 15:31 / 2022-01-27 6:25 → 모두 ISO 8601 계열)
+#   - format = "mixed" 는 값마다 형식을 추측 → 감지한 형식을 지정해 묶음 단위로 한 번에 파싱
+#       1) 첫 값이 ISO 8601 계열이면 전체를 format = "ISO8601" 로 1번 파싱 (원본 데이터는 여기서 끝남)
+#       2) 남은 값은 문자열 길이로 묶고, 묶음의 첫 값으로 감지한 형식을 지정해 파싱
+#       3) 그래도 남은 값만 format = "mixed" 로 처리 → 결과는 기존과 동일
+#   - 감지한 형식은 값 모양(숫자 → 9)별로 캐시 → 청크 / 증분 실행에서도 다시 추측하지 않음
+#####################################################################
+
+DATETIME_FORMATS = [
+    "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S",
+    "%Y/%m/%d %H:%M:%S", "%Y/%m/%d %H:%M", "%Y/%m/%d",
+    "%Y.%m.%d %H:%M:%S", "%Y.%m.%d %H:%M", "%Y.%m.%d",
+]
+ISO_FORMATS = DATETIME_FORMATS[:4]
+DIGITS = re.compile(r"\d")
+FORMAT_CACHE = {}   # 값 모양 → 형식 (후보 중 맞는 형식이 없으면 None)
+
+
+def detect_datetime_format(value):
+    """값 1개의 형식 (DATETIME_FORMATS 순서대로 시도, 결과는 FORMAT_CACHE 에 저장)"""
+    value = str(value)
+    shape = DIGITS.sub("9", value)
+    if shape not in FORMAT_CACHE:
+        FORMAT_CACHE[shape] = None
+        for fmt in DATETIME_FORMATS:
+            try:
+                datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+            FORMAT_CACHE[shape] = fmt
+            break
+    return FORMAT_CACHE[shape]
+
+
+def parse_datetime(series):
+    """DateTime 문자열 → datetime64[ns] (결측 / 파싱 실패는 NaT, format = "mixed" 와 같은 결과)"""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series
+
+    values = series.to_numpy(dtype = object)
+    notna = pd.notna(values)
+    result = np.full(len(values), np.datetime64("NaT"), dtype = "datetime64[ns]")
+
+    first = values[notna][:1]
+    if len(first) and detect_datetime_format(first[0]) in ISO_FORMATS:
+        result = pd.to_datetime(values, format = "ISO8601", errors = "coerce").to_numpy(dtype = "datetime64[ns]")
+
+    # ISO 8601 로 파싱되지 않은 값 → 길이별 묶음마다 형식 감지 후 지정해서 파싱
+    rest = np.flatnonzero(notna & np.isnat(result))
+    if len(rest):
+        lengths = np.fromiter((len(str(value)) for value in values[rest]), dtype = np.int64, count = len(rest))
+        codes, uniques = pd.factorize(lengths)
+
+        unparsed = []
+        for code in range(len(uniques)):
+            rows = rest[codes == code]
+            fmt = detect_datetime_format(values[rows[0]])
+            if fmt is None:
+                unparsed.append(rows)
+                continue
+            parsed = pd.to_datetime(values[rows], format = fmt, errors = "coerce").to_numpy(dtype = "datetime64[ns]")
+            ok = ~np.isnat(parsed)
+            result[rows[ok]] = parsed[ok]
+            unparsed.append(rows[~ok])
+
+        # 길이는 같지만 형식이 다른 값 / 후보에 없는 형식 → 해당 값만 기존 방식으로 추측
+        rest = np.concatenate(unparsed)
+        if len(rest):
+            result[rest] = pd.to_datetime(values[rest], format = "mixed", errors = "coerce").to_numpy(dtype = "datetime64[ns]")
+    return pd.Series(result, index = series.index, name = series.name)
@@ -0,0 +1,251 @@
+"""
+전처리 단계 계측 (어느 단계가 오래 걸리는지 / 메모리를 많이 쓰는지 확인)
+    - 단계마다 기록 : wall 시간, CPU 시간, tracemalloc 최대 메모리, 입력 / 출력 행 수
+    - 코드에서 사용
+        ○ with trace_step("read_csv") as step: ... step.rows_out = len(df)
+        ○ @traced() : DataFrame → DataFrame 함수 (첫 인자 / 반환값의 행 수를 자동 기록)
+    - 기본은 꺼짐 → trace_step / traced 는 전역 값 1번 확인 후 원래 코드를 그대로 실행
+    - 계측 켜기 : 스크립트에 --trace 옵션 또는 KAMP_TRACE 환경 변수
+        ○ KAMP_TRACE=1    : 시간 + 메모리(tracemalloc) 기록
+        ○ KAMP_TRACE=time : 시간만 기록 (tracemalloc 은 실행을 2 ~ 3배 느리게 하므로 시간만 볼 때 사용)
+        ○ 예) KAMP_TRACE=1 python -m data.processed.02_data_cleansing --force
+    - 실행이 끝나면 data/results/traces/<스크립트>_<시각>.json 저장
+        ○ 단계 순서대로 1줄씩 기록 → 실행끼리 diff 또는 이 모듈의 비교 기능으로 확인
+        ○ 두 실행 비교 : python -m data.instrument data/results/traces/A.json data/results/traces/B.json
+"""
+
+import argparse
+import atexit
+import functools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+# data.common에 작성된 코드 가져오기
+from data.common import RESULT_DIR
+
+TRACE_DIR = os.path.join(RESULT_DIR, "traces")
+
+MODES = ["1", "time"]
+
+# 현재 설정 (enable 로 켬)
+STATE = {"mode": None, "steps": [], "stack": [], "started_at": None, "start": None}
+
+# 종료 시 저장(write_trace)을 이미 등록했는지 (다시 켜도 1번만 등록 → 같은 기록을 2번 저장하지 않음)
+ATEXIT_REGISTERED = False
+
+
+def enabled():
+    return STATE["mode"] is not None
+
+
+def enable(mode = "1", write_at_exit = True):
+    """계측 시작 (이미 켜져 있으면 그대로)"""
+    global ATEXIT_REGISTERED
+    if enabled():
+        return
+    if mode not in MODES:
+        raise ValueError(f"지원하지 않는 KAMP_TRACE 값입니다: {mode} (가능: {', '.join(MODES)})")
+
+    STATE.update(mode = mode, steps = [], stack = [], started_at = time.strftime("%Y-%m-%dT%H:%M:%S"), start = time.perf_counter())
+    if mode == "1" and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if write_at_exit and not ATEXIT_REGISTERED:
+        atexit.register(write_trace)
+        ATEXIT_REGISTERED = True
+
+#####################################################################
+# 단계 기록
+#####################################################################
+
+class Step:
+    """단계 1개의 기록 (rows_in / rows_out 은 with 블록 안에서 직접 넣을 수 있음)"""
+
+    __slots__ = ("name", "depth", "rows_in", "rows_out", "peak")
+
+    def __init__(self, name, depth = 0, rows_in = None):
+        self.name = name
+        self.depth = depth
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.peak = 0
+
+
+# 꺼져 있을 때 돌려주는 기록 (값을 넣어도 저장하지 않음)
+NULL_STEP = Step("disabled")
+
+
+def count_rows(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    return None
+
+
+def memory_peak():
+    return tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+
+
+@contextmanager
+def measure(name, rows_in = None):
+    stack = STATE["stack"]
+    step = Step(name, len(stack), rows_in)
+
+    # tracemalloc 최대값은 전역 1개 → 바깥 단계의 최대값을 넘겨받고 안쪽 단계용으로 초기화
+    if stack:
+        stack[-1].peak = max(stack[-1].peak, memory_peak())
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    start_current = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+    record = {"name": name, "depth": step.depth}
+    STATE["steps"].append(record)  # 시작 순서대로 기록 (안쪽 단계가 바깥 단계 뒤에 옴)
+    stack.append(step)
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield step
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        stack.pop()
+        step.peak = max(step.peak, memory_peak())
+
+        record.update(wall_s = round(wall, 4), cpu_s = round(cpu, 4))
+        if tracemalloc.is_tracing():
+            record.update(peak_mb = round(step.peak / 2 ** 20, 2),
+                          alloc_mb = round((tracemalloc.get_traced_memory()[0] - start_current) / 2 ** 20, 2))
+        record.update(rows_in = step.rows_in, rows_out = step.rows_out)
+
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, step.peak)
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+
+def trace_step(name, df = None):
+    """
+    단계 계측 context manager
+    - df : 입력 DataFrame (행 수만 기록)
+    - 꺼져 있으면 아무것도 하지 않음
+    """
+    if STATE["mode"] is None:
+        return NULL_CONTEXT
+    return measure(name, count_rows(df))
+
+
+class NullContext:
+    def __enter__(self):
+        return NULL_STEP
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_CONTEXT = NullContext()
+
+
+def traced(name = None):
+    """DataFrame → DataFrame 함수 계측 데코레이터 (입력 행 수 = 첫 인자, 출력 행 수 = 반환값)"""
+    def decorator(fn):
+        step_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if STATE["mode"] is None:
+                return fn(*args, **kwargs)
+            with measure(step_name, count_rows(args[0]) if args else None) as step:
+                result = fn(*args, **kwargs)
+                step.rows_out = count_rows(result)
+            return result
+        return wrapper
+    return decorator
+
+#####################################################################
+# 결과 저장 / 비교
+#####################################################################
+
+def script_name():
+    return os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0]
+
+
+def write_trace(path = None):
+    """기록한 단계를 JSON 으로 저장 후 경로 반환 (꺼져 있거나 기록이 없으면 None)"""
+    if not enabled() or not STATE["steps"]:
+        return None
+    if path is None:
+        os.makedirs(TRACE_DIR, exist_ok = True)
+        path = os.path.join(TRACE_DIR, f"{script_name()}_{time.strftime('%Y%m%d_%H%M%S')}.json")
+
+    trace = {
+        "script"     : script_name(),
+        "argv"       : sys.argv[1:],
+        "started_at" : STATE["started_at"],
+        "mode"       : STATE["mode"],
+        "python"     : platform.python_version(),
+        "pandas"     : pd.__version__,
+        "wall_s"     : round(time.perf_counter() - STATE["start"], 4),
+        "steps"      : STATE["steps"],
+    }
+    with open(path, "w", encoding = "utf-8") as f:
+        json.dump(trace, f, ensure_ascii = False, indent = 4)
+    STATE["steps"] = []
+    print(f"단계별 계측 결과 저장 : {path}")
+    return path
+
+
+def compare_traces(before, after):
+    """두 trace 의 단계별 wall 시간 / 최대 메모리 비교 (같은 이름은 순서대로 짝지음)"""
+    def keyed(trace):
+        seen, rows = {}, {}
+        for step in trace["steps"]:
+            n = seen[step["name"]] = seen.get(step["name"], 0) + 1
+            rows[(step["name"], n)] = step
+        return rows
+
+    old, new = keyed(before), keyed(after)
+    rows = []
+    for key in list(old) + [k for k in new if k not in old]:
+        a, b = old.get(key, {}), new.get(key, {})
+        rows.append({
+            "step"    : ("  " * (b or a).get("depth", 0)) + key[0],
+            "wall_a"  : a.get("wall_s"),
+            "wall_b"  : b.get("wall_s"),
+            "peak_a"  : a.get("peak_mb"),
+            "peak_b"  : b.get("peak_mb"),
+        })
+    return rows
+
+
+def format_value(value, width = 10):
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}.3f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "계측 결과(JSON) 2개 비교")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    with open(args.before, encoding = "utf-8") as f:
+        before = json.load(f)
+    with open(args.after, encoding = "utf-8") as f:
+        after = json.load(f)
+
+    print(f"{'step':<40}{'wall A':>10}{'wall B':>10}{'peak A':>10}{'peak B':>10}")
+    for row in compare_traces(before, after):
+        print(f"{row['step']:<40}{format_value(row['wall_a'])}{format_value(row['wall_b'])}"
+              f"{format_value(row['peak_a'])}{format_value(row['peak_b'])}")
+    print(f"{'total':<40}{format_value(before['wall_s'])}{format_value(after['wall_s'])}")
+
+
+# 환경 변수로 켠 경우 import 시점부터 기록
+if os.environ.get("KAMP_TRACE", "0") not in ("", "0"):
+    enable(os.environ["KAMP_TRACE"])
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,9 @@
 실행법
     - 1. 프로젝트의 ROOT 폴더로 이동 | ~/KAMP
     - 2. cmd에 코드 실행           | python -m data.processed.01_missing_value_all_delete
+        ○ --chunksize 200000 : 원본을 청크 단위로 읽어 처리 (메모리 사용량이 청크 크기로 제한됨)
+        ○ --force            : 원본 / 설정 / 코드가 그대로여도 다시 실행 (기본은 변경 없으면 건너뜀)
+        ○ --trace            : 단계별 시간 / 메모리 계측 결과 저장 (data/results/traces/*.json)
 """
 
 """
@@ -29,70 +32,198 @@ Q. 왜 범위를 지정하는지?
     - 데이터 손실이 커지고 시계열/패턴 정보가 망가질 가능성이 엄청 높음
 """
 
+import argparse
 import os
 import pandas as pd
 
 # data.common에 작성된 코드 가져오기
-from data.common import RAW_DIR, RESULT_DIR
+from data.common import RAW_DIR, RESULT_DIR, RAW_FILE, NA_VALUES, NA_STRINGS
+from data.cache import stage_key, is_fresh, record
+from data.instrument import enable, trace_step, traced
+from data.storage import save_frame, save_chunks
 
 # 원본 및 저장될 파일 경로 세팅
-file_path       = os.path.join(RAW_DIR, "사출성형_공급망최적화_AI_데이터셋.csv")
+file_path       = os.path.join(RAW_DIR, RAW_FILE)
 output_path     = os.path.join(RESULT_DIR, "01_00_전처리_결측치_제거.csv")
 
+# 캐시 키에 들어가는 설정값 (바뀌면 이 단계부터 다시 실행)
+STAGE_CONFIG = {"ratio_percent": 30, "na_values": NA_VALUES, "na_strings": NA_STRINGS}
+
 #####################################################################
 # 원본 데이터셋 불러오고 세팅
 #####################################################################
 
-df = pd.read_csv(file_path, encoding = "utf-8-sig", na_values = ["", " ", "NA", "N/A", "na", "Na", "null", "NULL", "-", "--", "None"])
+def load_raw(path = file_path):
+    with trace_step("read_csv") as step:
+        df = pd.read_csv(path, encoding = "utf-8-sig", na_values = NA_VALUES)
+        step.rows_out = len(df)
 
-print(f"원본 데이터셋 로드 완료 / 행 개수 : {df.shape[0]}, 열 개수 : {df.shape[1]}")
+    print(f"원본 데이터셋 로드 완료 / 행 개수 : {df.shape[0]}, 열 개수 : {df.shape[1]}")
 
-# 문자열 형태의 결측 표현을 진짜 NaN으로 변환
-df = df.replace(["", " ", "NA", "N/A", "na", "Na", "null", "NULL", "-", "--", "None", "nan", "NaN", "NAN"], pd.NA)
+    # 문자열 형태의 결측 표현을 진짜 NaN으로 변환
+    with trace_step("replace_na_strings", df):
+        return df.replace(NA_STRINGS, pd.NA)
 
 #####################################################################
 # 결측치 값 확인
 #####################################################################
 
-# 컬럼별 결측치가 몇 개인지
-col_missing = df.isna().sum()
-print(f"원본 데이터셋 컬럼별 결측치 개수 : {col_missing.to_string()}개")
+def report_missing(col_missing, n_rows):
+    # 컬럼별 결측치가 몇 개인지
+    print(f"원본 데이터셋 컬럼별 결측치 개수 : {col_missing.to_string()}개")
+
+    # 결측치 총합
+    total_missing = col_missing.sum()
+    print(f"총 결측치 개수 : {total_missing}개")
+
+    # 완전성 품질 % 계산
+    completeness = (1 - (total_missing / n_rows)) * 100 # 계산식 > 완전성 = (1 - (결측치 개수 / 전체 행 수)) × 100
+    print(f"완전성 품질 % : {completeness:.2f}%")
 
-# 결측치 총합
-total_missing = df.isna().sum().sum()
-print(f"총 결측치 개수 : {total_missing}개")
 
-# 완전성 품질 % 계산
-completeness = (1 - (total_missing / len(df))) * 100 # 계산식 > 완전성 = (1 - (결측치 개수 / 전체 행 수)) × 100
-print(f"완전성 품질 % : {completeness:.2f}%")
+def check_missing(df):
+    col_missing = df.isna().sum()
+    report_missing(col_missing, len(df))
+    return col_missing
 
 #####################################################################
 # 열 기준으로 결측치 비율 30% 이상인 컬럼 제거
 #####################################################################
 
-ratio_percent = 30  # 30% 기준
-ratio_missing = (col_missing / len(df)) * 100 # 계산식 > (결측치 개수 / 전체 행 수) × 100
-drop_cols = ratio_missing[ratio_missing > ratio_percent].index.tolist() # 30% 넘는 열만 저장
+def select_drop_columns(col_missing, n_rows, ratio_percent = 30):
+    ratio_missing = (col_missing / n_rows) * 100 # 계산식 > (결측치 개수 / 전체 행 수) × 100
+    drop_cols = ratio_missing[ratio_missing > ratio_percent].index.tolist() # 30% 넘는 열만 저장
+
+    if drop_cols:
+        print(f"결측치 비율 {ratio_percent}% 초과 컬럼 제거: {drop_cols}")
+    else:
+        print(f"결측치 비율 {ratio_percent}% 초과 컬럼 없음")
+    return drop_cols
+
+
+@traced()
+def drop_missing(df, ratio_percent = 30):
+    col_missing = check_missing(df)
 
-if drop_cols:
-    print(f"결측치 비율 30% 초과 컬럼 제거: {drop_cols}")
-    df.drop(columns=drop_cols, inplace=True)
-else:
-    print("결측치 비율 30% 초과 컬럼 없음")
+    drop_cols = select_drop_columns(col_missing, len(df), ratio_percent)
+    if drop_cols:
+        df = df.drop(columns=drop_cols)
 
-# 행 단위 결측치 제거
-# 만약 결측치가 조금이라도 있는 데이터를 다 지우고 싶으면 if문 밖으로 아래 구문 빼기 > 원래 넣었었으나 30% 초과하는 결측치가 없나봄;; 제거가 안돼;;
-df.dropna(inplace=True)
-df.reset_index(drop=True, inplace=True)
+    # 행 단위 결측치 제거
+    # 만약 결측치가 조금이라도 있는 데이터를 다 지우고 싶으면 if문 밖으로 아래 구문 빼기 > 원래 넣었었으나 30% 초과하는 결측치가 없나봄;; 제거가 안돼;;
+    df = df.dropna().reset_index(drop=True)
+
+    print(f"결측치 제거 후 데이터 크기: {df.shape}")
+    return df
+
+
+# pipeline.py 에서 호출하는 단계 함수 (DataFrame → DataFrame)
+def process(df):
+    return drop_missing(df, STAGE_CONFIG["ratio_percent"])
+
+#####################################################################
+# 청크 단위 처리 (원본이 메모리보다 클 때)
+#   - 1차 : 청크마다 결측 표현 정리 + 컬럼별 결측 개수 / 행 수 / 컬럼 타입 누적
+#   - 2차 : 30% 규칙으로 정한 컬럼 제거 + 행 단위 결측 제거 후 청크별로 바로 내보냄
+#   → 한 번에 메모리에 올라가는 건 청크 1개
+#####################################################################
 
-print(f"결측치 제거 후 데이터 크기: {df.shape}")
+def iter_raw_chunks(path, chunksize, dtype = None):
+    reader = pd.read_csv(path, encoding = "utf-8-sig", na_values = NA_VALUES, chunksize = chunksize, dtype = dtype)
+    for chunk in reader:
+        yield chunk.replace(NA_STRINGS, pd.NA)
+
+
+def merge_dtype(previous, current):
+    """
+    청크마다 추론된 타입을 전체 기준으로 합침 (한 번에 읽었을 때와 같은 타입이 되도록)
+    - 문자열이 한 번이라도 나오면 문자열, 결측 등으로 실수가 나오면 실수
+    """
+    if previous is None or previous == current:
+        return current
+    if "object" in (previous, current):
+        return "object"
+    if previous.startswith("float") or current.startswith("float"):
+        return "float64"
+    return "object"
+
+
+def scan_missing(path = file_path, chunksize = 200000):
+    """1차 : (컬럼별 결측 개수, 전체 행 수, 컬럼별 dtype)"""
+    col_missing = None
+    n_rows = 0
+    dtypes = {}
+    for chunk in iter_raw_chunks(path, chunksize):
+        counts = chunk.isna().sum()
+        col_missing = counts if col_missing is None else col_missing.add(counts, fill_value = 0)
+        n_rows += len(chunk)
+        for col, dtype in chunk.dtypes.items():
+            dtypes[col] = merge_dtype(dtypes.get(col), str(dtype))
+
+    print(f"원본 데이터셋 청크 스캔 완료 / 행 개수 : {n_rows}, 열 개수 : {len(dtypes)}")
+    return col_missing.astype("int64"), n_rows, dtypes
+
+
+def iter_drop_missing(path = file_path, chunksize = 200000, ratio_percent = 30):
+    """2차 : 결측 컬럼 / 행을 제거한 청크를 순서대로 생성"""
+    col_missing, n_rows, dtypes = scan_missing(path, chunksize)
+    report_missing(col_missing, n_rows)
+    drop_cols = select_drop_columns(col_missing, n_rows, ratio_percent)
+
+    # 정수로 추론된 컬럼은 청크마다 결측 여부에 따라 타입이 달라질 수 있으므로 2차에서는 합친 타입으로 고정
+    fixed = {col: (str if dtype == "object" else dtype) for col, dtype in dtypes.items() if not dtype.startswith("int")}
+
+    kept_rows = 0
+    for chunk in iter_raw_chunks(path, chunksize, dtype = fixed):
+        if drop_cols:
+            chunk = chunk.drop(columns = drop_cols)
+        chunk = chunk.dropna()
+        kept_rows += len(chunk)
+        yield chunk
+
+    print(f"결측치 제거 후 데이터 크기: ({kept_rows}, {len(dtypes) - len(drop_cols)})")
+
+
+def write_chunks(chunks, path):
+    """
+    청크를 원본 형식 CSV 로 이어 붙여 저장 (첫 청크만 BOM + 헤더)
+    - 합성 원본 생성(data/synthetic.py)용, 단계 결과는 data.storage.save_chunks 로 저장
+    """
+    first = True
+    for chunk in chunks:
+        chunk.to_csv(path, index = False, encoding = "utf-8-sig" if first else "utf-8",
+                     mode = "w" if first else "a", header = first)
+        first = False
 
 #####################################################################
 # 결과 저장 
 #####################################################################
 
-df.to_csv(output_path, index=False, encoding="utf-8-sig")
-print(f"전처리된 데이터 저장 완료: {output_path}")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "결측치 확인 및 제거")
+    parser.add_argument("--chunksize", type = int, help = "청크 단위 처리 행 수 (생략 시 한 번에 로드)")
+    parser.add_argument("--force", action = "store_true", help = "변경이 없어도 다시 실행")
+    parser.add_argument("--trace", action = "store_true", help = "단계별 시간 / 메모리 계측 결과 저장 (data/results/traces)")
+    args = parser.parse_args()
+
+    if args.trace:
+        enable()
+
+    # 원본 / 설정 / 코드가 지난 실행과 같으면 기존 결과 그대로 사용
+    key = stage_key(__file__, [file_path], STAGE_CONFIG)
+    if not args.force and is_fresh(__file__, key):
+        print(f"원본 / 설정 변경 없음 → 기존 결과 사용: {output_path}")
+    else:
+        # 컬럼형 파일(KAMP_STORAGE, 기본 parquet) + 확인용 CSV 저장
+        # (pipeline.py 가 남긴 이전 컬럼형 파일도 함께 교체 → 02 단계가 새 결과를 읽음)
+        if args.chunksize:
+            with trace_step("chunked_drop_missing"):
+                written = save_chunks(iter_drop_missing(file_path, args.chunksize, STAGE_CONFIG["ratio_percent"]), output_path, export_csv = True)
+        else:
+            written = save_frame(process(load_raw()), output_path, export_csv = True)
+        record(__file__, key, written)
+
+        print(f"전처리된 데이터 저장 완료: {output_path}")
 
 """
 결과는 결측치가 없다고 나옴.
@@ -2,6 +2,10 @@
 실행법
     - 1. 프로젝트의 ROOT 폴더로 이동 | ~/KAMP
     - 2. cmd에 코드 실행           | python -m data.processed.01_missing_value_gubun_change
+        ○ --strategies mean ffill : 필요한 대체 방식만 생성 (mean / median / linear / time / ffill, 기본 mean median linear)
+        ○ --ratio-percent 30      : 이 비율(%) 초과로 결측인 컬럼은 대체하지 않고 제거
+        ○ --force                 : 원본 / 설정 / 코드가 그대로여도 다시 실행 (기본은 변경 없으면 건너뜀)
+        ○ --trace                 : 단계별 시간 / 메모리 계측 결과 저장 (data/results/traces/*.json)
 """
 
 """
@@ -9,6 +13,10 @@
     - 데이터에 누락된 값(NaN)이 있는지 확인하고 품질 확보를 위해 처리함
     - 결측치가 30% 이상인 컬럼은 의미 있는 분석이 어렵다고 판단해 제거
     - 남은 결측치는 평균값, 중앙값, 보간법 등으로 대체하여 데이터 손실 최소화
+    - 대체는 Product_Number 별로 수행 (다른 제품의 값이 섞이지 않음)
+        ○ 제품 / DateTime 순 정렬과 groupby 는 1번만 계산하고 모든 대체 방식이 같이 사용
+        ○ 요청한 방식만 1개씩 만들어 저장 (모든 방식의 DataFrame 을 동시에 메모리에 두지 않음)
+        ○ 결측이 있는 수치형 컬럼만 계산하고 나머지 컬럼은 원본을 그대로 사용
 """
 
 """
@@ -30,88 +38,197 @@ Q. 왜 범위를 지정하는지?
     - 데이터 손실이 커지고 시계열/패턴 정보가 망가질 가능성이 엄청 높음
 """
 
+import argparse
+import importlib
 import os
+
+import numpy as np
 import pandas as pd
 
 # data.common에 작성된 코드 가져오기
-from data.common import RAW_DIR, RESULT_DIR
-
-# 원본 및 저장될 파일 경로 세팅
-file_path       = os.path.join(RAW_DIR, "사출성형_공급망최적화_AI_데이터셋.csv")
-
-output_mean     = os.path.join(RESULT_DIR, "01_01_전처리_결측치_평균값_대체.csv")
-output_median   = os.path.join(RESULT_DIR, "01_02_전처리_결측치_중앙값_대체.csv")
-output_interp   = os.path.join(RESULT_DIR, "01_03_전처리_결측치_보간법_대체.csv")
-
-#####################################################################
-# 원본 데이터셋 불러오고 세팅
-#####################################################################
-
-df = pd.read_csv(file_path, encoding = "utf-8-sig", na_values = ["", " ", "NA", "N/A", "na", "Na", "null", "NULL", "-", "--", "None"])
+from data.common import RESULT_DIR, parse_datetime
+from data.storage import save_frame
+from data.cache import stage_key, is_fresh, record
+from data.instrument import enable, trace_step
 
-print(f"원본 데이터셋 로드 완료 / 행 개수 : {df.shape[0]}, 열 개수 : {df.shape[1]}")
+# 원본 로드 / 결측 확인 / 30% 컬럼 선택은 01_missing_value_all_delete 와 같은 규칙 사용
+stage01 = importlib.import_module("data.processed.01_missing_value_all_delete")
 
-# 문자열 형태의 결측 표현을 진짜 NaN으로 변환
-df = df.replace(["", " ", "NA", "N/A", "na", "Na", "null", "NULL", "-", "--", "None", "nan", "NaN", "NAN"], pd.NA)
-
-#####################################################################
-# 결측치 값 확인
-#####################################################################
-
-# 컬럼별 결측치가 몇 개인지
-col_missing = df.isna().sum()
-print(f"원본 데이터셋 컬럼별 결측치 개수 : {col_missing}개")
-
-# 결측치 총합
-total_missing = df.isna().sum().sum()
-print(f"총 결측치 개수 : {total_missing}개")
-
-# 완전성 품질 % 계산
-completeness = (1 - (total_missing / len(df))) * 100 # 계산식 > 완전성 = (1 - (결측치 개수 / 전체 행 수)) × 100
-print(f"완전성 품질 % : {completeness:.2f}%")
+# 원본 및 저장될 파일 경로 세팅
+file_path = stage01.file_path
+
+OUTPUTS = {
+    "mean"   : os.path.join(RESULT_DIR, "01_01_전처리_결측치_평균값_대체.csv"),
+    "median" : os.path.join(RESULT_DIR, "01_02_전처리_결측치_중앙값_대체.csv"),
+    "linear" : os.path.join(RESULT_DIR, "01_03_전처리_결측치_보간법_대체.csv"),
+    "time"   : os.path.join(RESULT_DIR, "01_04_전처리_결측치_시간보간_대체.csv"),
+    "ffill"  : os.path.join(RESULT_DIR, "01_05_전처리_결측치_직전값_대체.csv"),
+}
+
+STRATEGY_NAMES = {
+    "mean"   : "평균값",
+    "median" : "중앙값",
+    "linear" : "보간법(선형)",
+    "time"   : "보간법(시간)",
+    "ffill"  : "직전값",
+}
+
+# 기존 스크립트가 만들던 3개
+DEFAULT_STRATEGIES = ["mean", "median", "linear"]
 
 #####################################################################
-# 열 기준으로 결측치 비율 30% 이상인 컬럼 제거
+# 제품별 선형 보간 (정렬된 배열 기준)
 #####################################################################
 
-ratio_percent = 30  # 30% 기준
-ratio_missing = (col_missing / len(df)) * 100 # 계산식 > (결측치 개수 / 전체 행 수) × 100
-drop_cols = ratio_missing[ratio_missing > ratio_percent].index.tolist() # 30% 넘는 열만 저장
-
-if drop_cols:
-    print(f"결측치 비율 30% 초과 컬럼 제거: {drop_cols}")
-    df.drop(columns=drop_cols, inplace=True)
-else:
-    print("결측치 비율 30% 초과 컬럼 없음")
+def interpolate_sorted(values, x, codes):
+    """
+    제품 → 시간 순으로 정렬된 배열에서 같은 제품 안의 앞 / 뒤 유효값 사이를 x 기준으로 선형 보간
+    - pandas interpolate 와 같은 규칙
+        ○ 제품 앞쪽 결측 (앞 유효값 없음) : NaN 유지
+        ○ 제품 뒤쪽 결측 (뒤 유효값 없음) : 마지막 유효값
+    - 앞 / 뒤 유효값 위치는 누적 max / min 으로 한 번에 계산 (제품별 반복 없음)
+    """
+    n = len(values)
+    rows = np.arange(n)
+    valid = ~np.isnan(values) & ~np.isnan(x) & (codes >= 0)
+
+    prev = np.maximum.accumulate(np.where(valid, rows, -1))
+    after = np.minimum.accumulate(np.where(valid, rows, n)[::-1])[::-1]
+    prev_at, after_at = np.clip(prev, 0, n - 1), np.clip(after, 0, n - 1)
+
+    # 다른 제품의 값은 사용하지 않음
+    has_prev = (prev >= 0) & (codes[prev_at] == codes) & (codes >= 0)
+    has_after = (after < n) & (codes[after_at] == codes) & (codes >= 0)
+
+    missing = np.isnan(values)
+    result = values.copy()
+
+    between = missing & has_prev & has_after & ~np.isnan(x)
+    x0, x1 = x[prev_at[between]], x[after_at[between]]
+    y0, y1 = values[prev_at[between]], values[after_at[between]]
+    span = x1 - x0
+    weight = np.divide(x[between] - x0, span, out = np.zeros_like(span), where = span != 0)
+    result[between] = y0 + (y1 - y0) * weight
+
+    tail = missing & has_prev & ~has_after
+    result[tail] = values[prev_at[tail]]
+    return result
 
 #####################################################################
-# 결측치 대체[평균값, 중앙값, 보간법(선형)] 총 3개
+# 결측치 대체 엔진 (제품별 그룹 정보를 1번만 계산)
 #####################################################################
 
-# 평균값 대체
-df_mean = df.fillna(df.mean(numeric_only=True))
-print("평균값으로 대체 완료")
-
-# 중앙값 대체
-df_median = df.fillna(df.median(numeric_only=True))
-print("중앙값으로 대체 완료")
-
-# 보간법(선형)
-df_interp = df.interpolate(method='linear')
-print("보간법(선형)으로 대체 완료")
+class ProductImputer:
+    """
+    Product_Number 별 결측치 대체
+    - 결측이 있는 수치형 컬럼만 제품 → DateTime 순으로 정렬해 1번 복사
+    - groupby 객체 / 정렬 순서 / 제품 코드는 모든 대체 방식이 같이 사용
+    - fill(strategy) : 대체된 컬럼만 원본 행 순서로 반환
+    """
+
+    def __init__(self, df, group_col = "Product_Number", time_col = "DateTime"):
+        self.columns = [col for col in df.select_dtypes("number").columns if df[col].isna().any()]
+        if not self.columns:
+            return
+
+        codes = pd.factorize(df[group_col])[0]
+        times = parse_datetime(df[time_col]).to_numpy(dtype = "datetime64[ns]")
+        seconds = (times - times.min()) / np.timedelta64(1, "s") if (~np.isnat(times)).any() else np.full(len(df), np.nan)
+
+        # 제품 안에서는 시간 순 (DateTime 이 없는 행은 제품 안에서 맨 뒤)
+        order = np.lexsort((np.nan_to_num(seconds, nan = np.inf), codes))
+        self.order = order
+        self.codes = codes[order]
+        self.seconds = seconds[order]
+        self.frame = df[self.columns].iloc[order].reset_index(drop = True).astype("float64")
+
+        # 제품 결측 행(-1)은 어느 그룹에도 넣지 않음
+        keys = np.where(self.codes >= 0, self.codes, np.nan)
+        self.grouped = self.frame.groupby(keys, sort = False)
+
+    def fill_sorted(self, strategy):
+        frame = self.frame
+        if strategy in ("mean", "median"):
+            # 제품 전체가 결측인 값은 전체 통계값으로 대체
+            stats = self.grouped.transform(strategy).fillna(getattr(frame, strategy)())
+            return frame.fillna(stats)
+        if strategy == "ffill":
+            return self.grouped.ffill()
+        if strategy in ("linear", "time"):
+            x = np.arange(len(frame), dtype = "float64") if strategy == "linear" else self.seconds
+            return pd.DataFrame({col: interpolate_sorted(frame[col].to_numpy(), x, self.codes) for col in self.columns})
+        raise ValueError(f"지원하지 않는 대체 방식입니다: {strategy} (가능: {', '.join(OUTPUTS)})")
+
+    def fill(self, strategy):
+        """{컬럼: 대체된 값(원본 행 순서)}"""
+        if not self.columns:
+            return {}
+        filled = self.fill_sorted(strategy)
+        result = {}
+        for col in self.columns:
+            values = np.empty(len(self.order), dtype = "float64")
+            values[self.order] = filled[col].to_numpy()
+            result[col] = values
+        return result
+
+
+def iter_imputed(df, strategies = DEFAULT_STRATEGIES, group_col = "Product_Number", time_col = "DateTime"):
+    """요청한 대체 방식별 (strategy, DataFrame) 을 1개씩 생성"""
+    for strategy in strategies:
+        if strategy not in OUTPUTS:
+            raise ValueError(f"지원하지 않는 대체 방식입니다: {strategy} (가능: {', '.join(OUTPUTS)})")
+
+    with trace_step("group_products", df):
+        imputer = ProductImputer(df, group_col, time_col)
+    if not imputer.columns:
+        print("대체할 결측치가 없습니다. (원본 그대로 저장)")
+
+    for strategy in strategies:
+        # 얕은 복사 후 대체된 컬럼만 교체 → 나머지 컬럼은 원본 메모리를 그대로 사용
+        with trace_step(f"impute_{strategy}", df):
+            result = df.copy(deep = False)
+            for col, values in imputer.fill(strategy).items():
+                result[col] = values
+        print(f"{STRATEGY_NAMES[strategy]}으로 대체 완료 / 남은 결측치 : {int(result[imputer.columns].isna().sum().sum()) if imputer.columns else 0}개")
+        yield strategy, result
 
 #####################################################################
-# 결과 저장 
+# 원본 데이터셋 불러오기 → 30% 초과 컬럼 제거 → 결측치 대체 → 결과 저장
 #####################################################################
 
-df_mean.to_csv(output_mean, index=False, encoding="utf-8-sig")      # 평균값
-df_median.to_csv(output_median, index=False, encoding="utf-8-sig")  # 중앙갑
-df_interp.to_csv(output_interp, index=False, encoding="utf-8-sig")  # 보간법(선형)
-
-print(f"💾 결측치 대체 데이터 저장 완료\n"
-      f" - 평균값 대체  : {output_mean}\n"
-      f" - 중앙값 대체 : {output_median}\n"
-      f" - 보간밥 대체 : {output_interp}")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "결측치 대체 (제품별)")
+    parser.add_argument("--strategies", nargs = "+", choices = list(OUTPUTS), default = DEFAULT_STRATEGIES, help = "생성할 대체 방식")
+    parser.add_argument("--ratio-percent", type = float, default = stage01.STAGE_CONFIG["ratio_percent"], help = "이 비율(%%) 초과로 결측인 컬럼 제거")
+    parser.add_argument("--force", action = "store_true", help = "변경이 없어도 다시 실행")
+    parser.add_argument("--trace", action = "store_true", help = "단계별 시간 / 메모리 계측 결과 저장 (data/results/traces)")
+    args = parser.parse_args()
+
+    if args.trace:
+        enable()
+
+    # 원본 / 설정 / 코드가 지난 실행과 같으면 기존 결과 그대로 사용
+    config = dict(stage01.STAGE_CONFIG, ratio_percent = args.ratio_percent, strategies = args.strategies)
+    key = stage_key(__file__, [file_path], config)
+    if not args.force and is_fresh(__file__, key):
+        print("원본 / 설정 변경 없음 → 기존 결과 사용\n" + "\n".join(f" - {OUTPUTS[s]}" for s in args.strategies))
+    else:
+        df = stage01.load_raw(file_path)
+
+        col_missing = stage01.check_missing(df)
+        drop_cols = stage01.select_drop_columns(col_missing, len(df), args.ratio_percent)
+        if drop_cols:
+            df = df.drop(columns = drop_cols)
+
+        saved, written = [], []
+        for strategy, imputed in iter_imputed(df, args.strategies):
+            # 컬럼형 파일(KAMP_STORAGE, 기본 parquet) + 확인용 CSV 저장
+            written += save_frame(imputed, OUTPUTS[strategy], export_csv = True)
+            saved.append(f" - {STRATEGY_NAMES[strategy]} 대체 : {OUTPUTS[strategy]}")
+            del imputed
+        record(__file__, key, written)
+
+        print("💾 결측치 대체 데이터 저장 완료\n" + "\n".join(saved))
 
 """
 결과는 결측치가 없다고 나옴.
@@ -2,6 +2,11 @@
 실행법
     - 1. 프로젝트의 ROOT 폴더로 이동 | ~/KAMP
     - 2. cmd에 코드 실행           | python -m data.processed.02_data_cleansing
+        ○ --required-days 95 : 제품별로 필요한 연속 수집 일수
+        ○ --continuity flag  : 불연속 제품을 삭제하지 않고 Continuous 컬럼으로 표시만 함 (기본 drop)
+        ○ --calendar daily   : 달력 기준 연속 여부 확인 (기본 observed = 실제 수집일 기준)
+        ○ --force            : 입력 / 설정 / 코드가 그대로여도 다시 실행 (기본은 변경 없으면 건너뜀)
+        ○ --trace            : 단계별 시간 / 메모리 계측 결과 저장 (data/results/traces/*.json)
 """
 
 """
@@ -30,6 +35,8 @@ Q. 정제 시 포함되는 주요 처리 과정
     연속 수집 안 된 제품 제거
         - 모든 제품은 95일 연속 측정되어야 함
         - 하루라도 결측된 경우 해당 제품 전체를 제거 (불연속 데이터 제거)
+        - 연속 여부는 전체 데이터의 수집일(달력이 아니라 실제로 수집된 날짜) 기준
+          → 공장 전체가 쉰 날(예: 2022-03-15 ~ 03-23)은 결측으로 보지 않음
     
     데이터 형식 정제
         - 수주량 관련 컬럼은 단위가 ‘개수’ 단위이므로 소수점은 의미가 없음
@@ -53,11 +60,17 @@ Q. 결과
 """
 
 
+import argparse
 import os
+
+import numpy as np
 import pandas as pd
 
-# data.common 에서 경로 불러오기
-from data.common import RESULT_DIR
+# data.common 에서 경로 / 공통 스키마 불러오기
+from data.common import RESULT_DIR, apply_schema, parse_dates, parse_datetime
+from data.storage import load_frame, save_frame
+from data.cache import stage_key, is_fresh, record
+from data.instrument import enable, trace_step, traced
 
 #####################################################################
 # 파일 경로 설정
@@ -69,136 +82,249 @@ file_path = os.path.join(RESULT_DIR, "01_00_전처리_결측치_제거.csv")
 # 저장될 파일명 및 위치
 output_path = os.path.join(RESULT_DIR, "02_전처리_데이터_정제.csv")
 
-#####################################################################
-# 데이터 불러오기
-#####################################################################
+# 01 단계 결과는 공통 스키마 적용 전 데이터 (수주량 실수형 등 원본 dtype 그대로 읽음)
+input_schema = False
 
-df = pd.read_csv(file_path, encoding = "utf-8-sig")
-
-print(f"데이터 로드 완료 / 행 : {df.shape[0]}, 열 : {df.shape[1]}")
+# 캐시 키에 들어가는 설정값 (바뀌면 이 단계부터 다시 실행)
+STAGE_CONFIG = {"required_days": 95, "continuity": "drop", "calendar": "observed"}
 
 #####################################################################
 # DateTime 컬럼 분리 (Date / Time)
 #####################################################################
 
-if "DateTime" not in df.columns:
-    raise ValueError("DateTime 컬럼이 존재하지 않습니다. 원본 파일을 확인하세요.")
+def format_time(offsets):
+    """하루 중 경과 시간(timedelta) → "hh:mm:ss" 문자열 (NaT 는 결측)"""
+    codes, uniques = pd.factorize(offsets)
+    seconds = uniques.total_seconds().astype(int)
+    labels = [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in seconds]
+    return pd.Categorical.from_codes(codes, labels).astype(object)
+
 
-# 문자열 포맷 불일치 대비 : mixed 모드로 안전하게 변환
-df["DateTime"] = pd.to_datetime(df["DateTime"], format = "mixed", errors = "coerce")
+@traced()
+def split_datetime(df):
+    if "DateTime" not in df.columns:
+        raise ValueError("DateTime 컬럼이 존재하지 않습니다. 원본 파일을 확인하세요.")
 
-# 변환에 실패한 행이 있는지 확인
-if df["DateTime"].isna().any():
-    print("일부 DateTime 값이 변환되지 않았습니다. 원본 데이터를 확인하세요.")
+    df = df.copy()
 
-# Date / Time 컬럼 생성
-df["Date"] = df["DateTime"].dt.strftime("%Y-%m-%d")
-df["Time"] = df["DateTime"].dt.strftime("%H:%M:%S")
+    # 문자열 포맷 불일치 대비 : 실제로 섞여 있는 형식을 감지해 형식별로 변환 (data.common.parse_datetime)
+    with trace_step("parse_datetime", df):
+        df["DateTime"] = parse_datetime(df["DateTime"])
 
-# DateTime이 있던 자리에 Date, Time, DoW 순서로 삽입
-columns = list(df.columns)
+    # 변환에 실패한 행이 있는지 확인
+    if df["DateTime"].isna().any():
+        print("일부 DateTime 값이 변환되지 않았습니다. 원본 데이터를 확인하세요.")
 
-# 중복 방지를 위해 기존 Date, Time, DoW 존재 시 제거
-for col_name in ["Date", "Time", "DoW"]:
-    if col_name in columns:
-        columns.remove(col_name)
+    # Date / Time 컬럼 생성
+    #   - Date : 날짜만 남긴 datetime 그대로 유지 (03 단계에서 다시 파싱하지 않음, CSV 에는 yyyy-mm-dd 로 저장됨)
+    #   - Time : 하루 중 시각(초)별로 1번만 문자열 변환
+    df["Date"] = df["DateTime"].dt.normalize()
+    df["Time"] = format_time(df["DateTime"] - df["Date"])
 
-# DateTime이 있던 위치 인덱스 찾기
-datetime_index = columns.index("DateTime")
+    # DateTime이 있던 자리에 Date, Time, DoW 순서로 삽입
+    columns = list(df.columns)
 
-# DateTime 제거
-columns.remove("DateTime")
+    # 중복 방지를 위해 기존 Date, Time, DoW 존재 시 제거
+    for col_name in ["Date", "Time", "DoW"]:
+        if col_name in columns:
+            columns.remove(col_name)
 
-# Date, Time, DoW를 해당 위치에 삽입
-if "DoW" in df.columns:
-    columns[datetime_index:datetime_index] = ["Date", "Time", "DoW"]
-else:
-    columns[datetime_index:datetime_index] = ["Date", "Time"]
+    # DateTime이 있던 위치 인덱스 찾기
+    datetime_index = columns.index("DateTime")
 
-# 새로운 컬럼 순서로 재배열
-df = df[columns]
+    # DateTime 제거
+    columns.remove("DateTime")
 
-print(f"DateTime > Date, Time 생성 및 재배치 완료 / 총 컬럼 수 : {df.shape[1]}")
+    # Date, Time, DoW를 해당 위치에 삽입
+    if "DoW" in df.columns:
+        columns[datetime_index:datetime_index] = ["Date", "Time", "DoW"]
+    else:
+        columns[datetime_index:datetime_index] = ["Date", "Time"]
+
+    # 새로운 컬럼 순서로 재배열
+    df = df[columns]
+
+    print(f"DateTime > Date, Time 생성 및 재배치 완료 / 총 컬럼 수 : {df.shape[1]}")
+    return df
 
 #####################################################################
 # 하루 중 중복 데이터 제거 (마지막 Time만 유지)
 #####################################################################
 
-# 정렬 후 중복 제거
-df.sort_values(by = ["Product_Number", "Date", "Time"], inplace = True)
+@traced()
+def drop_daily_duplicates(df):
+    # 정렬 1번 후 중복 제거 → 결과가 이미 Product_Number, Date, Time 순이므로 이후 단계에서 다시 정렬하지 않음
+    df = df.sort_values(by = ["Product_Number", "Date", "Time"])
 
-df = df.drop_duplicates(subset = ["Product_Number", "Date"], keep = "last")
+    df = df[~df.duplicated(subset = ["Product_Number", "Date"], keep = "last")]
 
-df.reset_index(drop = True, inplace = True)
+    df = df.reset_index(drop = True)
 
-print(f"하루 중 중복 데이터 제거 / 행 수: {df.shape[0]}")
+    print(f"하루 중 중복 데이터 제거 / 행 수: {df.shape[0]}")
+    return df
 
 #####################################################################
 # 연속 수집 안 된 제품 제거 (95일 미만)
+#   - groupby 1번으로 제품별 수집 일수 / 기간 / 빠진 날짜 수 / 최대 공백 계산
 #####################################################################
 
-# 각 제품별 데이터 개수 확인
-product_list = df["Product_Number"].unique()
-drop_list = []
-
-for product in product_list:
-    count = df["Product_Number"].value_counts()[product]
-    if count != 95:
-        drop_list.append(product)
-
-if drop_list:
-    df = df[~df["Product_Number"].isin(drop_list)]
-    df.reset_index(drop = True, inplace = True)
-    print(f"95일 미만 수집 제품 제거 / 제거된 제품 수 : {len(drop_list)} / 남은 행 수 : {df.shape[0]}")
-else:
-    print("모든 제품이 95일 연속 수집됨")
+def continuity_report(df, required_days = 95, calendar = "observed"):
+    """
+    제품별 연속성 리포트 (index : Product_Number)
+        - days         : 수집 일수
+        - first / last : 첫 / 마지막 수집일
+        - span         : 첫 ~ 마지막 수집일 사이 일수 (calendar 기준)
+        - missing_days : 기간 안에서 빠진 날짜 수
+        - max_gap      : 연속으로 빠진 최대 일수
+        - continuous   : 빠진 날짜가 없고 required_days 이상 수집됨
+    calendar
+        - observed : 전체 데이터에서 한 번이라도 수집된 날짜만 하루로 계산 (기본)
+        - daily    : 달력 날짜 그대로 계산
+    """
+    dates = parse_dates(df["Date"])
+
+    # 날짜 → 순번 (연속된 수집일은 순번이 1씩 증가)
+    if calendar == "daily":
+        pos = ((dates - dates.min()) // pd.Timedelta(days = 1)).to_numpy()
+    elif calendar == "observed":
+        pos = np.unique(dates.to_numpy(), return_inverse = True)[1]
+    else:
+        raise ValueError(f"지원하지 않는 calendar 입니다: {calendar} (가능: observed, daily)")
+
+    frame = pd.DataFrame({"Product_Number": df["Product_Number"].to_numpy(), "pos": pos, "Date": dates.to_numpy()})
+    frame = frame.drop_duplicates(subset = ["Product_Number", "pos"]).sort_values(["Product_Number", "pos"])
+
+    # 같은 제품 안에서 이전 수집일과의 순번 차이 - 1 = 그 사이 빠진 날짜 수
+    frame["gap"] = frame.groupby("Product_Number", sort = False)["pos"].diff().fillna(1) - 1
+
+    report = frame.groupby("Product_Number").agg(
+        days = ("pos", "size"),
+        first = ("Date", "min"),
+        last = ("Date", "max"),
+        first_pos = ("pos", "min"),
+        last_pos = ("pos", "max"),
+        max_gap = ("gap", "max"),
+    )
+    report["span"] = report["last_pos"] - report["first_pos"] + 1
+    report["missing_days"] = report["span"] - report["days"]
+    report["max_gap"] = report["max_gap"].astype(int)
+    report["continuous"] = (report["missing_days"] == 0) & (report["days"] >= required_days)
+    return report.drop(columns = ["first_pos", "last_pos"])
+
+
+@traced()
+def drop_discontinuous_products(df, required_days = 95, mode = "drop", calendar = "observed"):
+    """
+    mode
+        - drop : 불연속 / required_days 미만 제품의 행 전체 제거 (기본)
+        - flag : 행은 유지하고 Continuous 컬럼(True / False)만 추가
+    """
+    report = continuity_report(df, required_days, calendar)
+    drop_list = report.index[~report["continuous"]].tolist()
+
+    if mode == "flag":
+        df = df.assign(Continuous = df["Product_Number"].map(report["continuous"]))
+        print(f"연속 수집 여부 표시 완료 / 불연속 제품 수 : {len(drop_list)}")
+        return df
+    if mode != "drop":
+        raise ValueError(f"지원하지 않는 mode 입니다: {mode} (가능: drop, flag)")
+
+    if drop_list:
+        df = df[~df["Product_Number"].isin(drop_list)]
+        df = df.reset_index(drop = True)
+        print(f"{required_days}일 미만 / 불연속 수집 제품 제거 / 제거된 제품 수 : {len(drop_list)} / 남은 행 수 : {df.shape[0]}")
+    else:
+        print(f"모든 제품이 {required_days}일 연속 수집됨")
+    return df
 
 #####################################################################
 # 데이터 형식 정제 (수주량 / 온도 / 습도 단위 통일)
 #####################################################################
 
-# 수주량 관련 컬럼의 소수점 제거 (정수형 변환)
-order_columns = []
+@traced()
+def normalize_units(df):
+    df = df.copy()
 
-# 수주량 관련 컬럼 추가
-for col in df.columns:
-    if "수주량" in col:
-        order_columns.append(col)
+    # 수주량 관련 컬럼의 소수점 제거 (정수형 변환)
+    order_columns = []
 
-# 값 체크해서 정수형으로 변환
-for col in order_columns:
-    df[col] = df[col].round(0).astype(int)
+    # 수주량 관련 컬럼 추가
+    for col in df.columns:
+        if "수주량" in col:
+            order_columns.append(col)
 
-print(f"수주량 관련 컬럼 {len(order_columns)}개 정수형 변환 완료")
+    # 값 체크해서 정수형으로 변환
+    for col in order_columns:
+        df[col] = df[col].round(0).astype(int)
 
-# Temperature, Humidity 소수점 자리수 통일 (3자리)
-for col in df.columns:
-    if col.lower() in ["temperature", "humidity"]:
-        df[col] = df[col].round(3)
+    print(f"수주량 관련 컬럼 {len(order_columns)}개 정수형 변환 완료")
 
-print("Temperature, Humidity 컬럼 소수점 자리수 3자리로 통일 완료")
+    # Temperature, Humidity 소수점 자리수 통일 (3자리)
+    for col in df.columns:
+        if col.lower() in ["temperature", "humidity"]:
+            df[col] = df[col].round(3)
+
+    print("Temperature, Humidity 컬럼 소수점 자리수 3자리로 통일 완료")
+    return df
 
 #####################################################################
 # 데이터 정렬 (시계열 순서 유지)
 #####################################################################
 
-# Product_Number, Date, Time 기준으로 시간순 정렬만 수행
-# 컬럼 단위 shift는 생략 (이미 T~T+4 형태로 구성되어 있음)
-df.sort_values(by=["Product_Number", "Date", "Time"], inplace=True)
-df.reset_index(drop=True, inplace=True)
+@traced()
+def sort_time_series(df):
+    # Product_Number, Date, Time 순서는 drop_daily_duplicates 에서 정렬한 상태 그대로 유지됨 (다시 정렬하지 않음)
+    # 컬럼 단위 shift는 생략 (이미 T~T+4 형태로 구성되어 있음)
+    df = df.reset_index(drop=True)
+
+    print(f"데이터 시계열 정렬 완료 (Shift 미적용, 컬럼 값 유지) / 행 수 : {df.shape[0]}")
+    return df
 
-print(f"데이터 시계열 정렬 완료 (Shift 미적용, 컬럼 값 유지) / 행 수 : {df.shape[0]}")
 
-# time_series_df 변수로 이름 통일 (아래 코드와 동일 구조 유지)
-time_series_df = df.copy()
+# pipeline.py 에서 호출하는 단계 함수 (DataFrame → DataFrame)
+def process(df, required_days = 95, continuity = "drop", calendar = "observed"):
+    df = split_datetime(df)
+    df = drop_daily_duplicates(df)
+    df = drop_discontinuous_products(df, required_days, continuity, calendar)
+    df = normalize_units(df)
+    df = sort_time_series(df)
+
+    # 이후 단계(03 / 04)가 메모리에서 바로 쓰도록 공통 스키마 적용 (CSV 로 저장한 결과는 동일)
+    with trace_step("apply_schema", df):
+        return apply_schema(df)
 
 #####################################################################
-# 결과 저장
+# 데이터 불러오기 → 정제 → 결과 저장
 #####################################################################
 
-time_series_df.to_csv(output_path, index=False, encoding="utf-8-sig")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "데이터 정제")
+    parser.add_argument("--required-days", type = int, default = STAGE_CONFIG["required_days"], help = "제품별로 필요한 연속 수집 일수")
+    parser.add_argument("--continuity", choices = ["drop", "flag"], default = STAGE_CONFIG["continuity"], help = "불연속 제품 처리 방식")
+    parser.add_argument("--calendar", choices = ["observed", "daily"], default = STAGE_CONFIG["calendar"], help = "연속 여부 판단 기준 날짜")
+    parser.add_argument("--force", action = "store_true", help = "변경이 없어도 다시 실행")
+    parser.add_argument("--trace", action = "store_true", help = "단계별 시간 / 메모리 계측 결과 저장 (data/results/traces)")
+    args = parser.parse_args()
+
+    if args.trace:
+        enable()
+
+    # 입력 / 설정 / 코드가 지난 실행과 같으면 기존 결과 그대로 사용
+    config = {"required_days": args.required_days, "continuity": args.continuity, "calendar": args.calendar}
+    key = stage_key(__file__, [file_path], config)
+    if not args.force and is_fresh(__file__, key):
+        print(f"입력 / 설정 변경 없음 → 기존 결과 사용: {output_path}")
+    else:
+        df = load_frame(file_path, schema = input_schema)
+
+        print(f"데이터 로드 완료 / 행 : {df.shape[0]}, 열 : {df.shape[1]}")
+
+        time_series_df = process(df, **config)
+
+        # 컬럼형 파일(KAMP_STORAGE, 기본 parquet) + 확인용 CSV 저장
+        record(__file__, key, save_frame(time_series_df, output_path, export_csv = True))
 
-print(f"데이터 정제 완료 및 저장: {output_path}")
+        print(f"데이터 정제 완료 및 저장: {output_path}")
 
 """
 결과 분석
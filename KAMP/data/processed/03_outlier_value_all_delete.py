@@ -2,6 +2,10 @@
 실행법
     - 1. 프로젝트의 ROOT 폴더로 이동 | ~/KAMP
     - 2. cmd에 코드 실행           | python -m data.processed.03_outlier_value_all_delete
+        ○ --force                : 입력 / 설정 / 코드가 그대로여도 다시 실행 (기본은 변경 없으면 건너뜀)
+        ○ --rules my_rules.json  : 다른 규칙 파일 사용 (기본 data/processed/03_outlier_rules.json)
+                                   pipeline / incremental 에서는 KAMP_OUTLIER_RULES 환경 변수로 지정
+        ○ --trace                : 단계별 시간 / 메모리 계측 결과 저장 (data/results/traces/*.json)
 """
 
 """
@@ -15,6 +19,14 @@ Q. 이상치 제거 기준
     2. Temperature(온도)     : 비정상적으로 높거나 낮은 값 제거 (예: -10도 ~ 60도)
     3. 수주량(Orders)        : 음수(< 0) 값 삭제
     4. Date(날짜)            : 공식 데이터 수집 기간(2022-01-26 ~ 2022-05-11)을 벗어난 값 삭제
+    - 기준은 코드가 아니라 규칙 파일(03_outlier_rules.json)에 정의
+        ○ 새 공장 / 데이터셋은 규칙 파일만 추가하면 됨 (코드 수정 없음)
+        ○ 규칙 종류 : range (숫자 범위), date_range (날짜 범위), allowed (허용 값 목록)
+        ○ 대상 컬럼 : columns (컬럼명 목록) 또는 column_contains (이름에 포함된 문자열, 예: 수주량)
+
+Q. 처리 방식
+    - 모든 규칙을 원본 데이터 기준으로 한 번에 계산 → 위반 여부를 하나의 mask 로 합쳐 1번만 필터링
+    - 같은 계산 결과로 규칙 / 컬럼 / 제품별 위반 개수 리포트(JSON)를 함께 저장
 
 Q. 제거 이유
     - 센서(Humidity, Temperature)의 물리적으로 불가능한 값은 장비 오류나 측정 문제로 발생
@@ -23,98 +35,228 @@ Q. 제거 이유
     - 이러한 이상치는 분석 모델 학습 시 왜곡을 유발하므로 사전에 제거 필요
 """
 
+import argparse
+import json
 import os
+
+import numpy as np
 import pandas as pd
 
 # data.common에 작성된 코드 가져오기
-from data.common import RESULT_DIR
+from data.common import RESULT_DIR, PROCESSED_DIR, parse_dates
+from data.storage import load_frame, save_frame
+from data.cache import stage_key, is_fresh, record
+from data.instrument import enable, trace_step
 
 # 데이터 정제 완료 데이터셋 불러오기
 file_path  = os.path.join(RESULT_DIR, "02_전처리_데이터_정제.csv")
 
 # 저장될 파일명 및 위치
-output_path = os.path.join(RESULT_DIR, "03_전처리_이상치_제거.csv")
-
-#####################################################################
-# 원본 데이터 불러오고 세팅
-#####################################################################
+output_path  = os.path.join(RESULT_DIR, "03_전처리_이상치_제거.csv")
+profile_path = os.path.join(RESULT_DIR, "03_전처리_이상치_프로파일.json")
 
-df = pd.read_csv(file_path, encoding = "utf-8-sig")
+# 이상치 규칙 파일 (KAMP_OUTLIER_RULES 로 다른 파일 지정 가능, 예: data.synthetic 이 만든 규칙)
+RULES_PATH = os.environ.get("KAMP_OUTLIER_RULES", os.path.join(PROCESSED_DIR, "03_outlier_rules.json"))
 
-print(f"원본 데이터 로드 완료 / 행 개수 : {df.shape[0]}, 열 개수 : {df.shape[1]}")
+RULE_TYPES = ["range", "date_range", "allowed"]
 
 #####################################################################
-# Humidity (습도) 이상치 제거
-# 기준 : 0 이하 또는 100 이상 삭제
+# 규칙 파일 불러오기
 #####################################################################
 
-before_rows = len(df)
-
-df = df[(df["Humidity"] > 0) & (df["Humidity"] < 100)]
-
-print(f"습도 이상치 제거 완료 : {before_rows - len(df)}개 삭제")
+def load_rules(path = RULES_PATH):
+    """규칙 파일(JSON) 읽기 + 형식 확인"""
+    with open(path, encoding = "utf-8") as f:
+        config = json.load(f)
+
+    for rule in config.get("rules", []):
+        name = rule.get("name", "?")
+        if rule.get("type") not in RULE_TYPES:
+            raise ValueError(f"지원하지 않는 규칙 종류입니다: {name} / {rule.get('type')} (가능: {', '.join(RULE_TYPES)})")
+        if "columns" not in rule and "column_contains" not in rule:
+            raise ValueError(f"규칙에 대상 컬럼(columns 또는 column_contains)이 없습니다: {name}")
+        if rule["type"] == "allowed" and "values" not in rule:
+            raise ValueError(f"allowed 규칙에 values 가 없습니다: {name}")
+    return config
+
+
+# 캐시 키에 들어가는 설정값 (규칙 파일 내용, 바뀌면 이 단계부터 다시 실행)
+STAGE_CONFIG = load_rules()
+
+
+def with_date_window(rules, start = None, end = None):
+    """date_range 규칙의 기간만 바꾼 규칙 목록 (증분 처리의 --date-start / --date-end)"""
+    if start is None and end is None:
+        return rules
+    changed = []
+    for rule in rules:
+        if rule["type"] == "date_range":
+            rule = dict(rule, min = start or rule.get("min"), max = end or rule.get("max"))
+        changed.append(rule)
+    return changed
 
 #####################################################################
-# Temperature (온도) 이상치 제거
-# 기준 : 비정상적으로 높거나 낮은 값 제거 > -10도 이하 또는 60도 이상 값 제거
+# 규칙 계산 (행을 지우지 않고 위반 여부만 계산)
 #####################################################################
 
-before_rows = len(df)
-
-df = df[(df["Temperature"] >= -10) & (df["Temperature"] <= 60)]
-
-print(f"온도 이상치 제거 완료 : {before_rows - len(df)}개 삭제")
+def rule_columns(df, rule):
+    if "column_contains" in rule:
+        return [col for col in df.columns if rule["column_contains"] in col]
+
+    columns = [col for col in rule["columns"] if col in df.columns]
+    missing = [col for col in rule["columns"] if col not in df.columns]
+    if missing:
+        print(f"[WARN] {rule['name']} 규칙의 컬럼이 존재하지 않아 건너뜀 : {missing} (데이터 정제 단계를 확인하세요.)")
+    return columns
+
+
+def range_violation(values, rule):
+    """min / max 범위 밖이면 True (기본은 경계 포함, *_inclusive = false 면 경계도 위반)"""
+    inside = np.ones(len(values), dtype = bool)
+    if rule.get("min") is not None:
+        inside &= values >= rule["min"] if rule.get("min_inclusive", True) else values > rule["min"]
+    if rule.get("max") is not None:
+        inside &= values <= rule["max"] if rule.get("max_inclusive", True) else values < rule["max"]
+    return ~inside
+
+
+def rule_violations(df, rule):
+    """
+    {컬럼: 위반 여부 bool 배열}
+    - 결측값 : 기본은 위반 (범위 비교를 통과하지 못함), missing = "keep" 이면 위반 아님
+    - date_range 컬럼은 datetime 으로 변환한 값을 함께 반환 (결과 데이터에도 변환된 값 사용)
+    """
+    violations, parsed = {}, {}
+    for col in rule_columns(df, rule):
+        if rule["type"] == "date_range":
+            dates = parse_dates(df[col])
+            parsed[col] = dates
+            bounds = dict(rule, min = pd.Timestamp(rule["min"]).to_datetime64() if rule.get("min") else None,
+                                max = pd.Timestamp(rule["max"]).to_datetime64() if rule.get("max") else None)
+            values = dates.to_numpy(dtype = "datetime64[ns]")
+            missing = np.isnat(values)
+            violated = range_violation(values, bounds)
+        elif rule["type"] == "range":
+            values = pd.to_numeric(df[col], errors = "coerce").to_numpy(dtype = "float64", na_value = np.nan)
+            missing = np.isnan(values)
+            violated = range_violation(values, rule)
+        else:
+            missing = df[col].isna().to_numpy()
+            violated = ~df[col].isin(rule["values"]).to_numpy()
+
+        if rule.get("missing", "drop") == "keep":
+            violated &= ~missing
+        violations[col] = violated
+    return violations, parsed
+
+
+def count_by_product(violated, codes, products):
+    """위반 행 수를 제품별로 집계 (위반이 있는 제품만)"""
+    counts = np.bincount(codes[violated & (codes >= 0)], minlength = len(products))
+    return {str(products[i]): int(counts[i]) for i in np.flatnonzero(counts)}
+
+
+def evaluate_rules(df, rules):
+    """
+    모든 규칙을 한 번에 계산
+    - 반환 : (유지할 행 mask, date_range 로 변환된 컬럼, 위반 리포트)
+    - 리포트 : 규칙별 위반 행 수 / 컬럼별 위반 수 / 제품별 위반 수
+    """
+    codes, products = pd.factorize(df["Product_Number"]) if "Product_Number" in df.columns else (np.full(len(df), -1), [])
+    remove = np.zeros(len(df), dtype = bool)
+    parsed, profile = {}, {}
+
+    for rule in rules:
+        violations, rule_parsed = rule_violations(df, rule)
+        parsed.update(rule_parsed)
+
+        rows = np.zeros(len(df), dtype = bool)
+        columns = {}
+        for col, violated in violations.items():
+            rows |= violated
+            columns[col] = {"violations": int(violated.sum()), "products": count_by_product(violated, codes, products)}
+        remove |= rows
+
+        profile[rule["name"]] = {
+            "description" : rule.get("description", ""),
+            "type"        : rule["type"],
+            "violations"  : int(rows.sum()),
+            "columns"     : columns,
+            "products"    : count_by_product(rows, codes, products),
+        }
+        print(f"{rule.get('description', rule['name'])} : {int(rows.sum())}개 행 위반")
+
+    return ~remove, parsed, profile
+
+
+def save_profile(profile, path):
+    with open(path, "w", encoding = "utf-8") as f:
+        json.dump(profile, f, ensure_ascii = False, indent = 4)
+
+
+# pipeline.py 에서 호출하는 단계 함수 (DataFrame → DataFrame)
+def process(df, date_start = None, date_end = None, rules = None, profile_path = profile_path):
+    """
+    - date_start / date_end : 규칙 파일의 수집 기간 대신 사용할 기간 (증분 처리)
+    - rules                 : 규칙 목록 (생략 시 규칙 파일)
+    - profile_path          : 위반 리포트 저장 경로 (None 이면 저장 안 함)
+    """
+    rules = with_date_window(STAGE_CONFIG["rules"] if rules is None else rules, date_start, date_end)
+    with trace_step("evaluate_rules", df):
+        keep, parsed, profile = evaluate_rules(df, rules)
+
+    # 02 단계 결과는 이미 datetime (문자열로 들어온 경우에만 변환된 값으로 교체)
+    changed = {col: dates for col, dates in parsed.items() if not pd.api.types.is_datetime64_any_dtype(df[col].dtype)}
+    if changed:
+        df = df.assign(**changed)
+
+    with trace_step("filter_rows", df) as step:
+        df = df[keep].reset_index(drop = True)
+        step.rows_out = len(df)
+
+    if profile_path:
+        save_profile({"rows": int(len(keep)), "kept_rows": int(keep.sum()), "removed_rows": int((~keep).sum()),
+                      "rules": profile}, profile_path)
+    print(f"이상치 제거 완료 : {int((~keep).sum())}개 삭제 / 최종 데이터 크기 : {df.shape}")
+    return df
 
 #####################################################################
-# 수주량 관련 컬럼 음수값 제거
-# 기준 : 수주량 값이 0 미만(음수)인 행 제거
+# 원본 데이터 불러오기 → 이상치 제거 → 결과 저장
 #####################################################################
 
-# 수주량 관련 컬럼 자동 탐색
-order_cols = []
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "이상치 확인 및 제거")
+    parser.add_argument("--rules", default = RULES_PATH, help = "이상치 규칙 파일 (JSON)")
+    parser.add_argument("--force", action = "store_true", help = "변경이 없어도 다시 실행")
+    parser.add_argument("--trace", action = "store_true", help = "단계별 시간 / 메모리 계측 결과 저장 (data/results/traces)")
+    args = parser.parse_args()
 
-for col in df.columns:
-    if "수주량" in col:
-        order_cols.append(col)
+    if args.trace:
+        enable()
 
-before_rows = len(df)
+    config = load_rules(args.rules)
 
-# 모든 수주량 컬럼 중 하나라도 음수가 있으면 해당 행 제거
-df = df[~(df[order_cols] < 0).any(axis=1)]
+    # 입력 / 규칙 / 코드가 지난 실행과 같으면 기존 결과 그대로 사용
+    key = stage_key(__file__, [file_path], config)
+    if not args.force and is_fresh(__file__, key):
+        print(f"입력 / 설정 변경 없음 → 기존 결과 사용: {output_path}")
+    else:
+        df = load_frame(file_path)
 
-print(f"수주량 음수값 이상치 제거 완료 : {before_rows - len(df)}개 삭제")
-
-#####################################################################
-# Date 범위 이상치 제거
-# 기준 : 2022-01-26 ~ 2022-05-11 사이의 데이터만 유지
-#####################################################################
-
-if "Date" in df.columns:
-    df["Date"] = pd.to_datetime(df["Date"], errors = "coerce")
-
-    start_date = pd.Timestamp("2022-01-26")
-    end_date   = pd.Timestamp("2022-05-11")
-
-    before_rows = len(df)
-    df = df[(df["Date"] >= start_date) & (df["Date"] <= end_date)]
-    print(f"Date 범위 이상치 제거 완료 : {before_rows - len(df)}개 삭제")
-else:
-    print("Date 컬럼이 존재하지 않습니다. 데이터 정제 단계를 확인하세요.")
-
-#####################################################################
-# 인덱스 초기화 및 결과 저장
-#####################################################################
+        print(f"원본 데이터 로드 완료 / 행 개수 : {df.shape[0]}, 열 개수 : {df.shape[1]}")
 
-df.reset_index(drop = True, inplace = True)
-df.to_csv(output_path, index = False, encoding = "utf-8-sig")
+        df = process(df, rules = config["rules"])
+        # 컬럼형 파일(KAMP_STORAGE, 기본 parquet) + 확인용 CSV 저장
+        record(__file__, key, save_frame(df, output_path, export_csv = True) + [profile_path])
 
-print(f"이상치 제거 완료 / 최종 데이터 크기 : {df.shape}")
-print(f"결과 파일 저장 완료 : {output_path}")
+        print(f"결과 파일 저장 완료 : {output_path}")
+        print(f"규칙 위반 리포트 저장 완료 : {profile_path}")
 
 """
 결과 분석
     - 센서 데이터(Humidity, Temperature)의 물리적 비정상 범위 값 제거
     - 수주량 관련 컬럼의 음수값 제거로 논리적 품질 이상치 보정
     - Date 컬럼의 공식 수집 기간 외 데이터 제거
+    - 규칙별 / 컬럼별 / 제품별 위반 개수는 03_전처리_이상치_프로파일.json 에서 확인
     - 남은 데이터는 센서 기반 통계 분석 및 예측 모델 학습에 적합한 상태로 정제됨
 """
\ No newline at end of file
@@ -2,6 +2,8 @@
 실행법
     - 1. 프로젝트의 ROOT 폴더로 이동 | ~/KAMP
     - 2. cmd에 코드 실행           | python -m data.processed.04_unnecessary_column_delete
+        ○ --force : 입력 / 설정 / 코드가 그대로여도 다시 실행 (기본은 변경 없으면 건너뜀)
+        ○ --trace : 단계별 시간 / 메모리 계측 결과 저장 (data/results/traces/*.json)
 """
 
 """
@@ -25,11 +27,15 @@ Q. 유지 대상
     - Date
 """
 
+import argparse
 import os
 import pandas as pd
 
-# 공통 경로 설정 불러오기
+# 공통 경로 설정 / 저장소 불러오기
 from data.common import RESULT_DIR
+from data.storage import load_frame, save_frame
+from data.cache import stage_key, is_fresh, record
+from data.instrument import enable, traced
 
 #####################################################################
 # 파일 경로 세팅
@@ -38,14 +44,6 @@ from data.common import RESULT_DIR
 file_path = os.path.join(RESULT_DIR, "03_전처리_이상치_제거.csv")
 output_path = os.path.join(RESULT_DIR, "04_전처리_불필요컬럼_제거.csv")
 
-#####################################################################
-# 데이터 로드
-#####################################################################
-
-df = pd.read_csv(file_path, encoding="utf-8-sig")
-
-print(f"데이터 로드 완료 / 행 개수 : {df.shape[0]}, 열 개수 : {df.shape[1]}")
-
 #####################################################################
 # 제거 대상 컬럼 목록 정의
 #####################################################################
@@ -56,36 +54,65 @@ drop_columns = [
     "T+3일 예상 수주량", "T+4일 예상 수주량"
 ]
 
+# 캐시 키에 들어가는 설정값 (바뀌면 이 단계부터 다시 실행)
+STAGE_CONFIG = {"drop_columns": drop_columns}
+
 #####################################################################
 # 실제 제거 수행
 #####################################################################
 
-# 제거 대상 컬럼 목록 중 실제 데이터에 존재하는 컬럼만 추출
-existing_drop_cols = []
-for col in drop_columns:
-    if col in df.columns:
-        existing_drop_cols.append(col)
+@traced()
+def drop_unnecessary_columns(df):
+    # 제거 대상 컬럼 목록 중 실제 데이터에 존재하는 컬럼만 추출
+    existing_drop_cols = []
+    for col in drop_columns:
+        if col in df.columns:
+            existing_drop_cols.append(col)
 
-# 존재하는 컬럼만 제거
-if existing_drop_cols:
-    df.drop(columns=existing_drop_cols, inplace=True)
-    print(f"제거된 불필요 컬럼 : {existing_drop_cols}")
-else:
-    print("제거할 대상 컬럼이 없습니다. (이미 정제된 상태일 수 있음)")
+    # 존재하는 컬럼만 제거
+    if existing_drop_cols:
+        df = df.drop(columns=existing_drop_cols)
+        print(f"제거된 불필요 컬럼 : {existing_drop_cols}")
+    else:
+        print("제거할 대상 컬럼이 없습니다. (이미 정제된 상태일 수 있음)")
+
+    # 최종 남은 컬럼 확인
+    print(f"컬럼 제거 완료 후 남은 컬럼 수 : {df.shape[1]}")
+    print(f"남은 컬럼 목록 :\n{df.columns.tolist()}")
+    return df
 
-#####################################################################
-# 최종 남은 컬럼 확인
-#####################################################################
 
-print(f"컬럼 제거 완료 후 남은 컬럼 수 : {df.shape[1]}")
-print(f"남은 컬럼 목록 :\n{df.columns.tolist()}")
+# pipeline.py 에서 호출하는 단계 함수 (DataFrame → DataFrame)
+def process(df):
+    return drop_unnecessary_columns(df)
 
 #####################################################################
-# 결과 저장
+# 데이터 로드 → 컬럼 제거 → 결과 저장
 #####################################################################
 
-df.to_csv(output_path, index=False, encoding="utf-8-sig")
-print(f"불필요 컬럼 제거 완료 / 결과 저장 경로: {output_path}")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "불필요 컬럼 제거")
+    parser.add_argument("--force", action = "store_true", help = "변경이 없어도 다시 실행")
+    parser.add_argument("--trace", action = "store_true", help = "단계별 시간 / 메모리 계측 결과 저장 (data/results/traces)")
+    args = parser.parse_args()
+
+    if args.trace:
+        enable()
+
+    # 입력 / 설정 / 코드가 지난 실행과 같으면 기존 결과 그대로 사용
+    key = stage_key(__file__, [file_path], STAGE_CONFIG)
+    if not args.force and is_fresh(__file__, key):
+        print(f"입력 / 설정 변경 없음 → 기존 결과 사용: {output_path}")
+    else:
+        df = load_frame(file_path)
+
+        print(f"데이터 로드 완료 / 행 개수 : {df.shape[0]}, 열 개수 : {df.shape[1]}")
+
+        df = process(df)
+
+        # 컬럼형 파일(KAMP_STORAGE, 기본 parquet) + 확인용 CSV 저장
+        record(__file__, key, save_frame(df, output_path, export_csv=True))
+        print(f"불필요 컬럼 제거 완료 / 결과 저장 경로: {output_path}")
 
 """
 결과 분석
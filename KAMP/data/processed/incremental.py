@@ -0,0 +1,402 @@
+"""
+실행법
+    - 1. 프로젝트의 ROOT 폴더로 이동 | ~/KAMP
+    - 2. 최초 1번 (전체 처리 + 상태 저장) | python -m data.processed.incremental --init
+    - 3. 원본에 행이 추가될 때마다       | python -m data.processed.incremental
+        ○ --date-end 2022-06-30 : 03 단계 수집 기간 끝 날짜 (--init 때 상태에 저장되어 이후 실행에 그대로 사용)
+        ○ --trace               : 단계별 시간 / 메모리 계측 결과 저장 (data/results/traces/*.json)
+"""
+
+"""
+증분 전처리 (원본 CSV 에 새로 추가된 행만 처리)
+    - 원본 CSV 는 뒤에 행이 추가(append)되는 형태라고 가정
+    - 상태 파일(incremental_state.json)에 저장하는 값
+        ○ 마지막으로 읽은 원본 파일 위치(byte offset) → 다음 실행은 그 뒤만 읽음
+        ○ 제품별 watermark (마지막으로 처리한 DateTime) → 이미 처리한 시각 이전 행은 무시
+        ○ 제품별 연속 수집 상태 (kept / pending / excluded), 수집 일수, 마지막 수집일
+        ○ 수집일 달력 (02 단계 연속성 판단 기준)
+    - 새 행에 01 ~ 04 규칙을 그대로 적용
+        ○ 01 : 결측 표현 정리, --init 때 정한 제거 컬럼, 행 단위 결측 제거
+        ○ 02 : DateTime 분리, 하루 중 마지막 Time 유지, 연속성 갱신, 단위 정리
+        ○ 03 / 04 : 이상치 제거, 불필요 컬럼 제거
+    - 01 ~ 04 처리는 새 행만 → 처리 시간이 새 데이터 양에 비례
+    - 결과(04_전처리_불필요컬럼_제거)는 data.storage 로 저장 (전체 실행과 같은 형식 / 스키마, CSV 도 함께)
+        ○ 보통은 새 행만 append_frame 으로 추가 (조각 파일 + CSV 이어 쓰기, 기존 결과는 읽지 않음)
+        ○ 지울 행이 기존 결과에 있을 때만 (결과에 있던 제품이 제외되거나, 결과에 있는 날짜에 더 늦은 Time 이 들어온 경우)
+          기존 결과를 읽어 지운 뒤 save_frame 으로 다시 씀
+        ○ 보류 행(incremental_pending)도 같은 방식으로 저장
+    - 연속 수집 규칙 (전체 실행과 동일)
+        ○ kept     : 빠진 수집일 없이 required_days 이상 → 결과에 포함
+        ○ pending  : 빠진 수집일 없지만 아직 required_days 미만 → incremental_pending.csv 에 보관, 채워지면 결과로 이동
+        ○ excluded : 중간에 빠진 수집일이 생김 → 결과에서 제거, 이후 행도 무시
+    - 결과 파일의 행 순서는 추가된 순서 (제품 / 날짜 기준으로 정렬하면 전체 실행 결과와 동일)
+    - --output 은 기존 CSV 경로 형식 (확장자는 저장 형식에 맞게 바뀜, 예 : .parquet + .csv)
+"""
+
+import argparse
+import importlib
+import io
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# data.common에 작성된 코드 가져오기
+from data.common import RESULT_DIR, NA_VALUES, NA_STRINGS, DATE_FORMAT, parse_datetime, apply_schema
+from data.instrument import enable
+from data.storage import load_frame, save_frame, append_frame
+
+stage01 = importlib.import_module("data.processed.01_missing_value_all_delete")
+stage02 = importlib.import_module("data.processed.02_data_cleansing")
+stage03 = importlib.import_module("data.processed.03_outlier_value_all_delete")
+stage04 = importlib.import_module("data.processed.04_unnecessary_column_delete")
+
+STATE_PATH   = os.path.join(RESULT_DIR, "incremental_state.json")
+PENDING_PATH = os.path.join(RESULT_DIR, "incremental_pending.csv")
+
+KEPT, PENDING, EXCLUDED = "kept", "pending", "excluded"
+
+#####################################################################
+# 상태 파일
+#####################################################################
+
+def load_state(path = STATE_PATH):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"상태 파일이 없습니다. 먼저 --init 으로 전체 처리를 실행하세요: {path}")
+    with open(path, encoding = "utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state, path = STATE_PATH):
+    # 임시 파일에 쓰고 교체 → 중간에 멈춰도 상태 파일이 깨지지 않음
+    state["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding = "utf-8") as f:
+        json.dump(state, f, ensure_ascii = False, indent = 1)
+    os.replace(tmp_path, path)
+
+#####################################################################
+# 결과 파일 (data.storage 로 읽고 저장 / 일부 제품·날짜 제거)
+#####################################################################
+
+def read_rows(path):
+    """결과 / 보류 파일 읽기 (없으면 None), 상태 파일 키와 비교하도록 Date 는 yyyy-mm-dd 문자열로"""
+    try:
+        df = load_frame(path)
+    except FileNotFoundError:
+        return None
+    df["Date"] = df["Date"].dt.strftime(DATE_FORMAT)
+    return df
+
+
+def write_rows(df, path, export_csv = False):
+    """공통 스키마 적용 후 save_frame 으로 저장 (Date 문자열 → datetime, Product_Number → category)"""
+    return save_frame(apply_schema(df.reset_index(drop = True)), path, export_csv = export_csv)
+
+
+def update_rows(path, rows, products = (), keys = (), move = (), export_csv = False):
+    """
+    결과 / 보류 파일에 새 행 반영
+    - 지울 행이 없으면 새 행만 append_frame 으로 추가 (기존 파일은 읽지 않음)
+    - products / keys 행을 지우거나 move 제품 행을 꺼낼 때만 기존 파일을 읽어 다시 씀
+    - 반환 : move 제품의 기존 행 (없으면 None)
+    """
+    if not products and not keys and not move:
+        if len(rows):
+            append_frame(apply_schema(rows.reset_index(drop = True)), path, export_csv = export_csv)
+        return None
+
+    df, _ = remove_rows(read_rows(path), products, keys)
+    df, moved = remove_rows(df, move)
+    write_rows(append_rows(df, rows), path, export_csv)
+    return moved
+
+
+def remove_rows(df, products = (), keys = ()):
+    """
+    제외된 제품 / 다시 들어온 (Product_Number, Date) 행 분리
+    - 반환 : (남은 행, 제거한 행) / 제거한 행은 pending → 결과 이동 시 사용
+    """
+    if df is None or (not products and not keys):
+        return df, None
+    mask = df["Product_Number"].isin(products)
+    if keys:
+        key_index = pd.MultiIndex.from_tuples(list(keys))
+        mask |= pd.MultiIndex.from_arrays([df["Product_Number"], df["Date"]]).isin(key_index)
+    return df[~mask], df[mask]
+
+
+def append_rows(df, rows):
+    """기존 행 뒤에 새 행 이어 붙임 (컬럼 순서는 기존 파일 기준)"""
+    if df is None:
+        return rows
+    if not len(rows):
+        return df
+    # category(기존 파일) + 문자열(새 행) → object 로 합친 뒤 write_rows 에서 다시 category
+    df = df.astype({"Product_Number": object})
+    return pd.concat([df, rows[df.columns]], ignore_index = True)
+
+#####################################################################
+# 새 행 읽기 (원본 파일의 offset 이후만)
+#####################################################################
+
+def read_new_rows(raw_path, state):
+    """
+    마지막 offset 이후 바이트만 읽어 DataFrame 으로 변환
+    - 아직 쓰는 중인 마지막 줄(줄바꿈 없음)은 다음 실행으로 미룸
+    - 반환 : (새 행 DataFrame, 새 offset)
+    """
+    offset = state["raw_offset"]
+    size = os.path.getsize(raw_path)
+    if size < offset:
+        raise ValueError("원본 파일이 이전보다 작아졌습니다. 파일이 교체되었다면 --init 으로 다시 처리하세요.")
+
+    with open(raw_path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+
+    end = data.rfind(b"\n") + 1
+    data = data[:end]
+    if not data.strip():
+        return pd.DataFrame(columns = state["columns"]), offset
+
+    df = pd.read_csv(io.BytesIO(data), header = None, names = state["columns"], encoding = "utf-8", na_values = NA_VALUES)
+    return df.replace(NA_STRINGS, pd.NA), offset + end
+
+
+def apply_watermark(df, watermark):
+    """
+    제품별 watermark 이후 DateTime 만 남기고 watermark 갱신
+    - 결측 제거 전 원본 행 기준 (이미 읽은 시각은 다시 처리하지 않음)
+    """
+    times = parse_datetime(df["DateTime"])
+    previous = pd.to_datetime(df["Product_Number"].map(watermark))
+    keep = previous.isna() | (times > previous)
+
+    latest = times[keep].groupby(df.loc[keep, "Product_Number"]).max()
+    for product, value in latest.items():
+        if pd.notna(value):
+            watermark[product] = value.isoformat()
+    return df[keep]
+
+#####################################################################
+# 01 ~ 04 규칙
+#####################################################################
+
+def split_rows(df):
+    """
+    02 앞부분 (DateTime 분리, 하루 중 마지막 Time 유지)
+    - 상태 파일 / 결과 CSV 의 (Product_Number, Date) 키와 비교하므로 Date 는 yyyy-mm-dd 문자열로 사용
+    """
+    df = stage02.drop_daily_duplicates(stage02.split_datetime(df))
+    df["Date"] = df["Date"].dt.strftime(DATE_FORMAT)
+    return df
+
+
+def prepare_rows(df, drop_cols):
+    """01 (결측) + 02 앞부분 (DateTime 분리, 하루 중 마지막 Time 유지)"""
+    existing = [col for col in drop_cols if col in df.columns]
+    df = df.drop(columns = existing).dropna().reset_index(drop = True)
+    if df.empty:
+        return df
+    return split_rows(df)
+
+
+def finish_rows(df, state):
+    """02 뒷부분 (단위 정리) + 03 (이상치) + 04 (불필요 컬럼)"""
+    if df.empty:
+        return df
+    df = stage02.normalize_units(df)
+    df = stage03.process(df, state["date_start"], state["date_end"], profile_path = None)
+    df = stage04.process(df)
+    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+    return df
+
+
+def update_continuity(rows, state):
+    """
+    새 행으로 제품별 연속 수집 상태 갱신
+    - 반환 : (제품별 새 상태, 다시 들어온 (Product_Number, Date) 키 목록)
+    """
+    products = state["products"]
+    required_days = state["required_days"]
+
+    calendar = np.array(sorted(set(state["calendar"]) | set(rows["Date"])))
+    state["calendar"] = calendar.tolist()
+
+    frame = pd.DataFrame({
+        "Product_Number": rows["Product_Number"].to_numpy(),
+        "Date": rows["Date"].to_numpy(),
+        "pos": np.searchsorted(calendar, rows["Date"].to_numpy(dtype = str)),
+    })
+    last_dates = frame["Product_Number"].map({p: info["last_date"] for p, info in products.items()})
+
+    # 마지막 수집일과 같은 날짜 → 하루 중 더 늦은 Time (기존 행 교체, 일수는 그대로)
+    replaced = frame[frame["Date"] == last_dates]
+    replace_keys = list(zip(replaced["Product_Number"], replaced["Date"]))
+    new_days = frame[frame["Date"] != last_dates]
+
+    updates = {}
+    for product, group in new_days.groupby("Product_Number"):
+        info = products.get(product)
+        first, last, count = group["pos"].min(), group["pos"].max(), len(group)
+        contiguous = last - first + 1 == count
+
+        if info is None:
+            days = count
+        elif info["status"] == EXCLUDED:
+            continue
+        else:
+            previous_pos = int(np.searchsorted(calendar, info["last_date"]))
+            contiguous = contiguous and first == previous_pos + 1
+            days = info["days"] + count
+
+        if not contiguous:
+            status = EXCLUDED
+        else:
+            status = KEPT if days >= required_days else PENDING
+        updates[product] = {"status": status, "days": int(days), "last_date": group["Date"].max()}
+
+    return updates, replace_keys
+
+#####################################################################
+# 최초 전체 처리 (--init)
+#####################################################################
+
+def init_state(raw_path, output_path, required_days = 95, date_start = "2022-01-26", date_end = "2022-05-11"):
+    raw = stage01.load_raw(raw_path)
+    columns = raw.columns.tolist()
+
+    df = stage01.process(raw)
+    drop_cols = [col for col in columns if col not in df.columns]
+
+    times = parse_datetime(raw["DateTime"])
+    watermark = {p: t.isoformat() for p, t in times.groupby(raw["Product_Number"]).max().items() if pd.notna(t)}
+    del raw
+
+    df = split_rows(df)
+    report = stage02.continuity_report(df, required_days)
+    status = np.where(report["continuous"], KEPT, np.where(report["missing_days"] == 0, PENDING, EXCLUDED))
+    status = pd.Series(status, index = report.index)
+
+    state = {
+        "raw_path": os.path.abspath(raw_path),
+        "raw_offset": os.path.getsize(raw_path),
+        "columns": columns,
+        "drop_cols": drop_cols,
+        "required_days": required_days,
+        "date_start": date_start,
+        "date_end": date_end,
+        "calendar": sorted(df["Date"].unique().tolist()),
+        "watermark": watermark,
+        "products": {
+            product: {"status": status[product], "days": int(row["days"]), "last_date": row["last"].strftime("%Y-%m-%d")}
+            for product, row in report.iterrows()
+        },
+    }
+
+    rows = finish_rows(df[df["Product_Number"].map(status) != EXCLUDED], state)
+    is_kept = rows["Product_Number"].map(status) == KEPT
+    write_rows(rows[is_kept], output_path, export_csv = True)
+    write_rows(rows[~is_kept], PENDING_PATH)
+
+    print(f"전체 처리 완료 / 결과 행 : {int(is_kept.sum())}, 보류(pending) 행 : {int((~is_kept).sum())}")
+    return state
+
+#####################################################################
+# 증분 처리
+#####################################################################
+
+def run_incremental(state, raw_path, output_path):
+    """새로 추가된 행만 처리해 결과에 반영, 처리 요약(dict) 반환"""
+    start = time.perf_counter()
+    new_rows, offset = read_new_rows(raw_path, state)
+    summary = {"raw_rows": len(new_rows), "appended": 0, "pending": 0, "excluded": [], "promoted": []}
+    if new_rows.empty:
+        state["raw_offset"] = offset
+        summary["seconds"] = round(time.perf_counter() - start, 3)
+        return summary
+
+    rows = apply_watermark(new_rows, state["watermark"])
+    rows = prepare_rows(rows, state["drop_cols"])
+    state["raw_offset"] = offset
+    if rows.empty:
+        summary["seconds"] = round(time.perf_counter() - start, 3)
+        return summary
+
+    updates, replace_keys = update_continuity(rows, state)
+    products = state["products"]
+
+    # 상태 변화별 제품 분류 (이전 상태 → 기존 행이 결과 / 보류 중 어느 파일에 있는지)
+    previous = {p: products[p]["status"] for p in set(updates) | {p for p, _ in replace_keys} if p in products}
+    excluded = [p for p, u in updates.items() if u["status"] == EXCLUDED and p in products]
+    promoted = [p for p, u in updates.items() if u["status"] == KEPT and products.get(p, {}).get("status") != KEPT]
+    for product, update in updates.items():
+        products[product] = update
+
+    status = {p: info["status"] for p, info in products.items()}
+    rows = rows[rows["Product_Number"].map(status).isin([KEPT, PENDING])]
+    rows = finish_rows(rows, state)
+
+    # 제외 제품 + 교체될 (제품, 날짜) 행은 이전 상태가 kept 면 결과, pending 이면 보류 파일에 있음
+    def in_file(state_value):
+        return ([p for p in excluded if previous.get(p) == state_value],
+                [key for key in replace_keys if previous.get(key[0]) == state_value])
+
+    # 보류 파일 : pending → kept 로 바뀐 제품은 보관해 둔 이전 행을 꺼내 결과로 이동
+    pending_rows = rows[rows["Product_Number"].map(status) == PENDING]
+    moved = update_rows(PENDING_PATH, pending_rows, *in_file(PENDING), move = promoted)
+
+    kept_rows = rows[rows["Product_Number"].map(status) == KEPT]
+    if moved is not None and len(moved):
+        kept_rows = pd.concat([moved.astype({"Product_Number": object}), kept_rows], ignore_index = True)
+    kept_rows = kept_rows.sort_values(["Product_Number", "Date"], kind = "stable")
+    update_rows(output_path, kept_rows, *in_file(KEPT), export_csv = True)
+
+    summary.update({
+        "appended": len(kept_rows),
+        "pending": len(pending_rows),
+        "excluded": excluded,
+        "promoted": promoted,
+        "seconds": round(time.perf_counter() - start, 3),
+    })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "증분 전처리 (원본 CSV 에 추가된 행만 처리)")
+    parser.add_argument("--init", action = "store_true", help = "전체 처리 후 상태 파일 새로 생성")
+    parser.add_argument("--raw", default = stage01.file_path, help = "원본 CSV 경로")
+    parser.add_argument("--output", default = stage04.output_path, help = "결과 경로 (기존 CSV 경로, 확장자는 저장 형식에 맞게 바뀜)")
+    parser.add_argument("--required-days", type = int, default = 95, help = "제품별로 필요한 연속 수집 일수 (--init)")
+    parser.add_argument("--date-start", default = "2022-01-26", help = "03 단계 수집 기간 시작 (--init)")
+    parser.add_argument("--date-end", default = "2022-05-11", help = "03 단계 수집 기간 끝 (--init)")
+    parser.add_argument("--trace", action = "store_true", help = "단계별 시간 / 메모리 계측 결과 저장 (data/results/traces)")
+    args = parser.parse_args()
+
+    if args.trace:
+        enable()
+
+    if args.init:
+        state = init_state(args.raw, args.output, args.required_days, args.date_start, args.date_end)
+        save_state(state)
+        print(f"상태 파일 저장 완료 : {STATE_PATH}")
+        return
+
+    state = load_state()
+    summary = run_incremental(state, args.raw, args.output)
+    save_state(state)
+
+    print("\n==== 증분 처리 결과 ====")
+    print(f"새로 읽은 원본 행 : {summary['raw_rows']}")
+    print(f"결과에 추가한 행  : {summary['appended']}")
+    print(f"보류(pending) 행  : {summary['pending']}")
+    print(f"결과로 이동한 제품 : {summary['promoted']}")
+    print(f"제외된 제품       : {summary['excluded']}")
+    print(f"실행 시간         : {summary['seconds']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
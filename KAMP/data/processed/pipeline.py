@@ -0,0 +1,197 @@
+"""
+실행법
+    - 1. 프로젝트의 ROOT 폴더로 이동 | ~/KAMP
+    - 2. cmd에 코드 실행           | python -m data.processed.pipeline
+        ○ --save-intermediate : 01 ~ 03 단계 결과 CSV 도 저장 (기존 파일명 그대로)
+        ○ --compare           : 기존 방식(스크립트 4개 순차 실행)과 실행 시간 / 저장 바이트 비교
+        ○ --chunksize 200000  : 01 단계를 청크 단위로 읽어 처리 (원본이 메모리보다 클 때)
+        ○ --format feather    : 결과 저장 형식 (parquet / feather / csv, 기본 KAMP_STORAGE 또는 parquet)
+        ○ --csv               : 컬럼형 파일과 함께 사람이 볼 CSV 도 저장
+        ○ --force             : 캐시와 상관없이 모든 단계 다시 실행 (결과는 캐시에 기록)
+        ○ --no-cache          : 캐시를 사용하지 않음 (최종 결과만 저장하는 기존 동작)
+        ○ --trace             : 단계별 시간 / 메모리 계측 결과 저장 (data/results/traces/*.json)
+"""
+
+"""
+전처리 파이프라인 (01 → 02 → 03 → 04 를 한 프로세스에서 실행)
+    - 기존 방식은 단계마다 전체 CSV(UTF-8-BOM)를 저장하고 다음 스크립트가 그 파일을 다시 읽음
+    - 각 단계 스크립트의 process(df) 를 DataFrame 하나로 이어서 호출 → 중간 CSV 쓰기 / 파싱 생략
+    - 최종 결과(04_전처리_불필요컬럼_제거)만 저장, 중간 결과는 옵션으로 저장
+    - 저장은 data/storage.py 사용 (기본 parquet, 학습 스크립트는 load_frame 으로 필요한 컬럼만 읽음)
+    - 단계 스크립트는 그대로 단독 실행 가능 (python -m data.processed.02_data_cleansing 등)
+    - 단계별 캐시 (data/cache.py)
+        ○ 입력 파일 / 설정 / 코드 해시가 지난 실행과 같은 단계는 건너뜀
+        ○ 처음으로 바뀐 단계부터 실행 (그 앞 단계의 저장된 결과를 읽어서 시작)
+        ○ 캐시를 쓰면 다음 실행에서 이어서 시작할 수 있도록 중간 결과도 저장
+"""
+
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+# data.common에 작성된 코드 가져오기
+from data.common import BASE_DIR
+from data.storage import load_frame, save_frame
+from data.cache import stage_key, is_fresh, record
+from data.instrument import enable, trace_step
+
+# ~/KAMP (기존 스크립트를 python -m 으로 실행할 위치)
+KAMP_DIR = os.path.dirname(BASE_DIR)
+
+# 실행 순서대로 (모듈명이 숫자로 시작하므로 importlib 로 불러옴)
+STAGE_MODULES = [
+    "data.processed.01_missing_value_all_delete",
+    "data.processed.02_data_cleansing",
+    "data.processed.03_outlier_value_all_delete",
+    "data.processed.04_unnecessary_column_delete",
+]
+
+
+def load_stages():
+    return [importlib.import_module(name) for name in STAGE_MODULES]
+
+
+def save_result(df, path, report, fmt=None, export_csv=False):
+    """storage 형식으로 저장 후 저장한 파일 / 바이트를 report 에 기록 (저장한 파일 목록 반환)"""
+    written = save_frame(df, path, fmt, export_csv)
+    for saved in written:
+        report["bytes_written"] += os.path.getsize(saved)
+        report["files"].append(saved)
+    return written
+
+
+def stage_label(stage):
+    return stage.__name__.rsplit(".", 1)[-1]
+
+#####################################################################
+# 파이프라인 실행 (한 프로세스, 메모리 안에서 단계 연결)
+#####################################################################
+
+def run_pipeline(raw_path=None, save_intermediate=False, chunksize=None, fmt=None, export_csv=False,
+                 cache=True, force=False):
+    """
+    원본 CSV → 01 ~ 04 단계 → 최종 결과 저장
+    - chunksize 지정 시 01 단계(로드 + 결측 제거)를 청크 단위로 수행 → 결측 제거된 행만 메모리에 올라감
+    - fmt / export_csv : data.storage.save_frame 인자 (저장 형식 / CSV 함께 저장 여부)
+    - cache : 입력 / 설정 / 코드가 그대로인 단계는 건너뛰고 저장된 결과 사용 (중간 결과도 저장)
+    - force : 캐시 확인 없이 모든 단계 실행 (cache=True 면 결과는 기록)
+    - 반환 : (최종 DataFrame, 단계별 시간 / 저장 바이트 리포트)
+    """
+    stages = load_stages()
+    report = {"stages": [], "files": [], "bytes_written": 0}
+    start = time.perf_counter()
+    raw_path = raw_path or stages[0].file_path
+
+    # df 가 None 이면 메모리에 이전 단계 결과가 없음 → 필요할 때 저장된 결과를 읽음
+    df = None
+    for i, stage in enumerate(stages):
+        input_path = raw_path if i == 0 else stages[i - 1].output_path
+        key = stage_key(stage.__file__, [input_path], stage.STAGE_CONFIG) if cache else None
+        if cache and not force and is_fresh(stage.__file__, key):
+            report["stages"].append({"stage": stage_label(stage) + " (cached)", "seconds": 0.0})
+            df = None
+            continue
+
+        t = time.perf_counter()
+        if i == 0 and chunksize:
+            df = pd.concat(stage.iter_drop_missing(raw_path, chunksize, stage.STAGE_CONFIG["ratio_percent"]), ignore_index=True)
+            report["stages"].append({"stage": "load_raw + 01 (chunked)", "seconds": round(time.perf_counter() - t, 3)})
+        else:
+            if i == 0:
+                df = stage.load_raw(raw_path)
+                report["stages"].append({"stage": "load_raw", "seconds": round(time.perf_counter() - t, 3)})
+            elif df is None:
+                df = load_frame(input_path, schema=getattr(stage, "input_schema", True))
+                report["stages"].append({"stage": f"load {stage_label(stages[i - 1])}", "seconds": round(time.perf_counter() - t, 3)})
+
+            t = time.perf_counter()
+            with trace_step(stage_label(stage), df) as step:
+                df = stage.process(df)
+                step.rows_out = len(df)
+            report["stages"].append({"stage": stage_label(stage), "seconds": round(time.perf_counter() - t, 3)})
+
+        # 마지막 단계는 항상 저장, 중간 단계는 옵션 (캐시를 쓰면 다음 실행을 위해 항상 저장)
+        if i == len(stages) - 1 or save_intermediate or cache:
+            written = save_result(df, stage.output_path, report, fmt, export_csv)
+            if cache:
+                record(stage.__file__, key, written)
+
+    if df is None:
+        # 모든 단계가 캐시 → 최종 결과만 읽음
+        df = load_frame(stages[-1].output_path)
+
+    report["wall_seconds"] = round(time.perf_counter() - start, 3)
+    return df, report
+
+#####################################################################
+# 기존 방식 (스크립트 4개를 각각 실행) 측정
+#####################################################################
+
+def run_legacy():
+    """단계마다 새 프로세스 + CSV 저장 → 다음 단계에서 다시 읽기 (기존 실행 방법 그대로, CSV 로만 저장)"""
+    stages = load_stages()
+    env = dict(os.environ, KAMP_STORAGE="csv", KAMP_CACHE="0")
+    start = time.perf_counter()
+    for name in STAGE_MODULES:
+        subprocess.run([sys.executable, "-m", name], cwd=KAMP_DIR, env=env, check=True, stdout=subprocess.DEVNULL)
+    wall = time.perf_counter() - start
+
+    files = [stage.output_path for stage in stages]
+    return {
+        "wall_seconds": round(wall, 3),
+        "files": files,
+        "bytes_written": sum(os.path.getsize(path) for path in files),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전처리 01 ~ 04 단계를 한 프로세스에서 실행")
+    parser.add_argument("--raw", help="원본 CSV 경로 (생략 시 data/raw 원본)")
+    parser.add_argument("--save-intermediate", action="store_true", help="01 ~ 03 단계 결과 CSV 도 저장")
+    parser.add_argument("--compare", action="store_true", help="기존 스크립트 4개 순차 실행과 비교")
+    parser.add_argument("--chunksize", type=int, help="01 단계 청크 단위 처리 행 수 (생략 시 한 번에 로드)")
+    parser.add_argument("--format", choices=["parquet", "feather", "csv"], help="저장 형식 (생략 시 KAMP_STORAGE 또는 parquet)")
+    parser.add_argument("--csv", action="store_true", help="컬럼형 파일과 함께 CSV 도 저장")
+    parser.add_argument("--force", action="store_true", help="캐시와 상관없이 모든 단계 다시 실행")
+    parser.add_argument("--no-cache", action="store_true", help="캐시 사용 안 함 (최종 결과만 저장)")
+    parser.add_argument("--trace", action="store_true", help="단계별 시간 / 메모리 계측 결과 저장 (data/results/traces)")
+    args = parser.parse_args()
+
+    if args.trace:
+        enable()
+
+    legacy = None
+    if args.compare:
+        print("기존 방식(스크립트 4개) 실행 중 ...")
+        legacy = run_legacy()
+        with open(legacy["files"][-1], "rb") as f:
+            legacy_output = f.read()
+
+    # 기존 방식과 비교할 때는 CSV 도 저장 + 캐시 없이 같은 조건으로 측정
+    df, report = run_pipeline(args.raw, args.save_intermediate, args.chunksize, args.format, args.csv or args.compare,
+                              cache=not (args.no_cache or args.compare), force=args.force)
+
+    print("\n==== 파이프라인 결과 ====")
+    for row in report["stages"]:
+        print(f" - {row['stage']:<45} {row['seconds']:>8.3f}s")
+    print(f"최종 데이터 크기 : {df.shape}")
+    print(f"전체 실행 시간   : {report['wall_seconds']:.3f}s")
+    print(f"저장한 바이트    : {report['bytes_written']:,} ({len(report['files'])}개 파일)")
+
+    if legacy is not None:
+        with open(legacy["files"][-1], "rb") as f:
+            same = f.read() == legacy_output
+        print("\n==== 기존 방식과 비교 ====")
+        print(f"실행 시간   : {legacy['wall_seconds']:.3f}s → {report['wall_seconds']:.3f}s "
+              f"({legacy['wall_seconds'] / report['wall_seconds']:.1f}배)")
+        print(f"저장 바이트 : {legacy['bytes_written']:,} → {report['bytes_written']:,}")
+        print(f"최종 결과 동일 여부 : {same}")
+
+
+if __name__ == "__main__":
+    main()
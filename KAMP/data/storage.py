@@ -0,0 +1,311 @@
+"""
+전처리 결과 저장소 (data/results 중간 산출물)
+    - 기존에는 단계마다 utf-8-sig CSV 로 저장 → 학습 스크립트가 실행마다 전체 CSV 를 다시 파싱
+    - 컬럼형 파일(parquet / feather)로 저장하면
+        ○ 공통 스키마 dtype(category / int16 / float32 / datetime)이 그대로 보존됨 → 다시 변환하지 않음
+        ○ 압축(zstd) 저장으로 파일 크기 감소
+        ○ 필요한 컬럼만 읽기 가능 (load_frame(..., columns = [...]))
+    - CSV 는 사람이 열어보는 용도로만 함께 내보냄 (export_csv = True)
+    - 경로는 기존 CSV 경로를 그대로 사용 (확장자만 형식에 맞게 바뀜)
+        ○ 예 : 04_전처리_불필요컬럼_제거.csv → 04_전처리_불필요컬럼_제거.parquet
+    - 읽을 때는 정해진 순서로 고름 (파일 수정 시각은 보지 않음)
+        ○ 컬럼형 파일 우선 (기본 형식 → 나머지 형식), 없으면 기존 CSV (저장소에 포함된 CSV 그대로 사용 가능)
+        ○ save_frame 은 같은 결과의 다른 컬럼형 파일을 지움 → 컬럼형 파일이 있으면 항상 마지막 저장 결과
+        ○ 결과를 다시 쓰는 코드(단계 스크립트 / 증분 전처리 incremental.py 포함)는 모두 save_frame / save_chunks 를 거쳐야 함
+          (CSV 를 직접 쓰면 이전 컬럼형 파일이 남아 새 CSV 대신 읽힘)
+    - 뒤에 행만 추가할 때(append_frame, 증분 전처리)는 기존 파일을 다시 쓰지 않음
+        ○ 컬럼형 : 조각 파일(<이름>.part00001.parquet ...)을 추가 → load_frame 이 본 파일 뒤에 이어 읽음
+        ○ CSV    : 파일 끝에 이어 씀
+        ○ save_frame 으로 다시 저장하면 조각 파일은 삭제 (본 파일 1개로 합쳐짐)
+    - 저장 형식 : KAMP_STORAGE 환경 변수 (parquet / feather / csv), 기본 parquet (pyarrow 미설치 시 csv)
+"""
+
+import glob
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # pyarrow 미설치 시 CSV 로만 저장 / 읽기
+    pyarrow = None
+
+# data.common에 작성된 코드 가져오기
+from data.common import read_csv_columns, read_csv_typed, apply_schema
+from data.instrument import trace_step
+
+EXTENSIONS = {"parquet": ".parquet", "feather": ".feather", "csv": ".csv"}
+COLUMNAR_FORMATS = ["parquet", "feather"]
+COMPRESSION = "zstd"
+
+# 조각 파일이 이 개수가 되면 append_frame 이 본 파일 1개로 합쳐 다시 씀
+MAX_PARTS = 32
+
+# CSV 를 먼저 쓰고 컬럼형 파일을 쓰므로 보통은 컬럼형 파일이 더 최근 (수정 시각 해상도 여유 1초)
+STALE_MARGIN_NS = 1_000_000_000
+
+DEFAULT_FORMAT = os.environ.get("KAMP_STORAGE", "parquet" if pyarrow is not None else "csv")
+
+
+def format_path(path, fmt):
+    """기존 CSV 경로 → 해당 형식의 경로 (확장자만 교체)"""
+    return os.path.splitext(path)[0] + EXTENSIONS[fmt]
+
+
+def part_paths(path, fmt):
+    """append_frame 으로 추가된 조각 파일 목록 (추가한 순서)"""
+    if fmt not in COLUMNAR_FORMATS:
+        return []
+    return sorted(glob.glob(glob.escape(os.path.splitext(path)[0]) + ".part*" + EXTENSIONS[fmt]))
+
+
+def check_format(fmt):
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"지원하지 않는 저장 형식입니다: {fmt} (가능: {', '.join(EXTENSIONS)})")
+    if fmt in COLUMNAR_FORMATS and pyarrow is None:
+        raise ValueError(f"{fmt} 형식은 pyarrow 가 필요합니다. (pip install pyarrow)")
+
+#####################################################################
+# 저장
+#####################################################################
+
+def write_csv(df, path):
+    """기존 스크립트와 동일한 형식(utf-8-sig, index 없음)"""
+    with trace_step("write_csv", df):
+        df.to_csv(path, index = False, encoding = "utf-8-sig")
+
+
+def write_columnar(df, path, fmt):
+    # 임시 파일에 쓰고 교체 → 읽는 쪽에서 쓰는 도중의 파일을 보지 않음
+    tmp_path = path + ".tmp"
+    with trace_step(f"write_{fmt}", df):
+        if fmt == "parquet":
+            df.to_parquet(tmp_path, index = False, compression = COMPRESSION)
+        else:
+            df.reset_index(drop = True).to_feather(tmp_path, compression = COMPRESSION)
+    os.replace(tmp_path, path)
+
+
+def remove_stale(path, fmt):
+    """
+    전체를 다시 저장하기 전에 이전 파일 삭제 (load_frame 이 오래된 파일을 고르지 않게 함)
+    - fmt 가 아닌 형식의 컬럼형 파일 / 모든 형식의 조각 파일
+    """
+    for other in COLUMNAR_FORMATS:
+        stale_paths = part_paths(path, other)
+        if other != fmt:
+            stale_paths.append(format_path(path, other))
+        for stale_path in stale_paths:
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+
+
+def append_csv(df, path):
+    """CSV 끝에 이어 씀 (파일이 없을 때만 BOM + 헤더, 컬럼 순서는 기존 헤더 기준)"""
+    if not os.path.exists(path):
+        write_csv(df, path)
+        return
+    with trace_step("append_csv", df):
+        df[read_csv_columns(path)].to_csv(path, index = False, encoding = "utf-8", mode = "a", header = False)
+
+
+def save_frame(df, path, fmt = None, export_csv = False):
+    """
+    DataFrame 저장 후 저장한 파일 경로 목록 반환
+    - path       : 기존 CSV 경로 (확장자는 fmt 에 맞게 교체)
+    - export_csv : 컬럼형으로 저장할 때 사람이 볼 CSV 도 함께 저장
+    - 저장하지 않은 형식의 이전 컬럼형 파일은 삭제
+    """
+    fmt = fmt or DEFAULT_FORMAT
+    check_format(fmt)
+    remove_stale(path, fmt)
+
+    written = []
+    if fmt == "csv" or export_csv:
+        csv_path = format_path(path, "csv")
+        write_csv(df, csv_path)
+        written.append(csv_path)
+
+    if fmt != "csv":
+        columnar_path = format_path(path, fmt)
+        write_columnar(df, columnar_path, fmt)
+        written.append(columnar_path)
+    return written
+
+
+def save_chunks(chunks, path, fmt = None, export_csv = False):
+    """
+    DataFrame 청크를 순서대로 저장 (전체를 메모리에 올리지 않음) 후 저장한 파일 경로 목록 반환
+    - parquet : 청크마다 row group / feather : 청크마다 record batch (스키마는 첫 청크 기준)
+    - CSV     : 첫 청크만 BOM + 헤더, 이후 이어 붙임
+    - 인자 / 이전 컬럼형 파일 삭제는 save_frame 과 동일
+    """
+    fmt = fmt or DEFAULT_FORMAT
+    check_format(fmt)
+    remove_stale(path, fmt)
+
+    csv_path = format_path(path, "csv") if fmt == "csv" or export_csv else None
+    columnar_path = format_path(path, fmt) if fmt != "csv" else None
+    tmp_path = columnar_path + ".tmp" if columnar_path else None
+
+    writer, schema, first = None, None, True
+    try:
+        for chunk in chunks:
+            if csv_path:
+                chunk.to_csv(csv_path, index = False, encoding = "utf-8-sig" if first else "utf-8",
+                             mode = "w" if first else "a", header = first)
+            if columnar_path:
+                table = pyarrow.Table.from_pandas(chunk, schema = schema, preserve_index = False)
+                if writer is None:
+                    schema = table.schema
+                    writer = open_chunk_writer(tmp_path, schema, fmt)
+                writer.write_table(table)
+            first = False
+    finally:
+        if writer is not None:
+            writer.close()
+
+    written = []
+    if csv_path and not first:
+        written.append(csv_path)
+    if writer is not None:
+        os.replace(tmp_path, columnar_path)
+        written.append(columnar_path)
+    return written
+
+
+def open_chunk_writer(path, schema, fmt):
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(path, schema, compression = COMPRESSION)
+    return pyarrow.ipc.new_file(path, schema, options = pyarrow.ipc.IpcWriteOptions(compression = COMPRESSION))
+
+
+def append_frame(df, path, fmt = None, export_csv = False):
+    """
+    기존 결과 뒤에 df 행을 추가 후 저장한 파일 경로 목록 반환 (기존 파일은 읽거나 다시 쓰지 않음)
+    - 컬럼형 : 조각 파일 1개 추가 (조각이 MAX_PARTS 개가 되면 전체를 읽어 save_frame 으로 합침)
+    - CSV    : 파일 끝에 이어 씀 (export_csv = True 면 컬럼형과 함께)
+    - 기존 결과가 없거나 다른 형식으로 저장되어 있으면 save_frame 과 같이 전체 저장
+    - df 의 컬럼 / dtype 은 기존 결과와 같아야 함 (공통 스키마 적용 후 전달)
+    """
+    fmt = fmt or DEFAULT_FORMAT
+    check_format(fmt)
+
+    existing = frame_files(path)
+    parts = part_paths(path, fmt)
+    if not existing or existing[0][1] != fmt or len(parts) + 1 >= MAX_PARTS:
+        if existing:
+            df = pd.concat([load_frame(path), df], ignore_index = True)
+        return save_frame(df, path, fmt, export_csv)
+
+    # CSV 를 먼저 → 조각 파일이 더 최근 (find_frame 경고 기준과 같은 순서)
+    written = []
+    if fmt == "csv" or export_csv:
+        csv_path = format_path(path, "csv")
+        append_csv(df, csv_path)
+        written.append(csv_path)
+
+    if fmt != "csv":
+        part_path = os.path.splitext(path)[0] + f".part{len(parts) + 1:05d}" + EXTENSIONS[fmt]
+        write_columnar(df, part_path, fmt)
+        written.append(part_path)
+    return written
+
+#####################################################################
+# 불러오기
+#####################################################################
+
+def read_order():
+    """읽을 형식 순서 : 기본 컬럼형 형식 → 나머지 컬럼형 형식 → CSV (pyarrow 미설치 시 CSV 만)"""
+    if pyarrow is None:
+        return ["csv"]
+    return sorted(COLUMNAR_FORMATS, key = lambda fmt: fmt != DEFAULT_FORMAT) + ["csv"]
+
+
+def frame_files(path):
+    """path(기존 CSV 경로) 에 해당하는 파일 중 존재하는 파일의 [(경로, 형식)] (read_order 순서)"""
+    return [(format_path(path, fmt), fmt) for fmt in read_order() if os.path.exists(format_path(path, fmt))]
+
+
+def stored_files(path):
+    """path 에 해당하는 모든 파일 (형식별 본 파일 + 조각 파일, read_order 순서) → 캐시 키 계산용"""
+    files = []
+    for found, fmt in frame_files(path):
+        files.append(found)
+        files.extend(part_paths(path, fmt))
+    return files
+
+
+def stored_mtime(path, fmt):
+    """fmt 형식 본 파일 / 조각 파일 중 가장 최근 수정 시각"""
+    return max(os.stat(found).st_mtime_ns for found in [format_path(path, fmt)] + part_paths(path, fmt))
+
+
+def read_columnar(path, fmt, columns = None):
+    """컬럼형 본 파일 + 조각 파일을 순서대로 읽어 합침"""
+    read = pd.read_parquet if fmt == "parquet" else pd.read_feather
+    frames = [read(found, columns = columns) for found in [format_path(path, fmt)] + part_paths(path, fmt)]
+    if len(frames) == 1:
+        return frames[0]
+    # 조각마다 category 값이 다르면 object 로 합쳐짐 → load_frame 의 apply_schema 에서 다시 category
+    return pd.concat(frames, ignore_index = True)
+
+
+def find_frame(path):
+    """path(기존 CSV 경로) 에 해당하는 파일 중 read_order 순서로 처음 있는 파일의 (경로, 형식)"""
+    files = frame_files(path)
+    if not files:
+        raise FileNotFoundError(f"전처리 결과 파일이 없습니다: {os.path.splitext(path)[0]}.(parquet|feather|csv)")
+
+    # 고르는 기준은 아님 (경고만) : storage 를 거치지 않고 CSV 만 고친 경우
+    found, fmt = files[0]
+    csv_path = format_path(path, "csv")
+    if fmt != "csv" and os.path.exists(csv_path) and os.stat(csv_path).st_mtime_ns > stored_mtime(path, fmt) + STALE_MARGIN_NS:
+        print(f"[WARN] {os.path.basename(csv_path)} 가 {os.path.basename(found)} 보다 나중에 수정되었습니다. "
+              f"CSV 를 직접 고쳤다면 {os.path.basename(found)} 를 삭제하세요.")
+    return files[0]
+
+
+def frame_columns(path, fmt):
+    """파일 전체를 읽지 않고 컬럼 목록만 확인"""
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    if fmt == "feather":
+        with pyarrow.memory_map(path, "r") as source:
+            return pyarrow.ipc.open_file(source).schema.names
+    return read_csv_columns(path)
+
+
+def load_frame(path, columns = None, schema = True):
+    """
+    전처리 결과 불러오기
+    - columns : 필요한 컬럼만 읽기 (None 이면 전체, 순서는 요청한 순서)
+    - schema  : CSV 를 읽을 때 공통 스키마 적용 여부
+                (컬럼형 파일은 저장할 때의 dtype 이 그대로 유지됨)
+    """
+    found, fmt = find_frame(path)
+
+    if columns is not None:
+        columns = list(columns)
+        missing = [col for col in columns if col not in frame_columns(found, fmt)]
+        if missing:
+            raise ValueError(f"필요한 컬럼이 누락되었습니다: {missing} ({os.path.basename(found)})")
+
+    with trace_step(f"read_{fmt}") as step:
+        if fmt in COLUMNAR_FORMATS:
+            df = read_columnar(found, fmt, columns)
+        elif schema:
+            df = read_csv_typed(found, usecols = columns)
+        else:
+            df = pd.read_csv(found, encoding = "utf-8-sig", usecols = columns)
+        step.rows_out = len(df)
+
+    if columns is not None:
+        df = df[columns]
+    if schema and fmt != "csv":
+        # 스키마 적용 전에 저장된 파일(예: 01 단계 결과)도 같은 dtype 으로 맞춤 (이미 맞으면 변환 없음)
+        df = apply_schema(df)
+    return df
@@ -0,0 +1,284 @@
+"""
+실행법
+    - 1. 프로젝트의 ROOT 폴더로 이동 | ~/KAMP
+    - 2. cmd에 코드 실행           | python -m data.synthetic --products 10000 --days 730
+        ○ --products / --days      : 제품 수 / 수집 일수 (기본 100개 / 106일 = 원본과 비슷한 크기)
+        ○ --start 2022-01-26       : 첫 수집일
+        ○ --missing-rate 0.01      : 값 셀 중 결측("") 비율
+        ○ --outlier-rate 0.005     : 이상치 행 비율 (습도 / 온도 범위 밖, 수주량 음수 중 하나)
+        ○ --duplicate-rate 0.6     : 하루에 2행 이상 수집되는 제품-날짜 비율
+        ○ --intermittent-share 0.2 : 간헐적 수요(대부분 0) 제품 비율
+        ○ --seed 42                : 같은 인자 + 같은 seed 면 항상 같은 파일
+        ○ --output 경로             : 생략 시 data/raw/synthetic_<제품수>p_<일수>d_seed<seed>.csv
+    - 3. 생성한 파일로 전처리 실행
+        ○ KAMP_OUTLIER_RULES=<출력>_rules.json python -m data.processed.pipeline --raw <출력>.csv
+          (수집 기간 규칙을 생성한 기간에 맞춘 03 단계 규칙 파일을 함께 저장)
+"""
+
+"""
+합성 사출성형 수주 데이터 생성 (규모 테스트용)
+    - 원본(사출성형_공급망최적화_AI_데이터셋.csv)과 같은 컬럼 / 형식
+        ○ Product_Number (Product_<16진수>), T ~ T+4 예정 / 작년 예정 / 예상 수주량, DateTime, DoW, Temperature, Humidity
+        ○ DateTime 형식 3종 혼합 (원본 비율) : 2022-04-29 06:01:00 / 2022-02-20 15:31 / 2022-01-27 6:25
+        ○ Temperature / Humidity 는 날짜별로 모든 제품이 같은 값 (원본과 동일)
+        ○ 행 순서는 섞여 있음 (원본처럼 정렬되지 않은 상태)
+    - 수주량 모델
+        ○ 제품별 평균 수준(lognormal) × 요일 계수로 일별 수요 생성
+        ○ T+k 예정 수주량 = T+k 일 수요 중 미리 들어온 주문 (k 가 클수록 적음, binomial)
+        ○ 예상 수주량 = 최근 7일 평균 기준 예측값, 작년 예정 수주량 = 같은 방식의 별도 수요
+        ○ 간헐적 수요 제품 : 주문이 있는 날만 수요 발생 (나머지 0)
+    - 제품 1,000개 단위로 만들어 바로 CSV 에 이어 씀 → 제품 수가 많아도 메모리는 1,000개 분량만 사용
+        ○ 묶음마다 seed 를 (seed, 묶음 번호) 로 고정 → 결과가 실행 환경과 상관없이 같음
+"""
+
+import argparse
+import importlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# data.common에 작성된 코드 가져오기
+from data.common import RAW_DIR
+
+stage01 = importlib.import_module("data.processed.01_missing_value_all_delete")
+stage03 = importlib.import_module("data.processed.03_outlier_value_all_delete")
+
+HORIZON = 5                     # T ~ T+4
+BATCH_PRODUCTS = 1000           # 한 번에 만들어 저장하는 제품 수 (바꾸면 생성 결과도 바뀜)
+
+PLANNED_COLS  = ["T일 예정 수주량"] + [f"T+{k}일 예정 수주량" for k in range(1, HORIZON)]
+LAST_YEAR_COLS = ["작년 " + col for col in PLANNED_COLS]
+FORECAST_COLS = ["T일 예상 수주량"] + [f"T+{k}일 예상 수주량" for k in range(1, HORIZON)]
+ORDER_COLS    = PLANNED_COLS + LAST_YEAR_COLS + FORECAST_COLS
+COLUMNS       = ["Product_Number"] + ORDER_COLS + ["DateTime", "DoW", "Temperature", "Humidity"]
+
+# 결측을 넣는 컬럼 (Product_Number / DateTime 은 제외)
+MISSING_COLS = ORDER_COLS + ["DoW", "Temperature", "Humidity"]
+
+# 원본 DateTime 형식 비율 (17,253 / 5,902 / 11,462 행)
+TIME_FORMATS = [("seconds", 0.50), ("padded", 0.17), ("unpadded", 0.33)]
+
+# 원본 수집 시각(시) 분포 (06시가 대부분)
+HOUR_WEIGHTS = {5: 1148, 6: 17240, 7: 3289, 8: 690, 9: 446, 10: 460, 11: 2030, 12: 2278,
+                13: 232, 14: 452, 15: 2494, 16: 2026, 17: 1146, 18: 686}
+
+# 요일 계수 (월 ~ 일)
+WEEKDAY_FACTOR = np.array([1.1, 1.1, 1.05, 1.0, 0.95, 0.5, 0.3])
+
+# 미리 들어온 주문 비율 (T, T+1, ..., T+4)
+KNOWN_SHARE = np.array([0.95, 0.75, 0.55, 0.45, 0.40])
+
+DAY_NAMES = np.array(["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"])
+
+#####################################################################
+# 날짜 / 시각 / 날씨 (모든 제품 공통)
+#####################################################################
+
+def time_labels():
+    """분 단위 시각(1440개) × 형식 3종 문자열 → (형식, 시 * 60 + 분) 으로 찾음"""
+    hours, minutes = np.divmod(np.arange(1440), 60)
+    return np.array([
+        [f"{h:02d}:{m:02d}:00" for h, m in zip(hours, minutes)],
+        [f"{h:02d}:{m:02d}" for h, m in zip(hours, minutes)],
+        [f"{h}:{m:02d}" for h, m in zip(hours, minutes)],
+    ], dtype = object)
+
+
+def daily_weather(dates, rng):
+    """날짜별 온도 / 습도 (계절 패턴 + 잡음)"""
+    season = np.sin(2 * np.pi * (dates.dayofyear.to_numpy() - 105) / 365.25)
+    temperature = 13 + 11 * season + rng.normal(0, 2.5, len(dates))
+    humidity = np.clip(38 + 18 * season + rng.normal(0, 8, len(dates)), 1, 99)
+
+    # 원본처럼 소수점 8자리 (numpy 버전에 따라 마지막 자리 출력이 달라지지 않게)
+    return temperature.round(8), humidity.round(8)
+
+#####################################################################
+# 제품 묶음 생성
+#####################################################################
+
+def thin(rng, demand, share):
+    """수요 중 미리 들어온 주문만 남김 (binomial)"""
+    return rng.binomial(demand, share)
+
+
+def simulate_demand(rng, level, intermittent, weekday_factor):
+    """제품 × 날짜 일별 수요 (정수)"""
+    mean = level[:, None] * weekday_factor[None, :]
+    demand = rng.poisson(mean)
+
+    # 간헐적 수요 : 주문이 있는 날(10 ~ 30%)만 평소의 몇 배 수요
+    occur = rng.random(mean.shape) < rng.uniform(0.1, 0.3, (len(level), 1))
+    spiky = rng.poisson(mean * 3) * occur
+    return np.where(intermittent[:, None], spiky, demand)
+
+
+def recent_mean(demand, window = 7):
+    """각 날짜 직전 window 일 평균 (첫 날들은 있는 만큼만)"""
+    csum = np.concatenate([np.zeros((demand.shape[0], 1)), np.cumsum(demand, axis = 1)], axis = 1)
+    end = np.arange(demand.shape[1])
+    start = np.maximum(end - window, 0)
+    count = np.maximum(end - start, 1)
+    return (csum[:, end] - csum[:, start]) / count
+
+
+def generate_batch(batch, first_product, n_products, dates, weather, labels, options):
+    """
+    제품 묶음 1개의 원본 형식 DataFrame
+    - batch : 묶음 번호 (seed 고정용)
+    """
+    rng = np.random.default_rng([options["seed"], batch])
+    n_days = len(dates)
+    span = n_days + HORIZON - 1
+
+    # 제품별 수준 / 간헐 수요 여부
+    level = rng.lognormal(3.3, 1.0, n_products)
+    intermittent = rng.random(n_products) < options["intermittent_share"]
+
+    weekday = (dates[0].dayofweek + np.arange(span)) % 7
+    demand = simulate_demand(rng, level, intermittent, WEEKDAY_FACTOR[weekday])
+    last_year = simulate_demand(rng, level, intermittent, WEEKDAY_FACTOR[(weekday + 1) % 7])
+    expected = recent_mean(demand)
+
+    # 제품-날짜 (P × D) 별 컬럼 값
+    values = {}
+    for k in range(HORIZON):
+        window = slice(k, k + n_days)
+        values[PLANNED_COLS[k]] = thin(rng, demand[:, window], KNOWN_SHARE[k])
+        values[LAST_YEAR_COLS[k]] = thin(rng, last_year[:, window], KNOWN_SHARE[k])
+        values[FORECAST_COLS[k]] = rng.poisson(expected[:, window] * rng.uniform(0.8, 1.2, (n_products, 1)))
+
+    # 하루 수집 행 수 : 1행 + (duplicate_rate 확률로) 1 ~ 5행 추가
+    extra = (rng.random((n_products, n_days)) < options["duplicate_rate"]) * np.minimum(1 + rng.poisson(0.8, (n_products, n_days)), 5)
+    repeats = (1 + extra).ravel()
+    cell = np.repeat(np.arange(n_products * n_days), repeats)
+    product_idx, day_idx = np.divmod(cell, n_days)
+    n_rows = len(cell)
+
+    frame = {"Product_Number": np.array([f"Product_{i:x}" for i in range(first_product, first_product + n_products)], dtype = object)[product_idx]}
+    for col in ORDER_COLS:
+        frame[col] = values[col].ravel()[cell]
+
+    # DateTime : 날짜 문자열 + 시각 문자열 (형식은 행마다 원본 비율로 선택)
+    hours = np.array(list(HOUR_WEIGHTS))
+    hour_p = np.array(list(HOUR_WEIGHTS.values()), dtype = float)
+    minute_of_day = rng.choice(hours, n_rows, p = hour_p / hour_p.sum()) * 60 + rng.integers(0, 60, n_rows)
+    fmt = rng.choice(len(TIME_FORMATS), n_rows, p = [p for _, p in TIME_FORMATS])
+    date_labels = np.array(dates.strftime("%Y-%m-%d ").tolist(), dtype = object)
+    frame["DateTime"] = date_labels[day_idx] + labels[fmt, minute_of_day]
+    frame["DoW"] = DAY_NAMES[dates.dayofweek.to_numpy()][day_idx]
+
+    temperature, humidity = weather
+    frame["Temperature"] = temperature[day_idx]
+    frame["Humidity"] = humidity[day_idx]
+    df = pd.DataFrame(frame, columns = COLUMNS)
+
+    inject_outliers(df, rng, options["outlier_rate"])
+    inject_missing(df, rng, options["missing_rate"])
+
+    # 원본처럼 행 순서 섞기
+    return df.iloc[rng.permutation(n_rows)].reset_index(drop = True)
+
+
+def inject_outliers(df, rng, rate):
+    """이상치 행 : 습도 100 이상 / 온도 범위 밖 / 수주량 음수 중 하나"""
+    rows = np.flatnonzero(rng.random(len(df)) < rate)
+    if not len(rows):
+        return
+    kind = rng.integers(0, 3, len(rows))
+
+    humidity = rows[kind == 0]
+    df.loc[humidity, "Humidity"] = rng.uniform(100, 1100, len(humidity)).round(8)
+
+    temperature = rows[kind == 1]
+    df.loc[temperature, "Temperature"] = np.where(rng.random(len(temperature)) < 0.5,
+                                                  rng.uniform(61, 90, len(temperature)), rng.uniform(-40, -11, len(temperature))).round(8)
+
+    negative = rows[kind == 2]
+    columns = rng.integers(0, len(ORDER_COLS), len(negative))
+    for i, col in enumerate(ORDER_COLS):
+        picked = negative[columns == i]
+        df.loc[picked, col] = -rng.integers(1, 50, len(picked))
+
+
+def inject_missing(df, rng, rate):
+    """값 셀 중 rate 비율을 결측으로 (CSV 에 빈 값으로 저장)"""
+    if rate <= 0:
+        return
+    for col in MISSING_COLS:
+        mask = rng.random(len(df)) < rate
+        if mask.any():
+            # 정수 컬럼은 nullable 정수로 바꿔서 CSV 에 12.0 이 아니라 12 로 저장
+            if df[col].dtype.kind in "iu":
+                df[col] = df[col].astype("Int64")
+            df.loc[mask, col] = None
+
+#####################################################################
+# 전체 생성 / 저장
+#####################################################################
+
+def iter_batches(products, days, start = "2022-01-26", seed = 42, missing_rate = 0.0, outlier_rate = 0.003,
+                 duplicate_rate = 0.6, intermittent_share = 0.2):
+    """제품 BATCH_PRODUCTS 개 단위 DataFrame 을 순서대로 생성"""
+    options = {"seed": seed, "missing_rate": missing_rate, "outlier_rate": outlier_rate,
+               "duplicate_rate": duplicate_rate, "intermittent_share": intermittent_share}
+    dates = pd.date_range(start, periods = days, freq = "D")
+    weather = daily_weather(dates, np.random.default_rng([seed, 0xFFFF]))
+    labels = time_labels()
+
+    for batch, first in enumerate(range(0, products, BATCH_PRODUCTS)):
+        yield generate_batch(batch, first, min(BATCH_PRODUCTS, products - first), dates, weather, labels, options)
+
+
+def write_rules(path, start, days):
+    """03 단계 규칙 파일 복사본 (수집 기간만 생성한 기간으로 변경)"""
+    end = (pd.Timestamp(start) + pd.Timedelta(days = days - 1)).strftime("%Y-%m-%d")
+    rules = [dict(rule, description = f"수집 기간({start} ~ {end}) 밖의 날짜") if rule["type"] == "date_range" else rule
+             for rule in stage03.with_date_window(stage03.STAGE_CONFIG["rules"], start, end)]
+    config = dict(stage03.STAGE_CONFIG, rules = rules)
+    with open(path, "w", encoding = "utf-8") as f:
+        json.dump(config, f, ensure_ascii = False, indent = 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "합성 사출성형 수주 데이터 생성")
+    parser.add_argument("--products", type = int, default = 100, help = "제품 수")
+    parser.add_argument("--days", type = int, default = 106, help = "수집 일수")
+    parser.add_argument("--start", default = "2022-01-26", help = "첫 수집일")
+    parser.add_argument("--missing-rate", type = float, default = 0.0, help = "결측 셀 비율")
+    parser.add_argument("--outlier-rate", type = float, default = 0.003, help = "이상치 행 비율")
+    parser.add_argument("--duplicate-rate", type = float, default = 0.6, help = "하루 2행 이상 수집되는 제품-날짜 비율")
+    parser.add_argument("--intermittent-share", type = float, default = 0.2, help = "간헐적 수요 제품 비율")
+    parser.add_argument("--seed", type = int, default = 42)
+    parser.add_argument("--output", help = "저장 경로 (생략 시 data/raw/synthetic_*.csv)")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(RAW_DIR, f"synthetic_{args.products}p_{args.days}d_seed{args.seed}.csv")
+    start = time.perf_counter()
+
+    rows = 0
+    def counted(batches):
+        nonlocal rows
+        for batch in batches:
+            rows += len(batch)
+            yield batch
+
+    stage01.write_chunks(counted(iter_batches(
+        args.products, args.days, args.start, args.seed,
+        args.missing_rate, args.outlier_rate, args.duplicate_rate, args.intermittent_share,
+    )), output)
+
+    rules_path = os.path.splitext(output)[0] + "_rules.json"
+    write_rules(rules_path, args.start, args.days)
+
+    print(f"합성 데이터 생성 완료 / 제품 : {args.products:,}, 일수 : {args.days}, 행 : {rows:,}")
+    print(f" - 원본 형식 CSV : {output} ({os.path.getsize(output) / 2 ** 20:.1f} MB)")
+    print(f" - 03 단계 규칙  : {rules_path}")
+    print(f"실행 시간 : {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 # 계속해서 세팅할 필요 없이 여기서 경로 설정을 다 해줌
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
 
 # ~/KAMP/models 까지의 경로
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -8,4 +12,149 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs")
 
 # 데이터 폴더 (전처리 완료 CSV 불러오기용)
-DATA_RESULT_DIR = os.path.join(os.path.dirname(BASE_DIR), "data", "results")
\ No newline at end of file
+DATA_RESULT_DIR = os.path.join(os.path.dirname(BASE_DIR), "data", "results")
+
+# 앙상블 결과 통합 파일 (모든 Product 의 예측값을 하나의 Arrow IPC 파일로 저장, 백엔드에서 memory-map)
+FORECAST_ARTIFACT = "ensemble_forecast.arrow"
+FORECAST_ARTIFACT_COLS = ["Date", "Product_Number", "Pred_Value", "MAE", "SMAPE", "Accuracy"]
+
+
+def write_forecast_artifact(df, path):
+    """
+    Product 별 예측 결과를 하나의 컬럼형 파일(Arrow IPC / Feather v2)로 저장
+        - 무압축 + record batch 1개로 저장해야 백엔드에서 memory-map 영역을 복사 없이 바로 사용할 수 있음
+        - 컬럼 형식도 numpy view 가 가능한 형식으로 저장
+            ○ Date           : timestamp[s] (문자열로 저장하면 읽을 때마다 파이썬 문자열 생성)
+            ○ Product_Number : dictionary (정렬된 이름 목록 + int32 번호)
+        - (Product_Number, Date) 순으로 저장 → 백엔드 조회 인덱스가 정렬 없이 그대로 사용
+        - 임시 파일에 쓰고 교체 → 백엔드가 쓰는 도중의 파일을 읽지 않음
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    df = df[FORECAST_ARTIFACT_COLS].copy()
+    df["Product_Number"] = df["Product_Number"].astype(str)
+    df["Date"] = pd.to_datetime(df["Date"])
+    df = df.sort_values(["Product_Number", "Date"], kind="stable").reset_index(drop=True)
+
+    products = pd.Categorical(df["Product_Number"])
+    columns = {
+        "Date": pa.array(df["Date"].to_numpy().astype("datetime64[s]"), type=pa.timestamp("s")),
+        "Product_Number": pa.DictionaryArray.from_arrays(
+            pa.array(products.codes.astype(np.int32)), pa.array(products.categories.tolist(), type=pa.string())
+        ),
+    }
+    for col in FORECAST_ARTIFACT_COLS[2:]:
+        columns[col] = pa.array(df[col].to_numpy())
+    table = pa.table(columns)
+
+    tmp_path = path + ".tmp"
+    feather.write_feather(table, tmp_path, compression="uncompressed", chunksize=max(1, table.num_rows))
+    os.replace(tmp_path, path)
+
+
+#####################################################################
+# Product 별 데이터 나누기
+#   - df[df["Product_Number"] == product] 는 Product 마다 전체 행을 비교 → Product 수 × 행 수
+#   - 날짜순 정렬 + Product 별 구간 계산을 1번만 하고 Product 데이터는 구간 slice 로 꺼냄
+#####################################################################
+
+def product_ranges(df, date_col="Date", group_col="Product_Number"):
+    """
+    (정렬된 df, [(Product_Number, 시작 행, 끝 행)]) 반환
+    - Product 순서 = df 에서 처음 나오는 순서 (df[group_col].unique() 와 동일)
+    - Product 안에서는 date_col 순서 (같은 날짜는 원래 순서 유지)
+    - Product_Number 가 비어 있는 행은 제외
+    """
+    codes, products = pd.factorize(df[group_col])
+    order = np.lexsort((df[date_col].to_numpy(), codes))
+    order = order[codes[order] >= 0]
+    sorted_codes = codes[order]
+
+    # 정렬된 code 가 바뀌는 위치 = Product 경계
+    bounds = np.flatnonzero(np.diff(sorted_codes)) + 1
+    starts = np.r_[0, bounds] if len(order) else np.array([], dtype=int)
+    stops = np.r_[bounds, len(order)] if len(order) else np.array([], dtype=int)
+
+    sorted_df = df.take(order).reset_index(drop=True)
+    ranges = [(products[sorted_codes[start]], int(start), int(stop)) for start, stop in zip(starts, stops)]
+    return sorted_df, ranges
+
+
+def split_products(df, date_col="Date", group_col="Product_Number"):
+    """
+    [(Product_Number, 날짜순으로 정렬된 Product 데이터)] 반환
+    - 기존 df[df[group_col] == product].sort_values(date_col) 과 같은 행 / 순서
+    - Product 데이터는 정렬된 df 의 연속 구간 (iloc slice, 행 index 는 0부터 시작하지 않음)
+    """
+    sorted_df, ranges = product_ranges(df, date_col, group_col)
+    return [(product, sorted_df.iloc[start:stop]) for product, start, stop in ranges]
+
+
+#####################################################################
+# Product 별 병렬 학습
+#   - Product 마다 모델이 서로 독립 → 프로세스 단위로 나눠서 학습
+#   - 워커마다 스레드 수 제한 (workers × threads 가 코어 수를 넘지 않게, 과다 구독 방지)
+#   - 직렬 실행(workers 1)에서 --threads 를 주지 않으면 모델 스레드 수는 라이브러리 기본값 (모든 코어, 기존과 동일)
+#   - seed 는 Product 마다 SEED 고정 + 결과는 입력 순서대로 반환 → workers 수와 상관없이 직렬 실행과 결과 동일
+#####################################################################
+
+SEED = 42
+
+# 워커에서 제한할 스레드 환경 변수 (OpenMP / BLAS)
+THREAD_ENV_VARS = ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS"]
+
+
+def resolve_workers(workers):
+    """0 이하면 코어 수만큼"""
+    return workers if workers and workers > 0 else (os.cpu_count() or 1)
+
+
+def resolve_threads(threads, workers):
+    """
+    모델 1개(워커 1개)의 스레드 수
+    - threads 지정 시 그대로
+    - 미지정 + 직렬 실행 : None (라이브러리 기본값)
+    - 미지정 + 병렬 실행 : 코어 수 // 워커 수 (최소 1)
+    """
+    if threads:
+        return threads
+    workers = resolve_workers(workers)
+    if workers == 1:
+        return None
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def thread_params(threads, name):
+    """모델 인자 (threads 가 None 이면 빈 dict → 라이브러리 기본값 사용)"""
+    return {} if threads is None else {name: threads}
+
+
+def limit_threads(threads):
+    """현재 프로세스의 OpenMP / BLAS 스레드 수 제한 (threadpoolctl 이 없으면 환경 변수만 설정)"""
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(threads)
+
+
+def run_products(fn, tasks, workers=1, threads=None):
+    """
+    tasks 의 각 항목으로 fn(task) 실행 후 결과 목록을 tasks 순서대로 반환
+    - workers == 1 : 현재 프로세스에서 순서대로 (기존 for 문과 동일, 스레드 수는 모델 설정만 따름)
+    - workers > 1  : ProcessPoolExecutor, 워커마다 threads 개 스레드로 제한 (None 이면 코어 수 // 워커 수)
+    - fn 은 모듈 최상위 함수여야 함 (워커로 전달할 때 pickle)
+    """
+    tasks = list(tasks)
+    workers = min(resolve_workers(workers), max(len(tasks), 1))
+    if workers == 1:
+        return [fn(task) for task in tasks]
+
+    # 작업을 워커 수의 4배 묶음으로 나눠 전달 (작업마다 주고받는 비용 감소, 워커 간 부하는 고르게)
+    chunksize = max(1, len(tasks) // (workers * 4))
+    threads = resolve_threads(threads, workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=limit_threads, initargs=(threads,)) as executor:
+        return list(executor.map(fn, tasks, chunksize=chunksize))
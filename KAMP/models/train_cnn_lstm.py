@@ -7,6 +7,7 @@
 """
 
 import os
+import joblib
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -22,22 +23,17 @@ from keras.optimizers import Adam
 from keras.losses import MeanSquaredError
 from keras.metrics import MeanAbsoluteError
 
-# 경로 가져오기
+# 경로 / 전처리 결과 저장소 가져오기
 from models.common import OUTPUT_DIR, DATA_RESULT_DIR
+from data.storage import load_frame
 
 # 각 파일들 불러오거나 저장할 경로 및 파일명 세팅
 DATA_PATH  = os.path.join(DATA_RESULT_DIR, "03_전처리_이상치_제거.csv")
 MODEL_PATH = os.path.join(OUTPUT_DIR, "cnn_lstm_model.h5")
+SCALER_PATH = os.path.join(OUTPUT_DIR, "cnn_lstm_scaler.pkl")
 RESULT_LOG = os.path.join(OUTPUT_DIR, "cnn_lstm_training_log.csv")
 PRED_PATH  = os.path.join(OUTPUT_DIR, "cnn_lstm_prediction_result.csv")
 
-#####################################################################
-# 데이터 불러오기
-#####################################################################
-
-df = pd.read_csv(DATA_PATH, encoding="utf-8-sig")
-print(f"데이터 로드 완료 / 행: {df.shape[0]}, 열: {df.shape[1]}")
-
 #####################################################################
 # 학습에 사용할 컬럼 지정
 #####################################################################
@@ -49,16 +45,14 @@ TARGET_COL   = "T+1일 예정 수주량"
 # FEATURE_COLS = ["Temperature", "Humidity", "T일 예상 수주량"]
 # TARGET_COL   = "T+1일 예상 수주량"
 
-# 필수 컬럼 검증
-required_columns = FEATURE_COLS + [TARGET_COL]
-missing_columns = [col for col in required_columns if col not in df.columns]
+#####################################################################
+# 데이터 불러오기 (학습 컬럼만, 누락 시 load_frame 에서 ValueError)
+#####################################################################
 
-if missing_columns:
-    print("누락된 컬럼 감지됨:", missing_columns)
-    print("현재 데이터셋 컬럼 목록:", list(df.columns))
-    raise ValueError(f"필요한 컬럼이 누락되었습니다: {missing_columns}")
-else:
-    print("모든 학습 컬럼이 정상적으로 존재합니다.")
+required_columns = FEATURE_COLS + [TARGET_COL]
+df = load_frame(DATA_PATH, columns=required_columns)
+print(f"데이터 로드 완료 / 행: {df.shape[0]}, 열: {df.shape[1]}")
+print("모든 학습 컬럼이 정상적으로 존재합니다.")
 
 #####################################################################
 # 데이터 정규화 (0~1 스케일)
@@ -68,11 +62,18 @@ scaler = MinMaxScaler()
 scaled = scaler.fit_transform(df[FEATURE_COLS + [TARGET_COL]])
 scaled_df = pd.DataFrame(scaled, columns=FEATURE_COLS + [TARGET_COL])
 
+# FastAPI 실시간 예측에서 같은 스케일을 쓰도록 scaler + 입력 설정 저장
+SEQ_LEN = 7
+joblib.dump(
+    {"scaler": scaler, "feature_cols": FEATURE_COLS, "target_col": TARGET_COL, "seq_len": SEQ_LEN},
+    SCALER_PATH
+)
+print(f"scaler 저장 완료 : {SCALER_PATH}")
+
 #####################################################################
 # 시퀀스 데이터 구성 (최근 7일 → 다음날 예측)
 #####################################################################
 
-SEQ_LEN = 7
 X, y = [], []
 for i in range(len(scaled_df) - SEQ_LEN):
     X.append(scaled_df.iloc[i:i+SEQ_LEN][FEATURE_COLS].values)
@@ -201,5 +202,5 @@ print("CNN-LSTM 학습 완료")
     - 예측 결과 파일(pred_df)을 통해 실제값 대비 예측값 비교 가능
 결론
     - 전처리된 센서 기반 데이터로 CNN-LSTM 학습이 성공적으로 수행됨
-    - 저장된 모델(cnn_lstm_model.h5)은 FastAPI에서 불러와 실시간 예측 서비스에 활용 가능
+    - 저장된 모델(cnn_lstm_model.h5) + scaler(cnn_lstm_scaler.pkl)는 FastAPI(/api/predict/cnn-lstm)에서 불러와 실시간 예측 서비스에 활용
 """
\ No newline at end of file
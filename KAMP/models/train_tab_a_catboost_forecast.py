@@ -4,37 +4,41 @@
          - Python 3.10 / catboost==1.2.3
          - 예측값 int 변환 (날짜별 1행씩)
          - MAE / SMAPE / Accuracy 포함 CSV 저장
+         - Product 별 모델을 여러 프로세스에서 병렬 학습 가능 (결과는 직렬 실행과 동일)
 실행법 :
     cd ~/KAMP
     python -m models.train_tab_a_catboost_forecast
+    python -m models.train_tab_a_catboost_forecast --workers 0             # 코어 수만큼 병렬 학습
+    python -m models.train_tab_a_catboost_forecast --workers 4 --threads 2 # 워커 4개 × 모델당 2스레드
 """
 
-import os, json
+import os, json, argparse, time
 import numpy as np
 import pandas as pd
 from catboost import CatBoostRegressor
 from datetime import timedelta
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.metrics import mean_absolute_error
-from models.common import OUTPUT_DIR, DATA_RESULT_DIR
+from models.common import OUTPUT_DIR, DATA_RESULT_DIR, SEED, resolve_threads, run_products, split_products, thread_params
+from data.storage import load_frame
 
 DATA_PATH = os.path.join(DATA_RESULT_DIR, "04_전처리_불필요컬럼_제거.csv")
 OUTPUT_SUBDIR = os.path.join(OUTPUT_DIR, "tab_a_catboost_forecast")
 os.makedirs(OUTPUT_SUBDIR, exist_ok=True)
 
 TARGET_COL = "T일 예정 수주량"
+DATE_COL = "Date"
 PRED_DAYS = 3
 
-df = pd.read_csv(DATA_PATH, encoding="utf-8-sig")
-df["Date"] = pd.to_datetime(df["Date"])
-product_list = df["Product_Number"].unique()
-print(f"CatBoost 학습 시작 (총 {len(product_list)}개 Product)")
 
-records = []
-for product in product_list:
-    d = df[df["Product_Number"] == product].sort_values("Date").reset_index(drop=True)
+def train_product(task):
+    """
+    Product 1개 학습 → 예측 CSV 저장 후 정확도 기록 반환 (90일 미만이면 None)
+    - task : (Product_Number, 날짜순으로 정렬된 Product 데이터, 모델 스레드 수 / None 이면 라이브러리 기본값)
+    """
+    product, d, threads = task
     if len(d) < 90:
-        continue
+        return None
 
     recent_df = d.tail(90).reset_index(drop=True)
     scaler_x, scaler_y = MinMaxScaler(), MinMaxScaler()
@@ -46,7 +50,7 @@ for product in product_list:
 
     model = CatBoostRegressor(
         iterations=300, learning_rate=0.05, depth=8,
-        loss_function="MAE", random_seed=42, verbose=False
+        loss_function="MAE", random_seed=SEED, **thread_params(threads, "thread_count"), verbose=False
     )
     model.fit(X_train, y_train)
 
@@ -60,7 +64,7 @@ for product in product_list:
     acc = 100 - (mae / (np.mean(actual) + 1e-5) * 100)
     acc = max(0, min(acc, 100))
 
-    base_date = recent_df["Date"].iloc[-1]
+    base_date = recent_df[DATE_COL].iloc[-1]
     future_dates = [base_date + timedelta(days=i) for i in range(1, PRED_DAYS + 1)]
 
     result = pd.DataFrame({
@@ -73,8 +77,29 @@ for product in product_list:
     })
     result.to_csv(os.path.join(OUTPUT_SUBDIR, f"{product}_pred.csv"), index=False, encoding="utf-8-sig")
 
-    records.append({"Product_Number": product, "MAE": mae, "SMAPE": smape, "Accuracy": acc})
+    return {"Product_Number": product, "MAE": mae, "SMAPE": smape, "Accuracy": acc}
 
-df_result = pd.DataFrame(records)
-df_result.to_csv(os.path.join(OUTPUT_SUBDIR, "accuracy_score.csv"), index=False, encoding="utf-8-sig")
-print("CatBoost 예측 완료 및 CSV 저장.")
\ No newline at end of file
+
+def main():
+    parser = argparse.ArgumentParser(description="CatBoost Product 별 3일치 수주량 예측")
+    parser.add_argument("--workers", type=int, default=1, help="병렬 학습 프로세스 수 (기본 1 = 직렬, 0 = 코어 수)")
+    parser.add_argument("--threads", type=int, help="모델 1개(워커 1개)가 사용하는 스레드 수 (기본 : 직렬이면 라이브러리 기본값, 병렬이면 코어 수 / 워커 수)")
+    args = parser.parse_args()
+
+    # 필요한 컬럼만 로드 (parquet 가 있으면 parquet, Date 는 datetime / Product_Number 는 category)
+    df = load_frame(DATA_PATH, columns=["Product_Number", DATE_COL, TARGET_COL])
+    products = split_products(df, DATE_COL)
+    print(f"CatBoost 학습 시작 (총 {len(products)}개 Product)")
+
+    start = time.perf_counter()
+    threads = resolve_threads(args.threads, args.workers)
+    tasks = [(product, d, threads) for product, d in products]
+    records = [r for r in run_products(train_product, tasks, workers=args.workers, threads=threads) if r is not None]
+
+    df_result = pd.DataFrame(records)
+    df_result.to_csv(os.path.join(OUTPUT_SUBDIR, "accuracy_score.csv"), index=False, encoding="utf-8-sig")
+    print(f"CatBoost 예측 완료 및 CSV 저장. ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@
          - 날짜별 예측 결과 병합 (0.6 : 0.4)
          - MAE / SMAPE / Accuracy 계산
          - 웹 사용 가능 CSV/JSON 출력
+         - 전체 Product 통합 컬럼형 파일(ensemble_forecast.arrow) 출력
 실행법 :
     cd ~/KAMP
     python -m models.train_tab_a_ensemble_forecast
@@ -12,7 +13,7 @@
 import os, json
 import pandas as pd
 import numpy as np
-from models.common import OUTPUT_DIR
+from models.common import OUTPUT_DIR, FORECAST_ARTIFACT, write_forecast_artifact
 
 LGBM_DIR = os.path.join(OUTPUT_DIR, "tab_a_lightgbm_forecast")
 CATB_DIR = os.path.join(OUTPUT_DIR, "tab_a_catboost_forecast")
@@ -23,6 +24,7 @@ W_LGBM, W_CATB = 0.6, 0.4
 
 lgbm_files = [f for f in os.listdir(LGBM_DIR) if f.endswith("_pred.csv")]
 records = []
+frames = []
 
 for f in lgbm_files:
     product = f.replace("_pred.csv", "")
@@ -48,6 +50,7 @@ for f in lgbm_files:
         "Accuracy": [round(acc, 2)] * len(lgbm_df)
     })
     result.to_csv(os.path.join(ENS_DIR, f"{product}_pred.csv"), index=False, encoding="utf-8-sig")
+    frames.append(result)
 
     records.append({
         "Product_Number": product,
@@ -61,4 +64,13 @@ df_summary.to_csv(os.path.join(ENS_DIR, "ensemble_summary.csv"), index=False, en
 with open(os.path.join(ENS_DIR, "ensemble_summary.json"), "w", encoding="utf-8") as jf:
     json.dump(records, jf, ensure_ascii=False, indent=4)
 
+# 백엔드용 통합 파일 (Product 수가 늘어도 파일 1개만 읽으면 됨)
+artifact_path = os.path.join(ENS_DIR, FORECAST_ARTIFACT)
+if frames:
+    write_forecast_artifact(pd.concat(frames, ignore_index=True), artifact_path)
+elif os.path.exists(artifact_path):
+    # 통합 파일이 있으면 백엔드는 *_pred.csv 를 보지 않음 → 이전 결과가 계속 보이지 않도록 삭제
+    os.remove(artifact_path)
+    print(f"[WARN] 앙상블 결과가 없어 이전 {FORECAST_ARTIFACT} 를 삭제했습니다.")
+
 print("3일치 날짜별 예측 앙상블 CSV 생성 완료.")
\ No newline at end of file
@@ -5,19 +5,26 @@
          - MinMaxScaler 정규화
          - 예측값 int 변환 (날짜별 1행씩)
          - MAE / SMAPE / Accuracy 포함 CSV 저장
+         - Product 별 모델을 여러 프로세스에서 병렬 학습 가능 (결과는 직렬 실행과 동일)
+         - --mode global : 모든 Product 를 모델 1개로 학습 (Product_Number 범주형 피처, Product 별 정규화)
+           (피처 = 이전 LAGS 일 수주량, 마지막 3일은 예측값을 이어 붙여 하루씩 예측)
 실행법 :
     cd ~/KAMP
     python -m models.train_tab_a_lightgbm_forecast
+    python -m models.train_tab_a_lightgbm_forecast --workers 0             # 코어 수만큼 병렬 학습
+    python -m models.train_tab_a_lightgbm_forecast --workers 4 --threads 2 # 워커 4개 × 모델당 2스레드
+    python -m models.train_tab_a_lightgbm_forecast --mode global           # 전체 Product 모델 1개
 """
 
-import os, json
+import os, json, argparse, time
 import numpy as np
 import pandas as pd
 import lightgbm as lgb
 from datetime import timedelta
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.metrics import mean_absolute_error
-from models.common import OUTPUT_DIR, DATA_RESULT_DIR
+from models.common import OUTPUT_DIR, DATA_RESULT_DIR, SEED, resolve_threads, run_products, split_products, thread_params
+from data.storage import load_frame
 
 # 경로
 DATA_PATH = os.path.join(DATA_RESULT_DIR, "04_전처리_불필요컬럼_제거.csv")
@@ -25,45 +32,29 @@ OUTPUT_SUBDIR = os.path.join(OUTPUT_DIR, "tab_a_lightgbm_forecast")
 os.makedirs(OUTPUT_SUBDIR, exist_ok=True)
 
 TARGET_COL = "T일 예정 수주량"
+FEATURE_COL = "T일 예정 수주량"
+DATE_COL = "Date"
 PRED_DAYS = 3
+RECENT_DAYS = 90
+LAGS = 7
 
-# 데이터 로드
-df = pd.read_csv(DATA_PATH, encoding="utf-8-sig")
-df["Date"] = pd.to_datetime(df["Date"])
-product_list = df["Product_Number"].unique()
-print(f"LightGBM 학습 시작 (총 {len(product_list)}개 Product)")
+MODEL_PARAMS = dict(
+    n_estimators=300, learning_rate=0.05, max_depth=8,
+    subsample=0.8, colsample_bytree=0.8, random_state=SEED
+)
 
-records = []
-for product in product_list:
-    d = df[df["Product_Number"] == product].sort_values("Date").reset_index(drop=True)
-    if len(d) < 90:
-        continue
 
-    recent_df = d.tail(90).reset_index(drop=True)
-    scaler_x, scaler_y = MinMaxScaler(), MinMaxScaler()
-    X = scaler_x.fit_transform(recent_df[["T일 예정 수주량"]])
-    y = scaler_y.fit_transform(recent_df[[TARGET_COL]]).flatten()
-
-    X_train, y_train = X[:-PRED_DAYS], y[:-PRED_DAYS]
-    X_test, y_test = X[-PRED_DAYS:], y[-PRED_DAYS:]
-
-    model = lgb.LGBMRegressor(
-        n_estimators=300, learning_rate=0.05, max_depth=8,
-        subsample=0.8, colsample_bytree=0.8, random_state=42
-    )
-    model.fit(X_train, y_train)
-
-    pred_scaled = model.predict(X_test)
-    pred = scaler_y.inverse_transform(pred_scaled.reshape(-1, 1)).flatten()
-    pred = np.round(pred).astype(int)
-
-    actual = scaler_y.inverse_transform(y_test.reshape(-1, 1)).flatten()
+def score(actual, pred):
+    """MAE / SMAPE / Accuracy (0 ~ 100 범위 제한)"""
     mae = mean_absolute_error(actual, pred)
     smape = np.mean(200 * np.abs(actual - pred) / (np.abs(actual) + np.abs(pred) + 1e-5))
     acc = 100 - (mae / (np.mean(actual) + 1e-5) * 100)
     acc = max(0, min(acc, 100))
+    return mae, smape, acc
 
-    base_date = recent_df["Date"].iloc[-1]
+
+def save_prediction(product, base_date, pred, mae, smape, acc):
+    """Product 별 3일치 예측 CSV 저장 후 정확도 기록 반환"""
     future_dates = [base_date + timedelta(days=i) for i in range(1, PRED_DAYS + 1)]
 
     result = pd.DataFrame({
@@ -76,8 +67,127 @@ for product in product_list:
     })
     result.to_csv(os.path.join(OUTPUT_SUBDIR, f"{product}_pred.csv"), index=False, encoding="utf-8-sig")
 
-    records.append({"Product_Number": product, "MAE": mae, "SMAPE": smape, "Accuracy": acc})
+    return {"Product_Number": product, "MAE": mae, "SMAPE": smape, "Accuracy": acc}
+
+
+def train_product(task):
+    """
+    Product 1개 학습 → 예측 CSV 저장 후 정확도 기록 반환 (90일 미만이면 None)
+    - task : (Product_Number, 날짜순으로 정렬된 Product 데이터, 모델 스레드 수 / None 이면 라이브러리 기본값)
+    """
+    product, d, threads = task
+    if len(d) < RECENT_DAYS:
+        return None
+
+    recent_df = d.tail(RECENT_DAYS).reset_index(drop=True)
+    scaler_x, scaler_y = MinMaxScaler(), MinMaxScaler()
+    X = scaler_x.fit_transform(recent_df[[FEATURE_COL]])
+    y = scaler_y.fit_transform(recent_df[[TARGET_COL]]).flatten()
+
+    X_train, y_train = X[:-PRED_DAYS], y[:-PRED_DAYS]
+    X_test, y_test = X[-PRED_DAYS:], y[-PRED_DAYS:]
+
+    model = lgb.LGBMRegressor(**MODEL_PARAMS, **thread_params(threads, "n_jobs"))
+    model.fit(X_train, y_train)
+
+    pred_scaled = model.predict(X_test)
+    pred = scaler_y.inverse_transform(pred_scaled.reshape(-1, 1)).flatten()
+    pred = np.round(pred).astype(int)
+
+    actual = scaler_y.inverse_transform(y_test.reshape(-1, 1)).flatten()
+    mae, smape, acc = score(actual, pred)
+
+    return save_prediction(product, recent_df[DATE_COL].iloc[-1], pred, mae, smape, acc)
+
+#####################################################################
+# 전체 Product 모델 1개 (--mode global)
+#   - Product 마다 최근 90일 → (Product 수, 90) 행렬로 묶어 한 번에 계산
+#   - 정규화는 Product 별 MinMax (학습 구간 87일 기준, 범위 0 이면 1 → MinMaxScaler 와 같은 계산)
+#   - 피처 = 이전 LAGS 일 수주량 + Product_Number (같은 날 값은 쓰지 않음 → 정답을 피처로 보지 않음)
+#   - 마지막 3일은 전날 예측값을 다음 날 피처로 이어 붙여 예측 (predict 3번, 각각 전체 Product 한 번에)
+#####################################################################
+
+def minmax_rows(values):
+    """행(Product)마다 (최솟값, 범위) / 범위 0 이면 1 로 (MinMaxScaler 와 동일)"""
+    low = np.nanmin(values, axis=1, keepdims=True)
+    span = np.nanmax(values, axis=1, keepdims=True) - low
+    span[span == 0] = 1
+    return low, span
+
+
+def lag_features(history, names):
+    """history : (Product 수, 일수) → 마지막 날 다음 날을 예측할 피처 (lag_1 = 전날)"""
+    lags = history[:, -LAGS:][:, ::-1]
+    frame = pd.DataFrame(lags, columns=[f"lag_{k}" for k in range(1, LAGS + 1)])
+    frame["Product_Number"] = pd.Categorical(names, categories=names)
+    return frame
+
+
+def train_global(products, threads):
+    """모든 Product 를 LightGBM 1개로 학습 (Product_Number 는 범주형 피처) 후 Product 별 결과 저장"""
+    recent = [(product, d.tail(RECENT_DAYS)) for product, d in products if len(d) >= RECENT_DAYS]
+    if not recent:
+        return []
+
+    names = [product for product, _ in recent]
+    frame = pd.concat([d for _, d in recent], ignore_index=True)
+    values = frame[TARGET_COL].to_numpy(dtype=float).reshape(len(recent), RECENT_DAYS)
+
+    train_days = RECENT_DAYS - PRED_DAYS
+    low, span = minmax_rows(values[:, :train_days])
+    scaled = (values[:, :train_days] - low) / span
+
+    # 학습 행 : Product 별 LAGS ~ 86일째 (각 행의 피처는 그 전 LAGS 일)
+    windows = np.lib.stride_tricks.sliding_window_view(scaled, LAGS, axis=1)[:, :-1, ::-1]
+    rows_per_product = windows.shape[1]
+    X_train = pd.DataFrame(windows.reshape(-1, LAGS), columns=[f"lag_{k}" for k in range(1, LAGS + 1)])
+    X_train["Product_Number"] = pd.Categorical(np.repeat(names, rows_per_product), categories=names)
+    y_train = scaled[:, LAGS:].ravel()
+
+    model = lgb.LGBMRegressor(**MODEL_PARAMS, **thread_params(threads, "n_jobs"))
+    model.fit(X_train, y_train, categorical_feature=["Product_Number"])
+
+    history = scaled
+    for _ in range(PRED_DAYS):
+        step = model.predict(lag_features(history, names))
+        history = np.column_stack([history, step])
+
+    preds = np.round(history[:, train_days:] * span + low).astype(int)
+    actuals = values[:, train_days:]
+
+    records = []
+    for i, (product, d) in enumerate(recent):
+        mae, smape, acc = score(actuals[i], preds[i])
+        records.append(save_prediction(product, d[DATE_COL].iloc[-1], preds[i], mae, smape, acc))
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LightGBM Product 별 3일치 수주량 예측")
+    parser.add_argument("--mode", choices=["product", "global"], default="product",
+                        help="product = Product 별 모델 (기본), global = 전체 Product 모델 1개")
+    parser.add_argument("--workers", type=int, default=1, help="병렬 학습 프로세스 수 (기본 1 = 직렬, 0 = 코어 수, product 모드만)")
+    parser.add_argument("--threads", type=int, help="모델 1개(워커 1개)가 사용하는 스레드 수 (기본 : 직렬이면 라이브러리 기본값, 병렬이면 코어 수 / 워커 수)")
+    args = parser.parse_args()
+
+    # 데이터 로드
+    # 필요한 컬럼만 로드 (parquet 가 있으면 parquet, Date 는 datetime / Product_Number 는 category)
+    df = load_frame(DATA_PATH, columns=["Product_Number", DATE_COL, TARGET_COL])
+    products = split_products(df, DATE_COL)
+    print(f"LightGBM 학습 시작 (총 {len(products)}개 Product, {args.mode} 모드)")
+
+    start = time.perf_counter()
+    if args.mode == "global":
+        records = train_global(products, args.threads)
+    else:
+        threads = resolve_threads(args.threads, args.workers)
+        tasks = [(product, d, threads) for product, d in products]
+        records = [r for r in run_products(train_product, tasks, workers=args.workers, threads=threads) if r is not None]
+
+    df_result = pd.DataFrame(records)
+    df_result.to_csv(os.path.join(OUTPUT_SUBDIR, "accuracy_score.csv"), index=False, encoding="utf-8-sig")
+    print(f"LightGBM 예측 완료 및 CSV 저장. ({time.perf_counter() - start:.1f}s)")
+
 
-df_result = pd.DataFrame(records)
-df_result.to_csv(os.path.join(OUTPUT_SUBDIR, "accuracy_score.csv"), index=False, encoding="utf-8-sig")
-print("LightGBM 예측 완료 및 CSV 저장.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -35,7 +35,8 @@ from keras.losses import MeanAbsoluteError as MAELoss
 from keras.metrics import MeanAbsoluteError
 
 # 공통 설정
-from models.common import OUTPUT_DIR, DATA_RESULT_DIR
+from models.common import OUTPUT_DIR, DATA_RESULT_DIR, split_products
+from data.storage import load_frame
 
 matplotlib.rc('font', family='Malgun Gothic')
 matplotlib.rc('axes', unicode_minus=False)
@@ -73,12 +74,13 @@ TARGET_COL = "T일 예정 수주량_smooth"
 #####################################################################
 # 데이터 로드
 #####################################################################
-df = pd.read_csv(DATA_PATH, encoding="utf-8-sig")
-df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+# 필요한 컬럼만 로드 (parquet 가 있으면 parquet, Date 는 datetime / Product_Number 는 category)
+df = load_frame(DATA_PATH, columns=["Product_Number", "Date"] + BASE_FEATURES)
 
 print(f"데이터 로드 완료 / 전체 행: {df.shape[0]}, 열: {df.shape[1]}")
-product_list = df["Product_Number"].unique()
-print(f"총 Product_Number 개수: {len(product_list)}")
+# Product 별 날짜순 데이터로 1번에 나눔 (Product 마다 전체 행을 비교하지 않음)
+products = split_products(df, "Date")
+print(f"총 Product_Number 개수: {len(products)}")
 
 #####################################################################
 # 모델 정의
@@ -113,8 +115,8 @@ accuracy_records = []
 #####################################################################
 # Product 별 학습
 #####################################################################
-for product in product_list:
-    product_df = df[df["Product_Number"] == product].sort_values("Date").reset_index(drop=True)
+for product, product_df in products:
+    product_df = product_df.reset_index(drop=True)
     if product_df.shape[0] < 90:
         print(f"[{product}] 데이터 부족 ({product_df.shape[0]}행) → 스킵")
         continue
@@ -0,0 +1,181 @@
+"""
+ForecastIndex 조회 / 정렬 / 커서 페이지네이션
+    - 작은 예측 결과 DataFrame 으로 CSV 경로(from_frame)와 통합 파일 경로(from_table)를 모두 확인
+실행법 :
+    cd ~/KAMP
+    python -m pytest tests/test_forecast_index.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.forecast_store import (
+    ForecastColumns, ForecastIndex, ForecastQueryError, StaleCursorError,
+    encode_cursor, load_forecast_artifact, normalize_frame,
+)
+from models.common import write_forecast_artifact
+
+VERSION = "v1"
+
+# 제품 안의 날짜 순서를 일부러 섞음 (인덱스가 (Product_Number, Date) 순으로 정렬해야 함)
+ROWS = [
+    ("2022-05-13", "Product_2", 20, 90.0),
+    ("2022-05-12", "Product_2", 10, 80.0),
+    ("2022-05-12", "Product_10", 30, 80.0),
+    ("2022-05-13", "Product_10", 40, 70.0),
+    ("2022-05-14", "Product_10", 50, 80.0),
+    ("2022-05-12", "Item_1", 60, 95.0),
+    ("2022-05-13", "Item_1", 70, 80.0),
+    ("2022-05-12", "Product_1", 80, 60.0),
+]
+
+
+def forecast_frame():
+    df = pd.DataFrame(ROWS, columns=["Date", "Product_Number", "Pred_Value", "Accuracy"])
+    df["MAE"] = 1.0
+    df["SMAPE"] = 2.0
+    return normalize_frame(df[["Date", "Product_Number", "Pred_Value", "MAE", "SMAPE", "Accuracy"]])
+
+
+@pytest.fixture(params=["frame", "artifact"])
+def index(request, tmp_path):
+    df = forecast_frame()
+    if request.param == "frame":
+        columns = ForecastColumns.from_frame(df)
+    else:
+        path = tmp_path / "ensemble_forecast.arrow"
+        write_forecast_artifact(df, str(path))
+        columns = ForecastColumns.from_table(load_forecast_artifact(str(path)))
+    return ForecastIndex(columns)
+
+
+def test_artifact_rows_need_no_sort(tmp_path):
+    # 통합 파일은 (Product_Number, Date) 순으로 저장됨 → 인덱스가 정렬 / 복사 없이 사용
+    path = tmp_path / "ensemble_forecast.arrow"
+    write_forecast_artifact(forecast_frame(), str(path))
+    assert ForecastIndex(ForecastColumns.from_table(load_forecast_artifact(str(path)))).order is None
+    assert ForecastIndex(ForecastColumns.from_frame(forecast_frame())).order is not None
+
+
+def keys(items):
+    return [(item["Product_Number"], item["Date"]) for item in items]
+
+
+def test_rows_sorted_by_product_then_date(index):
+    items = index.query(VERSION, limit=100)["items"]
+    assert keys(items) == [
+        ("Item_1", "2022-05-12"), ("Item_1", "2022-05-13"),
+        ("Product_1", "2022-05-12"),
+        ("Product_10", "2022-05-12"), ("Product_10", "2022-05-13"), ("Product_10", "2022-05-14"),
+        ("Product_2", "2022-05-12"), ("Product_2", "2022-05-13"),
+    ]
+
+
+@pytest.mark.parametrize("limit", [1, 3, 4, 8, 9])
+def test_pages_cover_all_rows_once(index, limit):
+    expected = keys(index.query(VERSION, limit=100)["items"])
+    collected, cursor, pages = [], None, 0
+    while True:
+        result = index.query(VERSION, cursor=cursor, limit=limit)
+        assert result["total"] == len(expected)
+        assert result["count"] == len(result["items"]) <= limit
+        collected += keys(result["items"])
+        pages += 1
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+    assert collected == expected
+    assert pages == -(-len(expected) // limit)
+
+
+def test_last_full_page_has_no_next_cursor(index):
+    result = index.query(VERSION, cursor=encode_cursor(VERSION, 4), limit=4)
+    assert result["count"] == 4
+    assert result["next_cursor"] is None
+
+
+def test_cursor_past_end_returns_empty_page(index):
+    result = index.query(VERSION, cursor=encode_cursor(VERSION, 100), limit=4)
+    assert result["items"] == []
+    assert result["next_cursor"] is None
+
+
+def test_stale_cursor(index):
+    cursor = index.query(VERSION, limit=2)["next_cursor"]
+    with pytest.raises(StaleCursorError):
+        index.query("v2", cursor=cursor, limit=2)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(VERSION, -1)])
+def test_invalid_cursor(index, cursor):
+    with pytest.raises(ForecastQueryError):
+        index.query(VERSION, cursor=cursor, limit=2)
+
+
+def test_descending_sort_keeps_ties_in_index_order(index):
+    items = index.query(VERSION, limit=100, sort="-accuracy")["items"]
+    assert [item["Accuracy"] for item in items] == [95.0, 90.0, 80.0, 80.0, 80.0, 80.0, 70.0, 60.0]
+    # Accuracy 80 동률 → (Product_Number, Date) 순서 그대로
+    ties = [key for key, item in zip(keys(items), items) if item["Accuracy"] == 80.0]
+    assert ties == [
+        ("Item_1", "2022-05-13"), ("Product_10", "2022-05-12"),
+        ("Product_10", "2022-05-14"), ("Product_2", "2022-05-12"),
+    ]
+
+
+def test_ascending_sort_is_stable(index):
+    items = index.query(VERSION, limit=100, sort="date")["items"]
+    assert keys(items)[:4] == [
+        ("Item_1", "2022-05-12"), ("Product_1", "2022-05-12"),
+        ("Product_10", "2022-05-12"), ("Product_2", "2022-05-12"),
+    ]
+
+
+def test_unknown_sort(index):
+    with pytest.raises(ForecastQueryError):
+        index.query(VERSION, sort="size")
+
+
+@pytest.mark.parametrize("prefix, products", [
+    ("Product_1", ["Product_1", "Product_10"]),
+    ("Product_", ["Product_1", "Product_10", "Product_2"]),
+    ("Item", ["Item_1"]),
+    ("Product_3", []),
+    ("Z", []),
+    ("", ["Item_1", "Product_1", "Product_10", "Product_2"]),
+])
+def test_prefix_range(index, prefix, products):
+    items = index.query(VERSION, limit=100, prefix=prefix)["items"]
+    assert sorted({item["Product_Number"] for item in items}) == products
+    expected = [row for row in forecast_frame().itertuples() if row.Product_Number.startswith(prefix)]
+    assert len(items) == len(expected)
+
+
+def test_product_date_range(index):
+    rows = index.select(product="Product_10", date_from=np.datetime64("2022-05-13"), date_to=np.datetime64("2022-05-13"))
+    items = index.columns.records(index._physical(rows))
+    assert keys(items) == [("Product_10", "2022-05-13")]
+    assert len(index.select(product="Product_404")) == 0
+
+
+def test_stale_cursor_api_returns_409(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from backend import main
+    from backend.forecast_store import ForecastCache
+
+    forecast_frame().to_csv(tmp_path / "Product_pred.csv", index=False, encoding="utf-8-sig")
+    monkeypatch.setattr(main, "forecast_cache", ForecastCache(check_interval=0))
+    monkeypatch.setitem(main.FORECAST_DIRS, "a", str(tmp_path))
+    client = TestClient(main.app)
+
+    first = client.get("/api/forecasts", params={"tab": "a", "limit": 3})
+    assert first.status_code == 200
+    cursor = first.json()["next_cursor"]
+    assert client.get("/api/forecasts", params={"tab": "a", "limit": 3, "cursor": cursor}).status_code == 200
+
+    # 결과 파일이 바뀌면 이전 cursor 는 409
+    forecast_frame().head(2).to_csv(tmp_path / "Item_pred.csv", index=False, encoding="utf-8-sig")
+    stale = client.get("/api/forecasts", params={"tab": "a", "limit": 3, "cursor": cursor})
+    assert stale.status_code == 409
+    assert client.get("/api/forecasts", params={"tab": "a", "cursor": "not-a-cursor"}).status_code == 400
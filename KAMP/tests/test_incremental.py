@@ -0,0 +1,208 @@
+"""
+증분 전처리 (data/processed/incremental.py)
+    - 원본 데이터셋을 날짜로 나눠 --init + 추가 3번 실행한 결과가 전체 실행(01 ~ 04) 결과와 같은지
+    - byte offset 이어 읽기 (쓰는 중인 마지막 줄은 다음 실행으로 미룸)
+    - watermark (이미 처리한 DateTime 이전 행은 무시)
+    - 연속 수집 상태 (kept / pending / excluded) 갱신
+실행법 :
+    cd ~/KAMP
+    python -m pytest tests/test_incremental.py
+"""
+
+import importlib
+import os
+
+import pandas as pd
+import pytest
+
+from data.common import DATE_FORMAT, apply_schema, parse_datetime, read_csv_typed
+from data.storage import find_frame, load_frame, part_paths
+
+incremental = importlib.import_module("data.processed.incremental")
+stage01 = incremental.stage01
+
+INIT_END = "2022-04-20"
+APPEND_ENDS = ["2022-04-30", "2022-05-08", "2022-05-31"]
+KEPT, PENDING, EXCLUDED = incremental.KEPT, incremental.PENDING, incremental.EXCLUDED
+
+
+@pytest.fixture(scope="module")
+def raw_lines():
+    """원본 CSV → (헤더 줄, [(수집일, 원본 줄), ...]) / 줄 단위로 잘라 이어 붙이는 용도"""
+    with open(stage01.file_path, "rb") as f:
+        lines = f.read().split(b"\n")
+    header, body = lines[0], [line for line in lines[1:] if line.strip()]
+    dates = parse_datetime(stage01.load_raw(stage01.file_path)["DateTime"]).dt.strftime(DATE_FORMAT).tolist()
+    assert len(dates) == len(body)
+    return header, list(zip(dates, body))
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(incremental, "PENDING_PATH", str(tmp_path / "incremental_pending.csv"))
+    return str(tmp_path / "raw.csv"), str(tmp_path / "04_result.csv")
+
+
+def write_raw(path, header, lines, mode = "wb"):
+    with open(path, mode) as f:
+        if mode == "wb":
+            f.write(header + b"\n")
+        f.write(b"".join(line + b"\n" for line in lines))
+
+
+def select(rows, start = "", end = "9999"):
+    return [line for date, line in rows if start < date <= end]
+
+
+def sorted_result(df):
+    # Date 단위(ns / us)는 pandas 버전의 문자열 파싱 방식에 따라 다름 → 값만 비교
+    df = df.astype({"Product_Number": str, "Date": "datetime64[ns]"})
+    return df.sort_values(["Product_Number", "Date"]).reset_index(drop = True)
+
+
+def test_init_and_appends_match_full_run(raw_lines, paths):
+    header, rows = raw_lines
+    raw_path, output_path = paths
+
+    write_raw(raw_path, header, select(rows, end = INIT_END))
+    state = incremental.init_state(raw_path, output_path)
+
+    promoted = []
+    start = INIT_END
+    for end in APPEND_ENDS:
+        write_raw(raw_path, header, select(rows, start, end), mode = "ab")
+        summary = incremental.run_incremental(state, raw_path, output_path)
+        assert summary["raw_rows"] == len(select(rows, start, end))
+        promoted += summary["promoted"]
+        start = end
+    # 보류(pending) → 결과 이동 경로도 거쳤는지
+    assert promoted
+
+    full = stage01.process(stage01.load_raw(stage01.file_path))
+    full = incremental.stage02.process(full)
+    full = incremental.stage03.process(full, profile_path = None)
+    full = incremental.stage04.process(full)
+
+    pd.testing.assert_frame_equal(sorted_result(load_frame(output_path)), sorted_result(apply_schema(full)))
+
+
+def test_partial_last_line_waits_for_next_run(raw_lines, paths):
+    header, rows = raw_lines
+    raw_path, output_path = paths
+    write_raw(raw_path, header, select(rows, end = INIT_END))
+    state = incremental.init_state(raw_path, output_path)
+
+    new_lines = select(rows, INIT_END, APPEND_ENDS[0])
+    last = new_lines[-1]
+    with open(raw_path, "ab") as f:
+        f.write(b"".join(line + b"\n" for line in new_lines[:-1]) + last[:10])
+
+    summary = incremental.run_incremental(state, raw_path, output_path)
+    assert summary["raw_rows"] == len(new_lines) - 1
+    with open(raw_path, "rb") as f:
+        assert f.read()[state["raw_offset"]:] == last[:10]
+
+    with open(raw_path, "ab") as f:
+        f.write(last[10:] + b"\n")
+    summary = incremental.run_incremental(state, raw_path, output_path)
+    assert summary["raw_rows"] == 1
+
+    summary = incremental.run_incremental(state, raw_path, output_path)
+    assert summary["raw_rows"] == 0
+
+
+def test_watermark_skips_rows_already_processed(raw_lines, paths):
+    header, rows = raw_lines
+    raw_path, output_path = paths
+    old_lines = select(rows, end = INIT_END)
+    write_raw(raw_path, header, old_lines)
+    state = incremental.init_state(raw_path, output_path)
+    watermark = dict(state["watermark"])
+    before = load_frame(output_path)
+
+    # 이미 처리한 행을 다시 이어 붙여도 결과 / watermark 는 그대로
+    write_raw(raw_path, header, old_lines[:500], mode = "ab")
+    summary = incremental.run_incremental(state, raw_path, output_path)
+    assert summary["raw_rows"] == 500
+    assert summary["appended"] == 0
+    assert state["watermark"] == watermark
+    pd.testing.assert_frame_equal(load_frame(output_path), before)
+
+    # 새 행은 watermark 이후 → 처리되고 watermark 갱신
+    write_raw(raw_path, header, select(rows, INIT_END, APPEND_ENDS[0]), mode = "ab")
+    incremental.run_incremental(state, raw_path, output_path)
+    assert max(state["watermark"].values()) > max(watermark.values())
+
+
+def test_daily_append_does_not_rewrite_result(raw_lines, paths):
+    header, rows = raw_lines
+    raw_path, output_path = paths
+    write_raw(raw_path, header, select(rows, end = "2022-05-09"))
+    # 원본은 2022-05-11 에 95일이 채워짐 → 기준을 낮춰 init 때부터 결과에 있는 제품을 만듦
+    state = incremental.init_state(raw_path, output_path, required_days = 30)
+    main, fmt = find_frame(output_path)
+    if fmt == "csv":
+        pytest.skip("pyarrow 미설치 (CSV 로만 저장)")
+    saved_at = os.stat(main).st_mtime_ns
+    before = len(load_frame(output_path))
+
+    # 결과에 있는 제품의 다음 날 행만 추가 → 조각 파일 + CSV 이어 쓰기, 기존 파일은 그대로
+    write_raw(raw_path, header, select(rows, "2022-05-09", "2022-05-10"), mode = "ab")
+    summary = incremental.run_incremental(state, raw_path, output_path)
+    assert summary["appended"] > 0
+    assert os.stat(main).st_mtime_ns == saved_at
+    assert len(part_paths(output_path, fmt)) == 1
+    df = load_frame(output_path)
+    assert len(df) == before + summary["appended"]
+    pd.testing.assert_frame_equal(sorted_result(read_csv_typed(os.path.splitext(output_path)[0] + ".csv")), sorted_result(df))
+
+    # 결과에 있는 날짜에 더 늦은 Time → 기존 행을 지워야 하므로 다시 씀 (조각 파일은 합쳐짐)
+    row = df[df["Date"] == "2022-05-10"].iloc[0]
+    raw = stage01.load_raw(raw_path)
+    raw = raw[(raw["Product_Number"] == row["Product_Number"]) & (raw["DateTime"].str.startswith("2022-05-10"))].head(1)
+    raw["DateTime"] = "2022-05-10 23:59"
+    with open(raw_path, "ab") as f:
+        f.write(raw.to_csv(index = False, header = False).encode("utf-8"))
+    incremental.run_incremental(state, raw_path, output_path)
+    assert part_paths(output_path, fmt) == []
+    after = load_frame(output_path)
+    assert len(after) == len(df)
+    assert len(after[(after["Product_Number"] == row["Product_Number"]) & (after["Date"] == "2022-05-10")]) == 1
+
+
+def test_update_continuity():
+    state = {
+        "required_days": 3,
+        "calendar": ["2022-01-01", "2022-01-02", "2022-01-03"],
+        "products": {
+            "P_kept": {"status": KEPT, "days": 5, "last_date": "2022-01-03"},
+            "P_pending": {"status": PENDING, "days": 2, "last_date": "2022-01-03"},
+            "P_gap": {"status": PENDING, "days": 2, "last_date": "2022-01-02"},
+            "P_excluded": {"status": EXCLUDED, "days": 1, "last_date": "2022-01-01"},
+        },
+    }
+    rows = pd.DataFrame({
+        "Product_Number": ["P_kept", "P_kept", "P_pending", "P_gap", "P_excluded", "P_new"],
+        "Date": ["2022-01-03", "2022-01-04", "2022-01-04", "2022-01-04", "2022-01-04", "2022-01-04"],
+    })
+
+    updates, replace_keys = incremental.update_continuity(rows, state)
+
+    assert state["calendar"][-1] == "2022-01-04"
+    # 마지막 수집일과 같은 날짜 → 기존 행 교체 (일수 그대로)
+    assert replace_keys == [("P_kept", "2022-01-03")]
+    assert updates == {
+        "P_kept": {"status": KEPT, "days": 6, "last_date": "2022-01-04"},
+        # required_days 를 채움 → pending 에서 결과로
+        "P_pending": {"status": KEPT, "days": 3, "last_date": "2022-01-04"},
+        # 2022-01-03 이 빠짐 → 불연속
+        "P_gap": {"status": EXCLUDED, "days": 3, "last_date": "2022-01-04"},
+        "P_new": {"status": PENDING, "days": 1, "last_date": "2022-01-04"},
+    }
+
+
+def test_update_continuity_new_product_with_gap():
+    state = {"required_days": 2, "calendar": ["2022-01-01", "2022-01-02", "2022-01-03"], "products": {}}
+    rows = pd.DataFrame({"Product_Number": ["P", "P"], "Date": ["2022-01-01", "2022-01-03"]})
+    updates, _ = incremental.update_continuity(rows, state)
+    assert updates["P"]["status"] == EXCLUDED
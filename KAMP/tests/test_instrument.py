@@ -0,0 +1,39 @@
+"""
+data.instrument 계측 켜기 / 저장
+    - 다시 켜도(enable) 종료 시 저장(write_trace)은 1번만 등록되는지
+실행법 :
+    cd ~/KAMP
+    python -m pytest tests/test_instrument.py
+"""
+
+import pytest
+
+from data import instrument
+
+
+@pytest.fixture
+def fresh(monkeypatch):
+    registered = []
+    monkeypatch.setattr(instrument.atexit, "register", registered.append)
+    monkeypatch.setattr(instrument, "ATEXIT_REGISTERED", False)
+    monkeypatch.setitem(instrument.STATE, "mode", None)
+    yield registered
+    instrument.STATE.update(mode = None, steps = [], stack = [])
+
+
+def test_enable_registers_write_trace_once(fresh):
+    instrument.enable("time")
+    instrument.enable("time")
+    assert fresh == [instrument.write_trace]
+
+    # 껐다가 다시 켜도 추가 등록 없음
+    instrument.STATE["mode"] = None
+    instrument.enable("time")
+    assert fresh == [instrument.write_trace]
+    assert instrument.enabled()
+
+
+def test_enable_without_write_at_exit(fresh):
+    instrument.enable("time", write_at_exit = False)
+    assert fresh == []
+    assert not instrument.ATEXIT_REGISTERED
@@ -0,0 +1,79 @@
+"""
+data.common.parse_datetime 이 pd.to_datetime(format = "mixed") 와 같은 결과인지
+    - ISO 8601 빠른 경로 / 0 을 채우지 않은 시각(6:25) / 형식 혼합 시 mixed 대체 경로
+실행법 :
+    cd ~/KAMP
+    python -m pytest tests/test_parse_datetime.py
+"""
+
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.common import parse_datetime
+
+stage01 = importlib.import_module("data.processed.01_missing_value_all_delete")
+
+
+def expected(values):
+    series = pd.Series(values, dtype = object)
+    return pd.to_datetime(series, format = "mixed", errors = "coerce").astype("datetime64[ns]")
+
+
+def check(values):
+    series = pd.Series(values, dtype = object)
+    result = parse_datetime(series)
+    assert result.dtype == "datetime64[ns]"
+    pd.testing.assert_series_equal(result, expected(values))
+
+
+@pytest.mark.parametrize("values", [
+    # ISO 8601 빠른 경로
+    ["2022-04-29 06:01:00", "2022-04-30 23:59:59", "2022-05-01 00:00:00"],
+    ["2022-02-20 15:31", "2022-02-21 07:05"],
+    ["2022-04-29T06:01:00", "2022-04-30T07:02:03"],
+    # 0 을 채우지 않은 시각
+    ["2022-01-27 6:25", "2022-01-28 7:05", "2022-01-29 9:59"],
+    ["2022-01-27 6:25", "2022-01-27 16:25"],
+    ["2022-01-27 6:25:07", "2022-01-27 16:25:07"],
+], ids = ["iso-seconds", "iso-minutes", "iso-t", "unpadded", "unpadded-mixed-length", "unpadded-seconds"])
+def test_single_format(values):
+    check(values)
+
+
+@pytest.mark.parametrize("values", [
+    # 원본 데이터셋의 형식 3종 혼합 (첫 값이 ISO / 아님)
+    ["2022-04-29 06:01:00", "2022-02-20 15:31", "2022-01-27 6:25", "2022-01-27 16:25"],
+    ["2022-01-27 6:25", "2022-04-29 06:01:00", "2022-02-20 15:31"],
+    # 길이는 같지만 형식이 다른 값 → 해당 값만 mixed 로 추측
+    ["2022-01-27 6:25", "2022-1-27 16:25", "2022-01-2 16:25"],
+    # 후보에 없는 형식
+    ["2022/01/27 06:25", "01/28/2022 07:05", "2022-01-29 08:00:00"],
+], ids = ["iso-first", "unpadded-first", "same-length", "other-formats"])
+def test_mixed_fallback(values):
+    check(values)
+
+
+@pytest.mark.parametrize("values", [
+    [None, "2022-04-29 06:01:00", np.nan],
+    ["", "2022-01-27 6:25", "not a date"],
+    [None, None],
+    [],
+], ids = ["missing", "invalid", "all-missing", "empty"])
+def test_missing_and_invalid(values):
+    check(values)
+
+
+def test_datetime_series_passes_through():
+    series = pd.Series(pd.to_datetime(["2022-01-27 06:25"]))
+    assert parse_datetime(series) is series
+
+
+def test_raw_dataset():
+    raw = stage01.load_raw(stage01.file_path)
+    pd.testing.assert_series_equal(
+        parse_datetime(raw["DateTime"]),
+        pd.to_datetime(raw["DateTime"], format = "mixed", errors = "coerce").astype("datetime64[ns]"),
+    )
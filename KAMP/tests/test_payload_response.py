@@ -0,0 +1,64 @@
+"""
+예측 결과 API 응답 (backend/main.py payload_response)
+    - 재로드 후 첫 요청의 JSON 직렬화 + 압축이 이벤트 루프가 아닌 스레드에서 실행되는지
+실행법 :
+    cd ~/KAMP
+    python -m pytest tests/test_payload_response.py
+"""
+
+import asyncio
+import gzip
+import json
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.forecast_store import ForecastCache, ForecastSnapshot
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    df = pd.DataFrame({
+        "Date": ["2022-05-12", "2022-05-13"] * 100,
+        "Product_Number": [f"Product_{i:03d}" for i in range(100) for _ in range(2)],
+        "Pred_Value": range(200), "MAE": 1.0, "SMAPE": 2.0, "Accuracy": 90.0,
+    })
+    df.to_csv(tmp_path / "Product_pred.csv", index=False, encoding="utf-8-sig")
+    monkeypatch.setattr(main, "forecast_cache", ForecastCache(check_interval=60))
+    monkeypatch.setitem(main.FORECAST_DIRS, "a", str(tmp_path))
+    monkeypatch.setattr(main, "OUTPUT_DIR_A", str(tmp_path))
+    return TestClient(main.app)
+
+
+def test_first_encoding_runs_off_event_loop(client, monkeypatch):
+    calls = []
+    original = ForecastSnapshot.encoded
+
+    def encoded(self, kind, encoding):
+        # 스레드풀에서 실행되면 실행 중인 이벤트 루프가 없음
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        calls.append((kind, encoding))
+        return original(self, kind, encoding)
+
+    monkeypatch.setattr(ForecastSnapshot, "encoded", encoded)
+
+    first = client.get("/api/preprocessing-a", headers={"Accept-Encoding": "gzip"})
+    assert first.status_code == 200
+    assert len(first.json()) == 200
+    assert calls == [("payload", "gzip")]
+
+    # 이미 만든 페이로드 / 압축본은 이벤트 루프에서 바로 응답 (다시 만들지 않음)
+    client.get("/api/preprocessing-a", headers={"Accept-Encoding": "gzip"})
+    assert client.get("/api/preprocessing-a", headers={"Accept-Encoding": "identity"}).json() == first.json()
+    assert calls == [("payload", "gzip")]
+
+    # 새 형식(columnar)은 다시 스레드에서
+    client.get("/api/preprocessing-a", params={"format": "columnar"}, headers={"Accept-Encoding": "gzip"})
+    assert calls == [("payload", "gzip"), ("columnar", "gzip")]
+    snapshot = main.forecast_cache.peek(main.OUTPUT_DIR_A)
+    content, encoding = snapshot.cached("payload", "gzip")
+    assert encoding == "gzip"
+    assert json.loads(gzip.decompress(content)) == first.json()
@@ -0,0 +1,101 @@
+"""
+단계 스크립트 단독 실행과 pipeline.py 를 섞어 쓸 때 저장 결과 / 단계 캐시
+    - pipeline.py 가 남긴 컬럼형 파일이 단독 실행한 단계의 새 결과를 가리지 않는지
+실행법 :
+    cd ~/KAMP
+    python -m pytest tests/test_stage_storage.py
+"""
+
+import functools
+import importlib
+import os
+import runpy
+import shutil
+import sys
+
+import pytest
+
+import pandas as pd
+
+from data import cache, common, storage
+from data.storage import append_frame, find_frame, load_frame, part_paths, save_frame
+
+pipeline = importlib.import_module("data.processed.pipeline")
+stage01, stage02, stage03, stage04 = pipeline.load_stages()
+
+RAW_PATH = stage01.file_path
+
+
+@pytest.fixture
+def results(tmp_path, monkeypatch):
+    """data/results 대신 tmp_path 사용 (단계 모듈의 입출력 경로 / 캐시 기록 위치 교체)"""
+    monkeypatch.setattr(common, "RAW_DIR", str(tmp_path))
+    monkeypatch.setattr(common, "RESULT_DIR", str(tmp_path))
+    monkeypatch.setattr(cache, "MANIFEST_PATH", str(tmp_path / "stage_cache.json"))
+    for stage in (stage01, stage02, stage03, stage04):
+        for name in ("file_path", "output_path"):
+            monkeypatch.setattr(stage, name, str(tmp_path / os.path.basename(getattr(stage, name))))
+    monkeypatch.setattr(stage03, "process", functools.partial(stage03.process, profile_path = None))
+    shutil.copyfile(RAW_PATH, stage01.file_path)
+    return tmp_path
+
+
+def run_stage(stage, monkeypatch, *args):
+    """단계 스크립트를 python -m 으로 실행한 것처럼 실행 (결과 경로는 results 픽스처 기준)"""
+    monkeypatch.setattr(sys, "argv", [stage.__file__, *args])
+    runpy.run_module(stage.__name__, run_name = "__main__")
+
+
+def cut_raw(path, lines):
+    with open(path, "rb") as f:
+        data = f.read().split(b"\n")
+    with open(path, "wb") as f:
+        f.write(b"\n".join(data[:lines + 1]) + b"\n")
+
+
+@pytest.mark.parametrize("args", [[], ["--chunksize", "5000"]], ids = ["full", "chunked"])
+def test_standalone_stage01_replaces_pipeline_result(results, monkeypatch, capsys, args):
+    pipeline.run_pipeline()
+    assert find_frame(stage01.output_path)[1] != "csv"
+    before = len(load_frame(stage02.output_path))
+
+    # 원본을 줄이고 01 단계만 단독 실행 → 02 단계는 새 01 결과를 읽어야 함
+    cut_raw(stage01.file_path, 20000)
+    run_stage(stage01, monkeypatch, *args)
+    assert len(load_frame(stage01.output_path)) == 20000
+
+    capsys.readouterr()
+    run_stage(stage02, monkeypatch)
+    assert "기존 결과 사용" not in capsys.readouterr().out
+    assert len(load_frame(stage02.output_path)) < before
+
+
+def test_stage_key_covers_every_stored_format(results, capsys):
+    pipeline.run_pipeline(export_csv = True)
+    key = cache.stage_key(stage02.__file__, [stage02.file_path], stage02.STAGE_CONFIG)
+    assert cache.is_fresh(stage02.__file__, key)
+
+    # storage 를 거치지 않고 CSV 만 고침 → 읽는 파일(parquet)은 그대로여도 02 단계 캐시는 무효
+    csv_path = os.path.splitext(stage01.output_path)[0] + ".csv"
+    with open(csv_path, "ab") as f:
+        f.write(b"\n")
+    assert cache.stage_key(stage02.__file__, [stage02.file_path], stage02.STAGE_CONFIG) != key
+
+
+def test_append_frame_adds_parts_until_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "MAX_PARTS", 3)
+    path = str(tmp_path / "result.csv")
+    frame = lambda start: pd.DataFrame({"Product_Number": ["P"] * 2, "value": [start, start + 1]})
+
+    save_frame(frame(0), path, "parquet", export_csv = True)
+    append_frame(frame(2), path, "parquet", export_csv = True)
+    append_frame(frame(4), path, "parquet", export_csv = True)
+    assert len(part_paths(path, "parquet")) == 2
+    assert load_frame(path)["value"].tolist() == list(range(6))
+
+    # 조각이 MAX_PARTS 개가 되면 본 파일 1개로 합침 (CSV 도 전체를 다시 씀)
+    append_frame(frame(6), path, "parquet", export_csv = True)
+    assert part_paths(path, "parquet") == []
+    assert load_frame(path)["value"].tolist() == list(range(8))
+    assert pd.read_csv(path, encoding = "utf-8-sig")["value"].tolist() == list(range(8))
+    assert cache.input_digests(path)[0][0] == "result.parquet"